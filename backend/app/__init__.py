@@ -1,11 +1,29 @@
+import os
 from flask import Flask
 from flask_cors import CORS
 from app.models import db
 from app.routes import register_blueprints
-from app.db_utils import init_db
+from app.commands import register_commands
+from app.db_utils import (
+    READONLY_BIND,
+    init_db,
+    install_immediate_transactions,
+    install_sqlite_pragmas,
+    readonly_bind_options,
+)
+from app.write_queue import init_write_queue
+from app.query_metrics import init_query_metrics
+from app.query_budget import init_query_budget
+from app.response_cache import init_response_cache
+from app.kiosk import init_kiosk
+from app.jobs import init_jobs
+from app.suggest import init_student_suggest
+from app.global_search import init_global_search
+from app.json_provider import FastJSONProvider
 
 def create_app(config_class="config.Config"):
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
     # Enable CORS
     CORS(
@@ -19,12 +37,57 @@ def create_app(config_class="config.Config"):
     # Configure the app
     app.config.from_object(config_class)
 
+    # Add a read-only engine for GET requests next to the default (writer) engine
+    db_path = app.config.get("DATABASE_PATH") or os.path.join(app.instance_path, "database.db")
+    app.config["SQLALCHEMY_BINDS"] = {
+        **app.config.get("SQLALCHEMY_BINDS", {}),
+        READONLY_BIND: readonly_bind_options(db_path, app.config.get("READONLY_POOL_SIZE", 8)),
+    }
+
     # Initialize database
     db.init_app(app)
     with app.app_context():
-        init_db(app)  # Initialize SQLite database if not exists
+        init_db(app)  # Initialize SQLite database if not exists and apply migrations
+
+        # Apply the configured PRAGMA profile to every pooled connection.
+        # journal_mode is persistent and can only be changed by the writer.
+        writer_pragmas = app.config.get("SQLITE_PRAGMAS", {})
+        reader_pragmas = {
+            name: value for name, value in writer_pragmas.items() if name != "journal_mode"
+        }
+        reader_pragmas["query_only"] = "ON"
+        install_sqlite_pragmas(db.engine, writer_pragmas)
+        install_sqlite_pragmas(db.engines[READONLY_BIND], reader_pragmas)
+        install_immediate_transactions(db.engine)
+
+        # Count each request's statements, rows and DB time per endpoint
+        init_query_metrics(app, (db.engine, db.engines[READONLY_BIND]))
+
+        # Check routes against their @query_budget and for repeated statements
+        init_query_budget(app)
+
+        # Serialize hot-path writes through one writer per database file
+        init_write_queue(app)
+
+        # Buffered event check-ins (see app/kiosk.py)
+        init_kiosk(app)
+
+    # Cache club-scoped GET responses until their data versions change
+    init_response_cache(app)
+
+    # Per-worker typeahead index for GET /api/students/suggest
+    init_student_suggest(app)
+
+    # Thread pool for GET /api/search across every entity
+    init_global_search(app)
 
     # Register blueprints
     register_blueprints(app)
 
+    # Start background job workers (handlers are registered by the modules above)
+    init_jobs(app)
+
+    # Register CLI commands (e.g. `flask reconcile-budgets`)
+    register_commands(app)
+
     return app
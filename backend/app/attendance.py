@@ -0,0 +1,54 @@
+from datetime import datetime
+from sqlalchemy import text
+from app.bulk import json_array
+
+# EventAttendance.attendance_status values (CHECK constraint in schema.sql)
+ATTENDANCE_STATUSES = ("Present", "Absent", "Excused")
+
+# SQLAlchemy's storage format for Time columns on SQLite
+TIME_STORAGE_FORMAT = "%H:%M:%S.%f"
+
+
+def validate_attendance_row(row):
+    """Normalize one attendance row. Returns (record, error)."""
+    student_id = str(row.get("student_id") or "").strip()
+    if not student_id:
+        return None, "student_id is required"
+
+    attendance_status = row.get("attendance_status") or "Present"
+    if attendance_status not in ATTENDANCE_STATUSES:
+        return None, f"attendance_status must be one of {', '.join(ATTENDANCE_STATUSES)}"
+
+    check_in_time = None
+    if row.get("check_in_time"):
+        try:
+            check_in_time = datetime.strptime(row["check_in_time"], "%H:%M").strftime(TIME_STORAGE_FORMAT)
+        except (TypeError, ValueError):
+            return None, "Invalid time format. Use HH:MM"
+
+    return {
+        "student_id": student_id,
+        "attendance_status": attendance_status,
+        "check_in_time": check_in_time,
+    }, None
+
+
+def insert_attendance_records(session, event_id, records):
+    """
+    Insert validated attendance `records` for an event in one statement,
+    skipping students already recorded (UNIQUE(event_id, student_id)).
+    Returns the set of student ids actually inserted.
+    """
+    if not records:
+        return set()
+    return set(
+        session.execute(
+            text(
+                "INSERT INTO EventAttendance (event_id, student_id, attendance_status, check_in_time) "
+                "SELECT :event_id, value ->> '$.student_id', value ->> '$.attendance_status', "
+                "value ->> '$.check_in_time' FROM json_each(:records) WHERE true "
+                "ON CONFLICT (event_id, student_id) DO NOTHING RETURNING student_id"
+            ),
+            {"event_id": event_id, "records": json_array(records)},
+        ).scalars()
+    )
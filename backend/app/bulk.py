@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+import math
+from datetime import datetime
+from flask import request
+from sqlalchemy.orm import Session
+from app.db_utils import READONLY_BIND
+from app.models import db
+from app.write_queue import submit_write
+
+# Largest number of rows accepted by one bulk request
+MAX_BULK_ROWS = 50000
+
+
+class BulkError(ValueError):
+    """Raised when a bulk upload cannot be read at all (as opposed to a bad row)."""
+
+
+def read_bulk_rows(key):
+    """
+    Rows of a bulk upload as a list of dicts. Accepts a JSON array, a JSON
+    object holding the array under `key`, a CSV file uploaded as multipart
+    form field "file", or a text/csv request body. Empty CSV cells become None.
+    """
+    upload = request.files.get("file")
+    if upload is not None or request.mimetype == "text/csv":
+        raw = upload.read() if upload is not None else request.get_data()
+        try:
+            text = raw.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise BulkError("CSV uploads must be UTF-8 encoded")
+        rows = [
+            {name.strip(): (value.strip() or None) if value is not None else None
+             for name, value in row.items() if name is not None}
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+    else:
+        data = request.get_json(silent=True)
+        rows = data.get(key) if isinstance(data, dict) else data
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise BulkError(f"Expected a JSON array of objects (or {{\"{key}\": [...]}}) or a CSV upload")
+
+    if not rows:
+        raise BulkError("No rows to import")
+    if len(rows) > MAX_BULK_ROWS:
+        raise BulkError(f"At most {MAX_BULK_ROWS} rows can be imported per request")
+    return rows
+
+
+def wants_dry_run():
+    """True when the client only wants the validation report (?dry_run=true)."""
+    return request.args.get("dry_run", "").lower() in ("1", "true", "yes")
+
+
+def run_import(mutation, dry_run=False):
+    """
+    Run an import `mutation(session, dry_run)` in one transaction through the
+    write queue. A dry run reads through its own read-only session, so it
+    reports exactly what a real import would do without writing anything or
+    taking the writer connection.
+    """
+    if not dry_run:
+        return submit_write(lambda session: mutation(session, False))
+    with Session(db.engines[READONLY_BIND]) as session:
+        return mutation(session, True)
+
+
+def parse_amount(value):
+    """Non-negative amount from a JSON number or CSV cell. Returns (amount, error)."""
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        return None, "amount must be a number"
+    if not math.isfinite(amount):  # float() accepts "nan" and "inf"
+        return None, "amount must be a number"
+    if amount < 0:
+        return None, "amount must not be negative"
+    return amount, None
+
+
+def parse_date(value):
+    """Date from a YYYY-MM-DD string. Returns (date, error)."""
+    try:
+        return datetime.strptime(str(value).strip(), "%Y-%m-%d").date(), None
+    except (TypeError, ValueError):
+        return None, "date must be in YYYY-MM-DD format"
+
+
+def json_array(values):
+    """
+    Encode `values` as one JSON parameter for `IN (SELECT value FROM
+    json_each(:param))`, so a set-based lookup takes a single bound parameter
+    however many values it checks.
+    """
+    return json.dumps(list(values))
+
+
+def summarize(results):
+    """Count per-row results by status."""
+    summary = {}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+    return summary
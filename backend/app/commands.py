@@ -0,0 +1,47 @@
+import os
+import time
+import click
+from app.db_utils import rebuild_search_indexes, reconcile_budget_totals
+from app.jobs import JobRunner
+
+
+def register_commands(app):
+    """Register the app's maintenance commands with the Flask CLI."""
+
+    @app.cli.command("reconcile-budgets")
+    def reconcile_budgets():
+        """Rebuild budget spend totals and the finance rollup from their source rows."""
+        db_path = app.config.get("DATABASE_PATH") or os.path.join(app.instance_path, "database.db")
+        drifted = reconcile_budget_totals(db_path)
+        if drifted:
+            click.echo(f"Corrected spend totals for budgets: {', '.join(map(str, drifted))}")
+        else:
+            click.echo("All budget spend totals were already correct.")
+
+    @app.cli.command("rebuild-search")
+    def rebuild_search():
+        """Re-index the full-text search tables (run after VACUUM)."""
+        db_path = app.config.get("DATABASE_PATH") or os.path.join(app.instance_path, "database.db")
+        rebuild_search_indexes(db_path)
+        click.echo("Search indexes rebuilt.")
+
+    @app.cli.command("run-jobs")
+    @click.option("--workers", default=2, show_default=True, help="Worker threads")
+    def run_jobs(workers):
+        """Run queued background jobs until interrupted."""
+        runner = JobRunner(
+            app,
+            workers=workers,
+            lease_seconds=app.config.get("JOB_LEASE_SECONDS", 30),
+            poll_interval=app.config.get("JOB_POLL_INTERVAL_MS", 1000) / 1000,
+            max_attempts=app.config.get("JOB_MAX_ATTEMPTS", 3),
+            retention_days=app.config.get("JOB_RETENTION_DAYS", 7),
+        )
+        runner.start()
+        click.echo(f"Running jobs with {workers} workers. Press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            click.echo("Waiting for running jobs to finish...")
+            runner.stop()
@@ -0,0 +1,190 @@
+from datetime import date
+from app.models import (
+    db,
+    Budget,
+    BudgetCategorySpend,
+    ClubRole,
+    Event,
+    Expense,
+    Membership,
+    Role,
+    Sponsor,
+    SponsorshipContribution,
+    Student,
+    EXPENSE_CATEGORIES,
+)
+from app.pagination import fetch_page
+from app.serializers import serialize_officer, serializer_for
+
+# Sections of GET /api/clubs/<id>/dashboard, in response order
+DASHBOARD_SECTIONS = (
+    "members",
+    "officers",
+    "budget_years",
+    "budget",
+    "upcoming_events",
+    "past_events",
+    "sponsors",
+    "expenses",
+    "roles",
+    "categories",
+)
+
+
+class DashboardError(ValueError):
+    """Raised for an unknown ?sections= name."""
+
+
+def parse_sections(raw):
+    """Sections named in ?sections=a,b (all of them when empty)."""
+    if not raw or not raw.strip():
+        return set(DASHBOARD_SECTIONS)
+    sections = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = sorted(sections.difference(DASHBOARD_SECTIONS))
+    if unknown:
+        raise DashboardError(
+            f"Unknown sections: {', '.join(unknown)}. "
+            f"Available sections: {', '.join(DASHBOARD_SECTIONS)}"
+        )
+    return sections
+
+
+def build_dashboard(club_id, sections, fiscal_year=None, limit=None):
+    """
+    Load the requested dashboard sections for a club with one query per data
+    source: all of the club's budgets serve both budget sections, and one
+    events query is split into upcoming and past.
+
+    `fiscal_year` selects the budget and expenses (default: the club's latest
+    budget year). Members, sponsors and expenses are limited to the first
+    `limit` rows (all rows when None), with a `next_cursor` for the matching
+    list endpoint.
+    """
+    result = {}
+
+    if "members" in sections:
+        query = (
+            db.session.query(Student)
+            .join(Membership)
+            .filter(Membership.club_id == club_id)
+            .order_by(Membership.student_id)
+        )
+        members, next_cursor = _first_page(
+            query, [Membership.student_id], limit, key_of=lambda member: [member.student_id]
+        )
+        serialize = serializer_for(Student)
+        result["members"] = [serialize(member) for member in members]
+        result["members_next_cursor"] = next_cursor
+
+    if "officers" in sections:
+        officers = (
+            db.session.query(
+                Student.student_id,
+                Student.first_name,
+                Student.last_name,
+                Student.email,
+                Student.phone_number,
+                Role.role_id,
+                Role.role_name,
+                Role.role_description,
+            )
+            .join(ClubRole, ClubRole.student_id == Student.student_id)
+            .join(Role, ClubRole.role_id == Role.role_id)
+            .filter(ClubRole.club_id == club_id)
+            .all()
+        )
+        result["officers"] = [serialize_officer(officer) for officer in officers]
+
+    if sections.intersection(("budget_years", "budget", "expenses")):
+        budgets = {
+            budget.fiscal_year: budget
+            for budget in Budget.query.filter_by(club_id=club_id)
+        }
+        if fiscal_year is None and budgets:
+            fiscal_year = max(budgets)
+
+        if "budget_years" in sections:
+            result["budget_years"] = sorted(budgets, reverse=True)
+
+        if "budget" in sections:
+            budget = budgets.get(fiscal_year)
+            if budget is None:
+                result["budget"] = None
+            else:
+                result["budget"] = {
+                    "budget_id": budget.budget_id,
+                    "fiscal_year": budget.fiscal_year,
+                    "total_budget": budget.total_budget,
+                    "spent_amount": budget.spent_amount,
+                    "remaining_amount": budget.remaining_amount,
+                    "spent_by_category": {
+                        row.category: row.spent_amount
+                        for row in BudgetCategorySpend.query.filter_by(budget_id=budget.budget_id)
+                    },
+                }
+
+    if sections.intersection(("upcoming_events", "past_events")):
+        today = date.today()
+        serialize = serializer_for(Event)
+        events = Event.query.filter(Event.club_id == club_id).order_by(Event.event_date).all()
+        if "upcoming_events" in sections:
+            result["upcoming_events"] = [
+                serialize(event) for event in events if event.event_date >= today
+            ]
+        if "past_events" in sections:
+            result["past_events"] = [
+                serialize(event) for event in events if event.event_date < today
+            ]
+
+    if "sponsors" in sections:
+        query = (
+            db.session.query(
+                Sponsor.sponsor_id,
+                Sponsor.sponsor_name,
+                Sponsor.contact_person,
+                Sponsor.contact_email,
+                Sponsor.phone_number,
+                Sponsor.address,
+                SponsorshipContribution.sponsorship_id,
+                SponsorshipContribution.contribution_amount,
+                SponsorshipContribution.contribution_date,
+            )
+            .join(SponsorshipContribution, SponsorshipContribution.sponsor_id == Sponsor.sponsor_id)
+            .filter(SponsorshipContribution.club_id == club_id)
+            .order_by(SponsorshipContribution.sponsorship_id)
+        )
+        sponsors, next_cursor = _first_page(query, [SponsorshipContribution.sponsorship_id], limit)
+        serialize = serializer_for(SponsorshipContribution)
+        result["sponsors"] = [serialize(sponsor) for sponsor in sponsors]
+        result["sponsors_next_cursor"] = next_cursor
+
+    if "expenses" in sections:
+        if fiscal_year is None:
+            expenses, next_cursor = [], None
+        else:
+            key_columns = [Expense.expense_date, Expense.expense_id]
+            query = Expense.query.filter(
+                Expense.club_id == club_id,
+                Expense.expense_date >= date(fiscal_year, 1, 1),
+                Expense.expense_date < date(fiscal_year + 1, 1, 1),
+            ).order_by(*key_columns)
+            expenses, next_cursor = _first_page(query, key_columns, limit)
+        serialize = serializer_for(Expense)
+        result["expenses"] = [serialize(expense) for expense in expenses]
+        result["expenses_next_cursor"] = next_cursor
+
+    if "roles" in sections:
+        serialize = serializer_for(Role)
+        result["roles"] = [serialize(role) for role in Role.query.order_by(Role.role_id)]
+
+    if "categories" in sections:
+        result["categories"] = EXPENSE_CATEGORIES
+
+    result["fiscal_year"] = fiscal_year
+    return result
+
+
+def _first_page(query, key_columns, limit, key_of=None):
+    if limit is None:
+        return query.all(), None
+    return fetch_page(query, key_columns, limit, key_of)
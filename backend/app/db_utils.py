@@ -1,9 +1,433 @@
 import sqlite3
 import os
+from urllib.parse import quote
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+# Bind key of the read-only engine used for GET/HEAD requests
+READONLY_BIND = "readonly"
+READ_METHODS = {"GET", "HEAD"}
+
+# Club id under which writes to tables that are not club-scoped are versioned
+GLOBAL_SCOPE = 0
+
+# Tables whose writes bump a DataVersions counter, and the SQL expression that
+# gives the club a row belongs to ("{row}" is NEW or OLD). None means the table
+# is not club-scoped and is versioned under GLOBAL_SCOPE.
+_VERSIONED_TABLES = {
+    "Clubs": None,
+    "Students": None,
+    "Roles": None,
+    "Sponsors": None,
+    "ClubRoles": "{row}.club_id",
+    "Events": "{row}.club_id",
+    "EventAttendance": "(SELECT club_id FROM Events WHERE event_id = {row}.event_id)",
+    "Membership": "{row}.club_id",
+    "Budget": "{row}.club_id",
+    "Expenses": "{row}.club_id",
+    "SponsorshipContribution": "{row}.club_id",
+    "EventHosting": "{row}.club_id",
+}
+
+
+# Recompute every budget's spend totals from Expenses (migration 4 backfill
+# and `flask reconcile-budgets`)
+BUDGET_TOTALS_REBUILD_SQL = """
+UPDATE Budget SET spent_amount = COALESCE(
+    (SELECT SUM(expense_amount) FROM Expenses WHERE Expenses.budget_id = Budget.budget_id), 0
+);
+DELETE FROM BudgetCategorySpend;
+INSERT INTO BudgetCategorySpend (budget_id, category, spent_amount)
+SELECT budget_id, COALESCE(category, 'Uncategorized'), SUM(expense_amount)
+FROM Expenses
+GROUP BY budget_id, COALESCE(category, 'Uncategorized');
+"""
+
+
+# Recompute the monthly finance rollup from Expenses and SponsorshipContribution
+# (migration 5 backfill and `flask reconcile-budgets`). Fiscal years are
+# calendar years, as in add_expense.
+FINANCE_ROLLUP_REBUILD_SQL = """
+DELETE FROM FinanceRollup;
+INSERT INTO FinanceRollup (club_id, fiscal_year, month, category, expense_total, contribution_total)
+SELECT club_id, fiscal_year, month, category, SUM(expense_total), SUM(contribution_total)
+FROM (
+    SELECT club_id,
+           CAST(strftime('%Y', expense_date) AS INTEGER) AS fiscal_year,
+           CAST(strftime('%m', expense_date) AS INTEGER) AS month,
+           COALESCE(category, 'Uncategorized') AS category,
+           expense_amount AS expense_total,
+           0 AS contribution_total
+    FROM Expenses
+    UNION ALL
+    SELECT club_id,
+           CAST(strftime('%Y', contribution_date) AS INTEGER),
+           CAST(strftime('%m', contribution_date) AS INTEGER),
+           'Sponsorship',
+           0,
+           contribution_amount
+    FROM SponsorshipContribution
+    WHERE contribution_date IS NOT NULL
+)
+GROUP BY club_id, fiscal_year, month, category;
+"""
+
+
+def _data_version_triggers():
+    """AFTER INSERT/UPDATE/DELETE triggers bumping DataVersions for each versioned table."""
+
+    def bump(table, club_expr, row):
+        if club_expr is None:
+            club = str(GLOBAL_SCOPE)
+        else:
+            club = f"COALESCE({club_expr.format(row=row)}, {GLOBAL_SCOPE})"
+        return (
+            f"INSERT INTO DataVersions (club_id, table_name, version) "
+            f"VALUES ({club}, '{table}', 1) "
+            f"ON CONFLICT (club_id, table_name) DO UPDATE SET version = version + 1;"
+        )
+
+    statements = []
+    for table, club_expr in _VERSIONED_TABLES.items():
+        for operation, rows in (("INSERT", ["NEW"]), ("UPDATE", ["OLD", "NEW"]), ("DELETE", ["OLD"])):
+            if club_expr is None:
+                rows = rows[:1]
+            body = " ".join(bump(table, club_expr, row) for row in rows)
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table.lower()}_{operation.lower()}_version "
+                f"AFTER {operation} ON {table} BEGIN {body} END;"
+            )
+    return "\n".join(statements)
+
+
+def _search_index_sql(index, table, columns, update_columns=None):
+    """
+    SQL for an external-content FTS5 index over `columns` of `table`, kept in
+    sync by triggers. The index stores only the tokens; matched rows are read
+    back from `table` by rowid.
+    """
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"NEW.{column}" for column in columns)
+    old_values = ", ".join(f"OLD.{column}" for column in columns)
+    name = index.lower()
+    return f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5(
+            {column_list},
+            content='{table}', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        );
+        CREATE TRIGGER IF NOT EXISTS trg_{name}_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO {index} (rowid, {column_list}) VALUES (NEW.rowid, {new_values});
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_{name}_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO {index} ({index}, rowid, {column_list}) VALUES ('delete', OLD.rowid, {old_values});
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_{name}_update
+        AFTER UPDATE OF {", ".join(update_columns or columns)} ON {table} BEGIN
+            INSERT INTO {index} ({index}, rowid, {column_list}) VALUES ('delete', OLD.rowid, {old_values});
+            INSERT INTO {index} (rowid, {column_list}) VALUES (NEW.rowid, {new_values});
+        END;
+    """
+
+
+# FTS5 indexes behind the search routes, as index -> (table, indexed
+# columns). Students, sponsors and expenses were added by migration 7, clubs
+# and events (for GET /api/search) by migration 9.
+SEARCH_INDEXES = {
+    "StudentsSearch": ("Students", ("student_id", "first_name", "last_name", "email", "major")),
+    "SponsorsSearch": ("Sponsors", ("sponsor_name", "contact_person", "contact_email")),
+    "ExpensesSearch": ("Expenses", ("expense_name", "description")),
+    "ClubsSearch": ("Clubs", ("club_name", "club_description")),
+    "EventsSearch": ("Events", ("event_name", "event_description", "location")),
+}
+
+
+def _search_indexes_sql(indexes):
+    """Create `indexes` and their triggers, then index the existing rows."""
+    return "".join(
+        _search_index_sql(index, *SEARCH_INDEXES[index]) for index in indexes
+    ) + _search_rebuild_sql(indexes)
+
+
+def _search_rebuild_sql(indexes):
+    return "".join(f"INSERT INTO {index} ({index}) VALUES ('rebuild');\n" for index in indexes)
+
+
+# Re-index every row. Needed after a VACUUM, which may renumber the rowids of
+# Students (its primary key is TEXT, so rowid is not an alias for it).
+SEARCH_INDEXES_REBUILD_SQL = _search_rebuild_sql(SEARCH_INDEXES)
+
+
+# Entries kept in StudentChanges (migration 8)
+STUDENT_CHANGES_KEPT = 10000
+
+
+# Ordered schema migrations applied on top of schema.sql.
+# Each entry is (version, description, sql). The version of the last applied
+# migration is stored in the database's PRAGMA user_version, so existing
+# databases are upgraded in place and new ones are brought up to date after
+# the base schema is created. Never edit a migration that has shipped; add a
+# new one instead.
+MIGRATIONS = [
+    (
+        1,
+        "Add indexes for hot query paths",
+        """
+        -- get_upcoming_events / get_past_events / get_events_for_club
+        CREATE INDEX IF NOT EXISTS idx_events_club_date ON Events (club_id, event_date);
+        -- get_expenses_for_club / search_expenses / get_club_budget
+        CREATE INDEX IF NOT EXISTS idx_expenses_club_date ON Expenses (club_id, expense_date);
+        -- update_budget
+        CREATE INDEX IF NOT EXISTS idx_expenses_budget ON Expenses (budget_id);
+        -- Attendance lookups by student
+        CREATE INDEX IF NOT EXISTS idx_event_attendance_student ON EventAttendance (student_id);
+        -- get_club_sponsors / search_sponsors
+        CREATE INDEX IF NOT EXISTS idx_contributions_club_date ON SponsorshipContribution (club_id, contribution_date);
+        """,
+    ),
+    (
+        2,
+        "Index contributions by club for keyset pagination",
+        """
+        -- get_club_sponsors pages by sponsorship_id (the rowid) within a club
+        CREATE INDEX IF NOT EXISTS idx_contributions_club ON SponsorshipContribution (club_id);
+        """,
+    ),
+    (
+        3,
+        "Track per-club, per-table data versions for ETags",
+        """
+        -- Bumped by triggers in the same transaction as every write, so a
+        -- version never changes without the data it describes changing too
+        CREATE TABLE IF NOT EXISTS DataVersions (
+            club_id INTEGER NOT NULL,
+            table_name TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (club_id, table_name)
+        ) WITHOUT ROWID;
+        """
+        + _data_version_triggers(),
+    ),
+    (
+        4,
+        "Maintain budget spend totals incrementally",
+        """
+        -- Running totals kept current by the Expenses triggers below, so
+        -- budget reads never aggregate Expenses. Rebuild them with
+        -- `flask reconcile-budgets` if they are ever suspected to drift.
+        ALTER TABLE Budget ADD COLUMN spent_amount REAL NOT NULL DEFAULT 0;
+        ALTER TABLE Budget ADD COLUMN remaining_amount REAL
+            GENERATED ALWAYS AS (total_budget - spent_amount) VIRTUAL;
+
+        CREATE TABLE IF NOT EXISTS BudgetCategorySpend (
+            budget_id INTEGER NOT NULL,
+            category TEXT NOT NULL,  -- 'Uncategorized' for expenses without one
+            spent_amount REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (budget_id, category)
+        ) WITHOUT ROWID;
+        """
+        + BUDGET_TOTALS_REBUILD_SQL
+        + """
+        CREATE TRIGGER IF NOT EXISTS trg_expenses_insert_budget AFTER INSERT ON Expenses BEGIN
+            UPDATE Budget SET spent_amount = spent_amount + NEW.expense_amount
+            WHERE budget_id = NEW.budget_id;
+            INSERT INTO BudgetCategorySpend (budget_id, category, spent_amount)
+            VALUES (NEW.budget_id, COALESCE(NEW.category, 'Uncategorized'), NEW.expense_amount)
+            ON CONFLICT (budget_id, category) DO UPDATE SET spent_amount = spent_amount + excluded.spent_amount;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_expenses_delete_budget AFTER DELETE ON Expenses BEGIN
+            UPDATE Budget SET spent_amount = spent_amount - OLD.expense_amount
+            WHERE budget_id = OLD.budget_id;
+            UPDATE BudgetCategorySpend SET spent_amount = spent_amount - OLD.expense_amount
+            WHERE budget_id = OLD.budget_id AND category = COALESCE(OLD.category, 'Uncategorized');
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_expenses_update_budget
+        AFTER UPDATE OF budget_id, expense_amount, category ON Expenses BEGIN
+            UPDATE Budget SET spent_amount = spent_amount - OLD.expense_amount
+            WHERE budget_id = OLD.budget_id;
+            UPDATE BudgetCategorySpend SET spent_amount = spent_amount - OLD.expense_amount
+            WHERE budget_id = OLD.budget_id AND category = COALESCE(OLD.category, 'Uncategorized');
+            UPDATE Budget SET spent_amount = spent_amount + NEW.expense_amount
+            WHERE budget_id = NEW.budget_id;
+            INSERT INTO BudgetCategorySpend (budget_id, category, spent_amount)
+            VALUES (NEW.budget_id, COALESCE(NEW.category, 'Uncategorized'), NEW.expense_amount)
+            ON CONFLICT (budget_id, category) DO UPDATE SET spent_amount = spent_amount + excluded.spent_amount;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_budget_delete_categories AFTER DELETE ON Budget BEGIN
+            DELETE FROM BudgetCategorySpend WHERE budget_id = OLD.budget_id;
+        END;
+        """,
+    ),
+    (
+        5,
+        "Roll up expenses and contributions by club, month and category",
+        """
+        -- Contributions are rolled up under the category 'Sponsorship';
+        -- contributions without a date are left out.
+        CREATE TABLE IF NOT EXISTS FinanceRollup (
+            club_id INTEGER NOT NULL,
+            fiscal_year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            expense_total REAL NOT NULL DEFAULT 0,
+            contribution_total REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (club_id, fiscal_year, month, category)
+        ) WITHOUT ROWID;
+        """
+        + FINANCE_ROLLUP_REBUILD_SQL
+        + """
+        CREATE TRIGGER IF NOT EXISTS trg_expenses_insert_rollup AFTER INSERT ON Expenses BEGIN
+            INSERT INTO FinanceRollup (club_id, fiscal_year, month, category, expense_total)
+            VALUES (NEW.club_id, CAST(strftime('%Y', NEW.expense_date) AS INTEGER),
+                    CAST(strftime('%m', NEW.expense_date) AS INTEGER),
+                    COALESCE(NEW.category, 'Uncategorized'), NEW.expense_amount)
+            ON CONFLICT (club_id, fiscal_year, month, category)
+            DO UPDATE SET expense_total = expense_total + excluded.expense_total;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_expenses_delete_rollup AFTER DELETE ON Expenses BEGIN
+            UPDATE FinanceRollup SET expense_total = expense_total - OLD.expense_amount
+            WHERE club_id = OLD.club_id
+              AND fiscal_year = CAST(strftime('%Y', OLD.expense_date) AS INTEGER)
+              AND month = CAST(strftime('%m', OLD.expense_date) AS INTEGER)
+              AND category = COALESCE(OLD.category, 'Uncategorized');
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_expenses_update_rollup
+        AFTER UPDATE OF club_id, expense_date, expense_amount, category ON Expenses BEGIN
+            UPDATE FinanceRollup SET expense_total = expense_total - OLD.expense_amount
+            WHERE club_id = OLD.club_id
+              AND fiscal_year = CAST(strftime('%Y', OLD.expense_date) AS INTEGER)
+              AND month = CAST(strftime('%m', OLD.expense_date) AS INTEGER)
+              AND category = COALESCE(OLD.category, 'Uncategorized');
+            INSERT INTO FinanceRollup (club_id, fiscal_year, month, category, expense_total)
+            VALUES (NEW.club_id, CAST(strftime('%Y', NEW.expense_date) AS INTEGER),
+                    CAST(strftime('%m', NEW.expense_date) AS INTEGER),
+                    COALESCE(NEW.category, 'Uncategorized'), NEW.expense_amount)
+            ON CONFLICT (club_id, fiscal_year, month, category)
+            DO UPDATE SET expense_total = expense_total + excluded.expense_total;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_contributions_insert_rollup
+        AFTER INSERT ON SponsorshipContribution WHEN NEW.contribution_date IS NOT NULL BEGIN
+            INSERT INTO FinanceRollup (club_id, fiscal_year, month, category, contribution_total)
+            VALUES (NEW.club_id, CAST(strftime('%Y', NEW.contribution_date) AS INTEGER),
+                    CAST(strftime('%m', NEW.contribution_date) AS INTEGER),
+                    'Sponsorship', NEW.contribution_amount)
+            ON CONFLICT (club_id, fiscal_year, month, category)
+            DO UPDATE SET contribution_total = contribution_total + excluded.contribution_total;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_contributions_delete_rollup
+        AFTER DELETE ON SponsorshipContribution WHEN OLD.contribution_date IS NOT NULL BEGIN
+            UPDATE FinanceRollup SET contribution_total = contribution_total - OLD.contribution_amount
+            WHERE club_id = OLD.club_id
+              AND fiscal_year = CAST(strftime('%Y', OLD.contribution_date) AS INTEGER)
+              AND month = CAST(strftime('%m', OLD.contribution_date) AS INTEGER)
+              AND category = 'Sponsorship';
+        END;
+
+        -- An update is a delete of the old row plus an insert of the new one
+        CREATE TRIGGER IF NOT EXISTS trg_contributions_update_rollup_old
+        AFTER UPDATE OF club_id, contribution_date, contribution_amount ON SponsorshipContribution
+        WHEN OLD.contribution_date IS NOT NULL BEGIN
+            UPDATE FinanceRollup SET contribution_total = contribution_total - OLD.contribution_amount
+            WHERE club_id = OLD.club_id
+              AND fiscal_year = CAST(strftime('%Y', OLD.contribution_date) AS INTEGER)
+              AND month = CAST(strftime('%m', OLD.contribution_date) AS INTEGER)
+              AND category = 'Sponsorship';
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_contributions_update_rollup_new
+        AFTER UPDATE OF club_id, contribution_date, contribution_amount ON SponsorshipContribution
+        WHEN NEW.contribution_date IS NOT NULL BEGIN
+            INSERT INTO FinanceRollup (club_id, fiscal_year, month, category, contribution_total)
+            VALUES (NEW.club_id, CAST(strftime('%Y', NEW.contribution_date) AS INTEGER),
+                    CAST(strftime('%m', NEW.contribution_date) AS INTEGER),
+                    'Sponsorship', NEW.contribution_amount)
+            ON CONFLICT (club_id, fiscal_year, month, category)
+            DO UPDATE SET contribution_total = contribution_total + excluded.contribution_total;
+        END;
+        """,
+    ),
+    (
+        6,
+        "Add a durable job queue",
+        """
+        -- Long-running operations queued by the API and run by app/jobs.py.
+        -- A running job is leased to one worker until lease_expires_at (unix
+        -- time); the worker renews the lease while it runs, so a job whose
+        -- worker died is picked up again once its lease runs out.
+        CREATE TABLE IF NOT EXISTS Jobs (
+            job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            params TEXT NOT NULL DEFAULT '{}',
+            status TEXT NOT NULL DEFAULT 'queued'
+                CHECK (status IN ('queued', 'running', 'succeeded', 'failed', 'cancelled')),
+            progress TEXT,
+            result TEXT,
+            error TEXT,
+            cancel_requested INTEGER NOT NULL DEFAULT 0,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            lease_owner TEXT,
+            lease_expires_at REAL,
+            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            started_at TEXT,
+            finished_at TEXT
+        );
+        -- Claiming the next queued (or abandoned) job
+        CREATE INDEX IF NOT EXISTS idx_jobs_status_lease ON Jobs (status, lease_expires_at);
+        """,
+    ),
+    (
+        7,
+        "Add full-text search indexes for students, sponsors and expenses",
+        _search_indexes_sql(("StudentsSearch", "SponsorsSearch", "ExpensesSearch")),
+    ),
+    (
+        8,
+        "Log student changes for in-memory indexes",
+        f"""
+        -- Ids of recently written students, so in-process indexes (see
+        -- app/suggest.py) can apply changes instead of reloading the table.
+        -- Only the newest {STUDENT_CHANGES_KEPT} entries are kept; a reader
+        -- that has fallen further behind rebuilds from Students.
+        CREATE TABLE IF NOT EXISTS StudentChanges (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id TEXT NOT NULL
+        );
+
+        CREATE TRIGGER IF NOT EXISTS trg_students_changes_insert AFTER INSERT ON Students BEGIN
+            INSERT INTO StudentChanges (student_id) VALUES (NEW.student_id);
+            DELETE FROM StudentChanges WHERE seq <= last_insert_rowid() - {STUDENT_CHANGES_KEPT};
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_students_changes_update AFTER UPDATE ON Students BEGIN
+            INSERT INTO StudentChanges (student_id) VALUES (OLD.student_id);
+            INSERT INTO StudentChanges (student_id)
+            SELECT NEW.student_id WHERE NEW.student_id IS NOT OLD.student_id;
+            DELETE FROM StudentChanges WHERE seq <= last_insert_rowid() - {STUDENT_CHANGES_KEPT};
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_students_changes_delete AFTER DELETE ON Students BEGIN
+            INSERT INTO StudentChanges (student_id) VALUES (OLD.student_id);
+            DELETE FROM StudentChanges WHERE seq <= last_insert_rowid() - {STUDENT_CHANGES_KEPT};
+        END;
+        """,
+    ),
+    (
+        9,
+        "Add full-text search indexes for clubs and events",
+        _search_indexes_sql(("ClubsSearch", "EventsSearch")),
+    ),
+]
+
 
 def init_db(app):
     schema_path = os.path.join(app.instance_path, 'schema.sql')
-    db_path = os.path.join(app.instance_path, 'database.db')
+    db_path = app.config.get("DATABASE_PATH") or os.path.join(app.instance_path, 'database.db')
 
     if not os.path.exists(db_path):
         print("Database doesn't exist yet, creating database...")
@@ -15,6 +439,186 @@ def init_db(app):
         # Seed the database with test data
         seed_database(db_path)
 
+    # Bring the schema up to date (no-op when already current)
+    migrate_db(db_path)
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas):
+    """
+    Apply a PRAGMA profile (see SQLITE_PROFILES in config.py) to a raw
+    sqlite3 connection. Called for every new pooled connection.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def install_sqlite_pragmas(engine, pragmas):
+    """Apply `pragmas` to every connection the engine opens."""
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+
+def install_immediate_transactions(engine):
+    """
+    Take transaction control away from the pysqlite driver and start every
+    transaction on `engine` with BEGIN IMMEDIATE. This makes SAVEPOINTs work
+    (the driver's implicit BEGIN does not) and takes the write lock up front,
+    so a writer waits on busy_timeout instead of failing with "database is
+    locked" when it later tries to upgrade a read lock.
+    """
+
+    @event.listens_for(engine, "connect")
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def readonly_uri(db_path):
+    """SQLite URI opening `db_path` read-only (for sqlite3.connect(..., uri=True))."""
+    # Quoted, so a "?" or "#" in the path is not read as the query or fragment
+    return f"file:{quote(db_path)}?mode=ro"
+
+
+def readonly_bind_options(db_path, pool_size):
+    """SQLALCHEMY_BINDS entry for a read-only connection pool on `db_path`."""
+    return {
+        "url": f"sqlite:///{readonly_uri(db_path)}&uri=true",
+        "pool_size": pool_size,
+        "max_overflow": 0,
+    }
+
+
+def readonly_bind_arguments():
+    """
+    bind_arguments for a read in a write request, e.g. an existence check
+    before submit_write: it runs on the read-only engine, so the request
+    never holds the single writer connection that the write queue needs.
+    """
+    return {"bind": current_app.extensions["sqlalchemy"].engines[READONLY_BIND]}
+
+
+class RoutingSession(Session):
+    """
+    Session that sends GET/HEAD requests to the read-only engine, so read
+    traffic never takes the write lock or waits on the single writer
+    connection. All other requests (and work outside a request) use the
+    writer engine; their reads that come before a submit_write should pass
+    readonly_bind_arguments() or move into the mutation.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context() and request.method in READ_METHODS:
+            engine = self._db.engines.get(READONLY_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+# Seconds a booting worker waits for another one's migration to finish
+MIGRATION_LOCK_TIMEOUT = 300
+
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _split_statements(sql):
+    """The complete SQL statements of a script (trigger bodies stay whole)."""
+    statements, current = [], ""
+    for line in sql.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            statements.append(current)
+            current = ""
+    if current.strip():
+        statements.append(current)
+    return statements
+
+
+def migrate_db(db_path):
+    """
+    Apply every migration newer than the database's current schema version.
+    Each migration runs in its own BEGIN IMMEDIATE transaction together with
+    the version bump, so a failed migration leaves the database at the
+    previous version. The version is read again inside that transaction, so
+    when several workers boot against an old database at once, only the
+    first applies each migration and the others skip it.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=MIGRATION_LOCK_TIMEOUT)
+    try:
+        for version, description, sql in MIGRATIONS:
+            if version <= get_schema_version(conn):
+                continue
+            # executescript() would commit the open transaction first, so
+            # the statements run one by one inside it
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if version <= get_schema_version(conn):
+                    conn.execute("ROLLBACK")  # another worker applied it meanwhile
+                    continue
+                for statement in _split_statements(sql):
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            print(f"Applied migration {version}: {description}")
+    finally:
+        conn.close()
+
+
+def reconcile_budget_totals(db_path):
+    """
+    Rebuild Budget.spent_amount and BudgetCategorySpend from Expenses, and
+    FinanceRollup from Expenses and SponsorshipContribution.
+    Returns the ids of budgets whose stored total had drifted.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        drifted = [
+            row[0]
+            for row in conn.execute(
+                """
+                SELECT budget_id FROM Budget
+                WHERE ABS(spent_amount - COALESCE(
+                    (SELECT SUM(expense_amount) FROM Expenses WHERE Expenses.budget_id = Budget.budget_id), 0
+                )) > 0.005
+                """
+            )
+        ]
+        for statement in (BUDGET_TOTALS_REBUILD_SQL + FINANCE_ROLLUP_REBUILD_SQL).split(";"):
+            if statement.strip():
+                conn.execute(statement)
+        conn.execute("COMMIT")
+        return drifted
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def rebuild_search_indexes(db_path):
+    """Re-index every row of the full-text search indexes (e.g. after a VACUUM)."""
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(f"BEGIN IMMEDIATE;\n{SEARCH_INDEXES_REBUILD_SQL}COMMIT;")
+    finally:
+        conn.close()
+
 
 def seed_database(db_path):
     # Insert data into the database
@@ -0,0 +1,104 @@
+import hashlib
+from datetime import date
+from functools import wraps
+from flask import current_app, make_response, request
+from sqlalchemy import and_, or_
+from app.db_utils import GLOBAL_SCOPE
+from app.models import db, DataVersion, Event
+from app.response_cache import CachedResponse
+
+
+def event_club_id(event_id):
+    """Club that owns `event_id`, for routes addressed by event rather than club."""
+    return db.session.query(Event.club_id).filter(Event.event_id == event_id).scalar()
+
+
+def data_versions(club_id, tables=(), global_tables=()):
+    """
+    Current DataVersions counters for `tables` of `club_id` and for
+    `global_tables`, as a tuple in argument order (0 for never-written tables).
+    """
+    conditions = []
+    if tables and club_id is not None:
+        conditions.append(and_(DataVersion.club_id == club_id, DataVersion.table_name.in_(tables)))
+    if global_tables:
+        conditions.append(
+            and_(DataVersion.club_id == GLOBAL_SCOPE, DataVersion.table_name.in_(global_tables))
+        )
+
+    found = {}
+    if conditions:
+        rows = db.session.query(
+            DataVersion.club_id, DataVersion.table_name, DataVersion.version
+        ).filter(or_(*conditions))
+        found = {(row.club_id, row.table_name): row.version for row in rows}
+
+    return tuple(found.get((club_id, table), 0) for table in tables) + tuple(
+        found.get((GLOBAL_SCOPE, table), 0) for table in global_tables
+    )
+
+
+def compute_etag(club_id, tables=(), global_tables=(), daily=False):
+    """
+    Strong ETag for the current request: a hash of the URL (path and query
+    string) and the versions of every table the response is built from.
+    """
+    parts = [request.path, request.query_string.decode(), str(club_id)]
+    parts += [str(version) for version in data_versions(club_id, tables, global_tables)]
+    if daily:
+        parts.append(date.today().isoformat())
+    return hashlib.sha1("\x1f".join(parts).encode()).hexdigest()
+
+
+def conditional_get(tables=(), global_tables=(), club_id_of=None, daily=False, cache=False):
+    """
+    Give a GET route a strong ETag and answer a matching If-None-Match with
+    304 Not Modified without calling the view.
+
+    `tables` are the club-scoped tables the response reads, for the club in
+    the route's `club_id` argument (or `club_id_of(**view_args)`);
+    `global_tables` are tables versioned for all clubs. Set `daily` for
+    responses that also depend on today's date. With `cache`, 200 responses
+    are kept in the app's response cache (see app/response_cache.py) and
+    served from it for as long as the ETag stays the same.
+
+    Versions are read before the view runs, so a write that lands while the
+    response is being built can only make the ETag stale-low, which costs a
+    refetch later and never pins old data.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if club_id_of is not None:
+                club_id = club_id_of(**kwargs)
+            else:
+                club_id = kwargs.get("club_id")
+            etag = compute_etag(club_id, tables, global_tables, daily)
+
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+                response.set_etag(etag)
+                return response
+
+            response_cache = current_app.extensions.get("response_cache") if cache else None
+            if response_cache is not None:
+                cached = response_cache.get(request.full_path, etag)
+                if cached is not None:
+                    response = current_app.response_class(cached.body, mimetype=cached.mimetype)
+                    response.set_etag(etag)
+                    return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+                if response_cache is not None and not response.is_streamed:
+                    response_cache.put(
+                        request.full_path,
+                        CachedResponse(etag, response.mimetype, response.get_data()),
+                    )
+            return response
+
+        return wrapper
+
+    return decorator
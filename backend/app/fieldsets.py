@@ -0,0 +1,48 @@
+from flask import request
+from app.serializers import model_columns, serializer_for
+
+
+class FieldsetError(ValueError):
+    """Raised when ?fields= names a field the route does not expose."""
+
+
+def parse_fields(model):
+    """
+    Return the `model` fields requested with ?fields=a,b,c, in request order,
+    or None when the parameter is absent (meaning "all fields").
+    """
+    raw = request.args.get("fields", "").strip()
+    if not raw:
+        return None
+
+    available = model_columns(model)
+    fields = list(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        raise FieldsetError(
+            f"Unknown fields: {', '.join(unknown)}. "
+            f"Available fields: {', '.join(available)}"
+        )
+    return fields
+
+
+def apply_fieldset(query, model, fields, key_columns=()):
+    """
+    Narrow `query`'s SELECT list to the requested columns, so the database
+    reads only those columns and no ORM entities are hydrated. Pagination key
+    columns are selected too (under private labels) but not serialized.
+
+    Returns (query, key_of, serialize) for use with paginate() and the
+    response formatting.
+    """
+    available = model_columns(model)
+    key_labels = [f"_key_{i}" for i in range(len(key_columns))]
+    query = query.with_entities(
+        *[available[name].label(name) for name in fields],
+        *[column.label(label) for column, label in zip(key_columns, key_labels)],
+    )
+
+    def key_of(row):
+        return [getattr(row, label) for label in key_labels]
+
+    return query, key_of, serializer_for(model, fields)
@@ -0,0 +1,168 @@
+from sqlalchemy import text
+from app.bulk import json_array, parse_amount, parse_date, run_import, summarize
+from app.jobs import job_handler
+from app.models import Budget, Club, Expense, Sponsor, SponsorshipContribution, EXPENSE_CATEGORIES
+
+
+def import_expenses(club_id, rows, dry_run=False):
+    """
+    Import expense rows in one transaction. The club's budgets are loaded
+    once and each expense is assigned to the budget for its fiscal year.
+    Returns (body, status_code).
+    """
+    def mutation(session, dry_run):
+        budget_ids = dict(
+            session.query(Budget.fiscal_year, Budget.budget_id).filter(Budget.club_id == club_id).all()
+        )
+
+        report, expenses = [], []
+        for index, row in enumerate(rows, start=1):
+            result = {"row": index, "expense_name": row.get("expense_name")}
+            report.append(result)
+
+            amount, error = parse_amount(row.get("expense_amount"))
+            expense_date = None
+            if not error:
+                expense_date, error = parse_date(row.get("expense_date"))
+            if not error and not row.get("expense_name"):
+                error = "expense_name is required"
+            if not error and row.get("category") is not None and row["category"] not in EXPENSE_CATEGORIES:
+                error = f"category must be one of {', '.join(EXPENSE_CATEGORIES)}"
+            if not error and expense_date.year not in budget_ids:
+                error = f"No budget found for fiscal year {expense_date.year}"
+            if error:
+                result.update(status="invalid", error=error)
+                continue
+
+            result["status"] = "valid" if dry_run else "created"
+            expenses.append({
+                "club_id": club_id,
+                "budget_id": budget_ids[expense_date.year],
+                "expense_name": row["expense_name"],
+                "expense_amount": amount,
+                "expense_date": expense_date,
+                "description": row.get("description"),
+                "category": row.get("category"),
+            })
+
+        if expenses and not dry_run:
+            session.execute(Expense.__table__.insert(), expenses)
+        return {"dry_run": dry_run, "summary": summarize(report), "results": report}, 200
+
+    return run_import(mutation, dry_run)
+
+
+def import_contributions(club_id, rows, dry_run=False):
+    """
+    Import sponsorship contribution rows in one transaction, creating the
+    sponsors they name that do not exist yet. Returns (body, status_code).
+    """
+    def mutation(session, dry_run):
+        if session.get(Club, club_id) is None:
+            return {"error": "Club not found"}, 404
+
+        names = json_array({str(row.get("sponsor_name") or "").strip() for row in rows})
+
+        # One lookup for every sponsor named in the upload...
+        sponsor_ids = dict(
+            session.execute(
+                text(
+                    "SELECT sponsor_name, sponsor_id FROM Sponsors "
+                    "WHERE sponsor_name IN (SELECT value FROM json_each(:names))"
+                ),
+                {"names": names},
+            ).all()
+        )
+        # ...and for the contributions they already made to this club
+        recorded = {
+            (name, contribution_date)
+            for name, contribution_date in session.execute(
+                text(
+                    "SELECT Sponsors.sponsor_name, SponsorshipContribution.contribution_date "
+                    "FROM SponsorshipContribution JOIN Sponsors USING (sponsor_id) "
+                    "WHERE SponsorshipContribution.club_id = :club_id "
+                    "AND Sponsors.sponsor_name IN (SELECT value FROM json_each(:names))"
+                ),
+                {"club_id": club_id, "names": names},
+            )
+        }
+
+        report, contributions, new_sponsors = [], [], {}
+        for index, row in enumerate(rows, start=1):
+            name = str(row.get("sponsor_name") or "").strip()
+            result = {"row": index, "sponsor_name": name or None}
+            report.append(result)
+
+            error = None if name else "sponsor_name is required"
+            amount = contribution_date = None
+            if not error:
+                amount, error = parse_amount(row.get("contribution_amount"))
+            if not error:
+                contribution_date, error = parse_date(row.get("contribution_date"))
+            if error:
+                result.update(status="invalid", error=error)
+                continue
+
+            key = (name, contribution_date.isoformat())
+            if key in recorded:
+                result["status"] = "duplicate"
+                continue
+            recorded.add(key)
+
+            if name not in sponsor_ids and name not in new_sponsors:
+                new_sponsors[name] = {
+                    "sponsor_name": name,
+                    "contact_person": row.get("contact_person"),
+                    "contact_email": row.get("contact_email"),
+                    "phone_number": row.get("phone_number"),
+                    "address": row.get("address"),
+                }
+            result["status"] = "valid" if dry_run else "created"
+            contributions.append({
+                "sponsor_name": name,
+                "club_id": club_id,
+                "contribution_amount": amount,
+                "contribution_date": contribution_date,
+            })
+
+        if not dry_run:
+            # Create every missing sponsor with one insert
+            if new_sponsors:
+                sponsors = Sponsor.__table__
+                sponsor_ids.update(
+                    session.execute(
+                        sponsors.insert().returning(sponsors.c.sponsor_name, sponsors.c.sponsor_id),
+                        list(new_sponsors.values()),
+                    ).all()
+                )
+            if contributions:
+                for contribution in contributions:
+                    contribution["sponsor_id"] = sponsor_ids[contribution.pop("sponsor_name")]
+                session.execute(SponsorshipContribution.__table__.insert(), contributions)
+
+        return {
+            "dry_run": dry_run,
+            "summary": summarize(report),
+            "new_sponsors": sorted(new_sponsors),
+            "results": report,
+        }, 200
+
+    return run_import(mutation, dry_run)
+
+
+@job_handler("expense_import")
+def run_expense_import(job):
+    """Background variant of POST /api/expenses/<id>/bulk?async=true."""
+    body, status = import_expenses(job.params["club_id"], job.params["rows"], job.params.get("dry_run", False))
+    if status != 200:
+        raise ValueError(body["error"])
+    return body
+
+
+@job_handler("contribution_import")
+def run_contribution_import(job):
+    """Background variant of POST /api/sponsors/<id>/bulk?async=true."""
+    body, status = import_contributions(job.params["club_id"], job.params["rows"], job.params.get("dry_run", False))
+    if status != 200:
+        raise ValueError(body["error"])
+    return body
@@ -0,0 +1,205 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from sqlalchemy import column
+from app.db_utils import readonly_uri
+from app.pagination import PaginationError, decode_cursor, encode_cursor
+from app.search import match_expression
+
+# Searchable entities for GET /api/search, in tie-break order, as
+# type -> (FTS5 index, SELECT of id, title, subtitle, club_id from the
+# content table aliased "t")
+SEARCH_ENTITIES = {
+    "club": (
+        "ClubsSearch",
+        "SELECT t.club_id, t.club_name, t.club_description, t.club_id FROM Clubs t",
+    ),
+    "student": (
+        "StudentsSearch",
+        "SELECT t.student_id, t.first_name || ' ' || t.last_name, t.email, NULL FROM Students t",
+    ),
+    "event": (
+        "EventsSearch",
+        "SELECT t.event_id, t.event_name, t.event_date || ' at ' || t.location, t.club_id FROM Events t",
+    ),
+    "sponsor": (
+        "SponsorsSearch",
+        "SELECT t.sponsor_id, t.sponsor_name, t.contact_person, NULL FROM Sponsors t",
+    ),
+    "expense": (
+        "ExpensesSearch",
+        "SELECT t.expense_id, t.expense_name, t.description, t.club_id FROM Expenses t",
+    ),
+}
+_ENTITY_TYPES = list(SEARCH_ENTITIES)
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# The cursor is the last result's (bm25 score, entity position, rowid)
+_CURSOR_COLUMNS = [column("score"), column("entity"), column("rowid")]
+
+# SQLite VM instructions between checks of a query's deadline
+_DEADLINE_CHECK_INSTRUCTIONS = 1000
+
+
+class GlobalSearchError(ValueError):
+    """Raised for an unknown entity type in ?types=."""
+
+
+def parse_types(raw):
+    """Entity types named in ?types=a,b (all of them when empty)."""
+    if not raw or not raw.strip():
+        return list(_ENTITY_TYPES)
+    types = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = sorted(types.difference(SEARCH_ENTITIES))
+    if unknown:
+        raise GlobalSearchError(
+            f"Unknown types: {', '.join(unknown)}. Available types: {', '.join(_ENTITY_TYPES)}"
+        )
+    return [name for name in _ENTITY_TYPES if name in types]
+
+
+def _decode_search_cursor(cursor):
+    score, entity, rowid = decode_cursor(cursor, _CURSOR_COLUMNS)
+    if not isinstance(score, (int, float)) or not isinstance(entity, int) or not isinstance(rowid, int):
+        raise PaginationError("Invalid cursor")
+    return score, entity, rowid
+
+
+class GlobalSearch:
+    """
+    Searches every entity's full-text index at once. Each entity is queried
+    on its own thread of a shared pool, over per-thread read-only
+    connections, and the results are merged by bm25 score into one ranked
+    list with keyset pagination.
+
+    Every entity gets the same `timeout` from the start of the request. An
+    entity that has not answered by then is left out of the page, which is
+    flagged as partial in "timed_out", so one slow index can't stall the
+    whole response. Each query carries its own deadline in a progress
+    handler and aborts itself when it passes, so cancelling one request's
+    query never touches a connection another request is using.
+    """
+
+    def __init__(self, db_path, workers=len(SEARCH_ENTITIES), timeout=0.25):
+        self.db_path = db_path
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="global-search")
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(readonly_uri(self.db_path), uri=True, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def search(self, q, types, limit=DEFAULT_SEARCH_LIMIT, cursor=None):
+        """
+        One page of results for `q` across `types`. Returns {"results",
+        "next_cursor", "timed_out"}; results carry their type, id, title,
+        subtitle, club_id (when the entity belongs to a club) and score
+        (higher is more relevant).
+        """
+        match = match_expression({None: q})
+        if match is None:
+            return {"results": [], "next_cursor": None, "timed_out": []}
+        after = _decode_search_cursor(cursor) if cursor else None
+
+        deadline = time.monotonic() + self.timeout
+        futures = {
+            self._executor.submit(self._search_entity, name, match, after, limit + 1, deadline): name
+            for name in types
+        }
+        done, pending = wait(futures, timeout=self.timeout)
+
+        # Queries still running stop at their own deadline
+        timed_out = []
+        for future in pending:
+            future.cancel()
+            timed_out.append(futures[future])
+
+        rows = []
+        for future in done:
+            try:
+                found = future.result()
+            except sqlite3.OperationalError as e:
+                if "interrupted" not in str(e):
+                    raise
+                found = None
+            if found is None:
+                timed_out.append(futures[future])
+            else:
+                rows.extend(found)
+
+        rows.sort(key=lambda row: (row[0], row[1], row[2]))
+        page = rows[:limit]
+        next_cursor = encode_cursor(list(page[-1][:3])) if len(rows) > limit else None
+        return {
+            "results": [
+                {
+                    "type": _ENTITY_TYPES[entity],
+                    "id": entity_id,
+                    "title": title,
+                    "subtitle": subtitle,
+                    "club_id": club_id,
+                    "score": -score,
+                }
+                for score, entity, _, entity_id, title, subtitle, club_id in page
+            ],
+            "next_cursor": next_cursor,
+            "timed_out": sorted(timed_out, key=_ENTITY_TYPES.index),
+        }
+
+    def _search_entity(self, name, match, after, limit, deadline):
+        # Out of time before a thread was free: skip (reported as timed out)
+        if time.monotonic() >= deadline:
+            return None
+        index, select = SEARCH_ENTITIES[name]
+        entity = _ENTITY_TYPES.index(name)
+
+        # Keyset condition for results ranked after the cursor's
+        # (score, entity, rowid)
+        keyset, params = "", {"match": match, "limit": limit}
+        if after is not None:
+            score, after_entity, rowid = after
+            params["score"] = score
+            if entity > after_entity:
+                keyset = "WHERE hits.score >= :score"
+            elif entity < after_entity:
+                keyset = "WHERE hits.score > :score"
+            else:
+                keyset = "WHERE hits.score > :score OR (hits.score = :score AND hits.rowid > :rowid)"
+                params["rowid"] = rowid
+
+        prefix, _, table = select.rpartition(" FROM ")
+        sql = f"""
+            {prefix}, hits.score, hits.rowid FROM (
+                SELECT rowid, bm25({index}) AS score FROM {index} WHERE {index} MATCH :match
+            ) hits
+            JOIN {table} ON t.rowid = hits.rowid
+            {keyset}
+            ORDER BY hits.score, hits.rowid LIMIT :limit
+        """
+        conn = self._connect()
+        conn.set_progress_handler(lambda: time.monotonic() >= deadline, _DEADLINE_CHECK_INSTRUCTIONS)
+        try:
+            return [
+                (score, entity, rowid, entity_id, title, subtitle, club_id)
+                for entity_id, title, subtitle, club_id, score, rowid in conn.execute(sql, params).fetchall()
+            ]
+        finally:
+            conn.set_progress_handler(None, 0)
+
+
+def init_global_search(app):
+    """Create the app's GET /api/search thread pool."""
+    db_path = app.config.get("DATABASE_PATH") or os.path.join(app.instance_path, "database.db")
+    app.extensions["global_search"] = GlobalSearch(
+        db_path,
+        workers=app.config.get("GLOBAL_SEARCH_WORKERS", len(SEARCH_ENTITIES)),
+        timeout=app.config.get("GLOBAL_SEARCH_TIMEOUT_MS", 250) / 1000,
+    )
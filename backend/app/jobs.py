@@ -0,0 +1,388 @@
+import os
+import socket
+import threading
+import time
+from flask import current_app, jsonify, request
+from sqlalchemy import text
+from app.db_utils import READONLY_BIND
+from app.models import db
+from app.write_queue import submit_write
+
+# Job.status values (CHECK constraint in migration 6)
+JOB_STATUSES = ("queued", "running", "succeeded", "failed", "cancelled")
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+# Built-in handlers, kind -> handler(job), registered with @job_handler and
+# copied into each app's JobRunner by init_jobs
+JOB_HANDLERS = {}
+
+
+class JobError(ValueError):
+    """Raised for a job that cannot be queued (e.g. an unknown kind)."""
+
+
+class JobNotFound(JobError):
+    """Raised for a job whose params refer to a row that does not exist."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler when its job was cancelled or its lease was lost."""
+
+
+def job_handler(kind, check_params=None):
+    """
+    Register `handler(job)` as the built-in handler for jobs of `kind` (apps
+    can add their own with app.extensions["jobs"].register). The handler
+    receives a JobContext, should call job.report(progress) between units of
+    work, and returns the job's (JSON-serializable) result. Jobs whose worker
+    died are run again from the start, so handlers must be safe to re-run.
+
+    `check_params(params)` runs before a job is queued and raises JobError
+    (or JobNotFound) for params the handler would fail on.
+    """
+    def register(handler):
+        handler.check_params = check_params
+        JOB_HANDLERS[kind] = handler
+        return handler
+    return register
+
+
+def wants_background():
+    """True when the client asked to run the request as a job (?async=true)."""
+    return request.args.get("async", "").lower() in ("1", "true", "yes")
+
+
+def enqueue_job(kind, params=None):
+    """Queue a job and return its id. Workers in any process may pick it up."""
+    runner = current_app.extensions["jobs"]
+    handler = runner.handlers.get(kind)
+    if handler is None:
+        raise JobError(f"Unknown job kind: {kind}. Available kinds: {', '.join(sorted(runner.handlers))}")
+    check_params = getattr(handler, "check_params", None)
+    if check_params is not None:
+        check_params(params or {})
+    encoded = current_app.json.dumps(params or {})
+    job_id = submit_write(
+        lambda session: session.execute(
+            text("INSERT INTO Jobs (kind, params) VALUES (:kind, :params) RETURNING job_id"),
+            {"kind": kind, "params": encoded},
+        ).scalar()
+    )
+    runner.wake()
+    return job_id
+
+
+def job_accepted(job_id):
+    """202 response pointing the client at the job's status URL."""
+    location = f"/api/jobs/{job_id}"
+    response = jsonify({"job_id": job_id, "status": "queued", "status_url": location})
+    response.status_code = 202
+    response.headers["Location"] = location
+    return response
+
+
+def serialize_job(job):
+    loads = current_app.json.loads
+    return {
+        "job_id": job.job_id,
+        "kind": job.kind,
+        "status": job.status,
+        "progress": loads(job.progress) if job.progress else None,
+        "result": loads(job.result) if job.result else None,
+        "error": job.error,
+        "cancel_requested": bool(job.cancel_requested),
+        "attempts": job.attempts,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def cancel_job(job_id):
+    """
+    Cancel a job. A queued job is cancelled straight away; a running one is
+    flagged and stops at its next progress report. Returns (body, status).
+    """
+    def mutation(session):
+        status = session.execute(
+            text("SELECT status FROM Jobs WHERE job_id = :job_id"), {"job_id": job_id}
+        ).scalar()
+        if status is None:
+            return {"error": "Job not found"}, 404
+        if status in FINISHED_STATUSES:
+            return {"error": f"Job has already {'been cancelled' if status == 'cancelled' else status}"}, 409
+        if status == "queued":
+            session.execute(
+                text(
+                    "UPDATE Jobs SET status = 'cancelled', cancel_requested = 1, "
+                    "finished_at = CURRENT_TIMESTAMP WHERE job_id = :job_id"
+                ),
+                {"job_id": job_id},
+            )
+            return {"job_id": job_id, "status": "cancelled"}, 200
+        session.execute(
+            text("UPDATE Jobs SET cancel_requested = 1 WHERE job_id = :job_id"), {"job_id": job_id}
+        )
+        return {"job_id": job_id, "status": "running", "cancel_requested": True}, 202
+
+    return submit_write(mutation)
+
+
+class JobContext:
+    """What a handler sees of its job: its params and a way to report progress."""
+
+    def __init__(self, job_id, owner, params):
+        self.job_id = job_id
+        self.owner = owner
+        self.params = params
+
+    def report(self, progress):
+        """
+        Store `progress` for GET /api/jobs/<id>. Raises JobCancelled if the
+        job was cancelled, or if its lease expired and another worker took it.
+        """
+        encoded = current_app.json.dumps(progress)
+        cancel_requested = submit_write(
+            lambda session: session.execute(
+                text(
+                    "UPDATE Jobs SET progress = :progress WHERE job_id = :job_id "
+                    "AND lease_owner = :owner AND status = 'running' RETURNING cancel_requested"
+                ),
+                {"progress": encoded, "job_id": self.job_id, "owner": self.owner},
+            ).scalar()
+        )
+        if cancel_requested is None:
+            raise JobCancelled("Job lease was lost to another worker")
+        if cancel_requested:
+            raise JobCancelled("Job was cancelled")
+
+
+class JobRunner:
+    """
+    Pool of worker threads running queued jobs from the Jobs table.
+
+    Jobs live in the database, so they survive restarts and need no broker:
+    a worker claims the oldest queued job by taking a lease on it, and a
+    heartbeat thread renews the leases of running jobs every third of
+    `lease_seconds`. If a process dies mid-job its lease runs out and any
+    worker (in any process) claims the job again, up to `max_attempts` times.
+
+    Workers only take the write lock to claim a job after a read on the
+    read-only engine has seen one waiting, so idle polling costs no writes.
+
+    `handlers` (kind -> handler) belong to the runner, so each app has its own.
+    """
+
+    def __init__(self, app, workers=2, lease_seconds=30, poll_interval=1.0, max_attempts=3, retention_days=7,
+                 handlers=None):
+        self.app = app
+        self.handlers = dict(JOB_HANDLERS if handlers is None else handlers)
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retention_days = retention_days
+        self._identity = f"{socket.gethostname()}:{os.getpid()}"
+        self._active = {}  # owner -> job_id of the job it is running
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._started_pid = None
+        self._last_prune = 0.0
+
+    def register(self, kind, handler, check_params=None):
+        """Add a handler for jobs of `kind` to this runner only (see job_handler)."""
+        handler.check_params = check_params
+        self.handlers[kind] = handler
+
+    def ensure_started(self):
+        """Start the workers in this process, once."""
+        if self._started_pid == os.getpid():
+            return
+        with self._lock:
+            if self._started_pid != os.getpid():
+                self._started_pid = os.getpid()
+                self._identity = f"{socket.gethostname()}:{os.getpid()}"
+                self.start()
+
+    def start(self):
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._work, args=(f"{self._identity}:{index}",), name=f"job-worker-{index}", daemon=True)
+            for index in range(self.workers)
+        ]
+        self._threads.append(threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=None):
+        """Stop taking new jobs and wait for the workers to finish their current one."""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wake(self):
+        self._wake.set()
+
+    def run_pending(self):
+        """Run waiting jobs in the calling thread until none are left. Returns how many ran."""
+        owner = f"{self._identity}:{threading.get_ident()}"
+        count = 0
+        with self.app.app_context():
+            while self.run_next(owner):
+                count += 1
+        return count
+
+    def run_next(self, owner):
+        """Claim and run one job. Returns False when nothing was waiting."""
+        if not self._has_waiting():
+            return False
+        job = submit_write(lambda session: self._claim(session, owner))
+        if job is None:
+            return False
+        job_id, kind, params, attempts, cancel_requested = job
+
+        handler = self.handlers.get(kind)
+        if cancel_requested:
+            self._finish(job_id, owner, "cancelled")
+        elif attempts > self.max_attempts:
+            self._finish(job_id, owner, "failed", error=f"Job was abandoned by its worker {attempts - 1} times")
+        elif handler is None:
+            self._finish(job_id, owner, "failed", error=f"Unknown job kind: {kind}")
+        else:
+            self._run(handler, job_id, owner, params)
+        return True
+
+    def _has_waiting(self):
+        with db.engines[READONLY_BIND].connect() as connection:
+            return connection.execute(
+                text(
+                    "SELECT 1 FROM Jobs WHERE status = 'queued' "
+                    "OR (status = 'running' AND lease_expires_at < :now) LIMIT 1"
+                ),
+                {"now": time.time()},
+            ).first() is not None
+
+    def _claim(self, session, owner):
+        now = time.time()
+        return session.execute(
+            text(
+                """
+                UPDATE Jobs SET status = 'running', lease_owner = :owner,
+                    lease_expires_at = :expires, attempts = attempts + 1,
+                    started_at = COALESCE(started_at, CURRENT_TIMESTAMP)
+                WHERE job_id = (
+                    SELECT job_id FROM Jobs
+                    WHERE status = 'queued' OR (status = 'running' AND lease_expires_at < :now)
+                    ORDER BY job_id LIMIT 1
+                )
+                RETURNING job_id, kind, params, attempts, cancel_requested
+                """
+            ),
+            {"owner": owner, "now": now, "expires": now + self.lease_seconds},
+        ).first()
+
+    def _run(self, handler, job_id, owner, params):
+        with self._lock:
+            self._active[owner] = job_id
+        try:
+            result = handler(JobContext(job_id, owner, current_app.json.loads(params)))
+        except JobCancelled as e:
+            self._finish(job_id, owner, "cancelled", error=str(e))
+        except Exception as e:
+            db.session.rollback()
+            self._finish(job_id, owner, "failed", error=str(e))
+        else:
+            self._finish(job_id, owner, "succeeded", result=result)
+        finally:
+            with self._lock:
+                self._active.pop(owner, None)
+            db.session.remove()
+
+    def _finish(self, job_id, owner, status, result=None, error=None):
+        encoded = current_app.json.dumps(result) if result is not None else None
+        submit_write(
+            lambda session: session.execute(
+                text(
+                    "UPDATE Jobs SET status = :status, result = :result, error = :error, "
+                    "lease_owner = NULL, lease_expires_at = NULL, finished_at = CURRENT_TIMESTAMP "
+                    "WHERE job_id = :job_id AND lease_owner = :owner AND status = 'running'"
+                ),
+                {"status": status, "result": encoded, "error": error, "job_id": job_id, "owner": owner},
+            )
+        )
+
+    def _work(self, owner):
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    ran = self.run_next(owner)
+                    self._prune()
+            except Exception as e:
+                print(f"Job worker {owner} failed to claim a job, will retry: {e}")
+                ran = False
+            if not ran:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def _heartbeat(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            with self._lock:
+                leases = list(self._active.items())
+            if not leases:
+                continue
+            expires = time.time() + self.lease_seconds
+            try:
+                with self.app.app_context():
+                    submit_write(
+                        lambda session: [
+                            session.execute(
+                                text(
+                                    "UPDATE Jobs SET lease_expires_at = :expires "
+                                    "WHERE job_id = :job_id AND lease_owner = :owner AND status = 'running'"
+                                ),
+                                {"expires": expires, "job_id": job_id, "owner": owner},
+                            )
+                            for owner, job_id in leases
+                        ]
+                    )
+            except Exception as e:
+                print(f"Job lease renewal failed, will retry: {e}")
+
+    def _prune(self):
+        # Finished jobs are kept for retention_days so clients can read results
+        if time.monotonic() - self._last_prune < 3600:
+            return
+        self._last_prune = time.monotonic()
+        submit_write(
+            lambda session: session.execute(
+                text(
+                    "DELETE FROM Jobs WHERE status IN ('succeeded', 'failed', 'cancelled') "
+                    "AND finished_at < datetime('now', :age)"
+                ),
+                {"age": f"-{self.retention_days} days"},
+            )
+        )
+
+
+def init_jobs(app):
+    """
+    Create the app's job runner. Its workers (none when JOB_WORKERS is 0)
+    start with the first request the process serves, so `flask` commands and
+    the reloader's watcher process, which serve none, never run jobs, and
+    forked workers each start their own.
+    """
+    runner = JobRunner(
+        app,
+        workers=app.config.get("JOB_WORKERS", 2),
+        lease_seconds=app.config.get("JOB_LEASE_SECONDS", 30),
+        poll_interval=app.config.get("JOB_POLL_INTERVAL_MS", 1000) / 1000,
+        max_attempts=app.config.get("JOB_MAX_ATTEMPTS", 3),
+        retention_days=app.config.get("JOB_RETENTION_DAYS", 7),
+    )
+    app.extensions["jobs"] = runner
+    if runner.workers > 0:
+        app.before_request(runner.ensure_started)
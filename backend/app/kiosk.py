@@ -0,0 +1,287 @@
+import atexit
+import logging
+import threading
+from datetime import datetime
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.attendance import TIME_STORAGE_FORMAT, insert_attendance_records, validate_attendance_row
+from app.db_utils import readonly_bind_arguments
+from app.models import db, Event, EventAttendance, Membership, Student
+
+logger = logging.getLogger(__name__)
+
+
+class KioskSession:
+    """
+    Check-in state for one event in this worker: the roster of students who
+    may check in (every student, flagged when they are a member of the
+    hosting club), the students already checked in, and the buffer of
+    accepted check-ins not yet written to EventAttendance.
+    """
+
+    def __init__(self, event_id, club_id, roster, members, checked_in):
+        self.event_id = event_id
+        self.club_id = club_id
+        self.roster = roster  # student_id -> member name
+        self.members = members
+        self.checked_in = checked_in
+        self.pending = []
+        self.dropped = 0  # check-ins that could not be written, e.g. after the event was deleted
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, event_id):
+        """
+        Build the session's indexes with one query per table, on the read-only
+        engine. None if the event does not exist.
+        """
+        bind = readonly_bind_arguments()
+        club_id = db.session.execute(
+            select(Event.club_id).where(Event.event_id == event_id), bind_arguments=bind
+        ).scalar()
+        if club_id is None:
+            return None
+
+        roster = {
+            student_id: f"{first_name} {last_name}"
+            for student_id, first_name, last_name in db.session.execute(
+                select(Student.student_id, Student.first_name, Student.last_name), bind_arguments=bind
+            )
+        }
+        members = set(
+            db.session.execute(
+                select(Membership.student_id).where(Membership.club_id == club_id), bind_arguments=bind
+            ).scalars()
+        )
+        checked_in = set(
+            db.session.execute(
+                select(EventAttendance.student_id).where(EventAttendance.event_id == event_id),
+                bind_arguments=bind,
+            ).scalars()
+        )
+        return cls(event_id, club_id, roster, members, checked_in)
+
+    def take_pending(self):
+        with self.lock:
+            pending, self.pending = self.pending, []
+        return pending
+
+    def restore_pending(self, records):
+        """Put back records whose flush failed, ahead of newer check-ins."""
+        with self.lock:
+            self.pending[:0] = records
+
+    def drop(self, records):
+        """Forget records that can never be written, so those students may check in again."""
+        with self.lock:
+            self.checked_in.difference_update(record["student_id"] for record in records)
+            self.dropped += len(records)
+
+    def counts(self):
+        """
+        `checked_in` is the event's total: the attendance recorded in the
+        database (by every worker) plus this worker's pending check-ins.
+        The other counts are this worker's. Other workers' pending check-ins
+        show up once they flush, within a flush interval.
+        """
+        recorded = db.session.execute(
+            select(func.count()).select_from(EventAttendance).where(EventAttendance.event_id == self.event_id),
+            bind_arguments=readonly_bind_arguments(),
+        ).scalar()
+        with self.lock:
+            return {
+                "event_id": self.event_id,
+                "checked_in": recorded + len(self.pending),
+                "pending": len(self.pending),
+                "dropped": self.dropped,
+                "roster_size": len(self.roster),
+            }
+
+
+class KioskManager:
+    """
+    Owns this worker's kiosk sessions and the write-behind flusher.
+
+    Check-ins are validated against in-memory indexes and acknowledged
+    straight away; a background thread writes buffered check-ins to
+    EventAttendance every `flush_interval` seconds, or as soon as a session
+    has `flush_size` pending. Buffers are flushed when a session is closed
+    and at interpreter exit, so a clean shutdown loses nothing; a crash can
+    lose at most one flush interval of check-ins.
+
+    Flushes go through `write_queue` (when enabled), giving up after
+    `flush_timeout` seconds if the writer is busy; the records are then kept
+    for the next tick. A batch that breaks a constraint is retried row by
+    row and the rows that still fail are dropped, logged and counted.
+
+    Sessions are per process. Under several workers each one loads its own
+    roster, so the 409 for a duplicate check-in only covers check-ins made
+    through the same worker; duplicates across workers are absorbed by
+    UNIQUE(event_id, student_id) when they are flushed. Closing a session
+    closes this worker's only; the others flush on their own. Counts read
+    the recorded total from the database (see KioskSession.counts).
+    """
+
+    def __init__(self, engine, write_queue=None, flush_interval=0.2, flush_size=100, flush_timeout=2.0):
+        self.engine = engine
+        self.write_queue = write_queue
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.flush_timeout = flush_timeout
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        atexit.register(self.flush_all, direct=True)
+
+    def get(self, event_id, create=True):
+        """The event's session, loading it on first use. None if the event does not exist."""
+        with self._lock:
+            session = self._sessions.get(event_id)
+        if session is not None or not create:
+            return session
+
+        # Loaded outside the lock, so other events' check-ins don't wait on
+        # this roster; a session loaded meanwhile by another request wins
+        loaded = KioskSession.load(event_id)
+        if loaded is None:
+            return None
+        with self._lock:
+            session = self._sessions.setdefault(event_id, loaded)
+            self._ensure_started()
+        return session
+
+    def close(self, event_id):
+        """
+        Flush and forget the event's session. Returns its final counts, or
+        None. If the flush fails the session stays open (with `pending` > 0)
+        so the flusher can retry it.
+        """
+        with self._lock:
+            session = self._sessions.get(event_id)
+        if session is None:
+            return None
+        self._flush(session)
+        with self._lock, session.lock:
+            if not session.pending:
+                self._sessions.pop(event_id, None)
+        return session.counts()
+
+    def check_in(self, session, row):
+        """
+        Validate and buffer one check-in. Returns (result, status_code).
+        Students missing from the roster (e.g. registered after the session
+        was opened) are looked up once and added to it.
+        """
+        record, error = validate_attendance_row(row)
+        if error:
+            return {"error": error}, 400
+        if record["check_in_time"] is None:
+            record["check_in_time"] = datetime.now().strftime(TIME_STORAGE_FORMAT)
+
+        student_id = record["student_id"]
+        with session.lock:
+            name = session.roster.get(student_id)
+        if name is None:
+            student = db.session.get(Student, student_id, bind_arguments=readonly_bind_arguments())
+            if student is None:
+                return {"error": "Student is not registered"}, 404
+            with session.lock:
+                name = session.roster.setdefault(student_id, f"{student.first_name} {student.last_name}")
+
+        with session.lock:
+            if student_id in session.checked_in:
+                return {"error": "Student has already been recorded for this event"}, 409
+            session.checked_in.add(student_id)
+            session.pending.append(record)
+            full = len(session.pending) >= self.flush_size
+
+        if full:
+            self._wake.set()
+        return {
+            "student_id": student_id,
+            "member_name": name,
+            "is_member": student_id in session.members,
+            "checked_in": len(session.checked_in),
+        }, 202
+
+    def flush_all(self, direct=False):
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            self._flush(session, direct)
+
+    def _flush(self, session, direct=False):
+        records = session.take_pending()
+        if not records:
+            return
+
+        def write(write_session):
+            return _insert_or_drop(write_session, session.event_id, records)
+
+        try:
+            if direct or self.write_queue is None:
+                # The final flush at exit writes on the writer engine itself;
+                # pool_timeout and busy_timeout bound its wait for the lock
+                with Session(self.engine) as write_session:
+                    dropped = write(write_session)
+                    write_session.commit()
+            else:
+                dropped = self.write_queue.submit(write, timeout=self.flush_timeout)
+        except Exception as e:
+            # Writer busy or locked (or any other failure): retry on the next tick
+            session.restore_pending(records)
+            logger.warning("Kiosk flush of %d check-ins for event %s failed, will retry: %s",
+                           len(records), session.event_id, e)
+            return
+
+        if dropped:
+            session.drop(dropped)
+            logger.warning("Dropped %d kiosk check-ins for event %s that cannot be written: %s",
+                           len(dropped), session.event_id, ", ".join(r["student_id"] for r in dropped))
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="kiosk-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush_all()
+
+
+def _insert_or_drop(write_session, event_id, records):
+    """
+    Insert `records`. If the batch breaks a constraint (e.g. its event or a
+    student was deleted since check-in), insert them one at a time instead
+    and return the records that fail, which are not worth retrying.
+    """
+    try:
+        with write_session.begin_nested():
+            insert_attendance_records(write_session, event_id, records)
+        return []
+    except IntegrityError:
+        pass
+
+    dropped = []
+    for record in records:
+        try:
+            with write_session.begin_nested():
+                insert_attendance_records(write_session, event_id, [record])
+        except IntegrityError:
+            dropped.append(record)
+    return dropped
+
+
+def init_kiosk(app):
+    """Create the app's kiosk session manager. Must be called after init_write_queue."""
+    app.extensions["kiosk"] = KioskManager(
+        db.engine,
+        write_queue=app.extensions.get("write_queue"),
+        flush_interval=app.config.get("KIOSK_FLUSH_INTERVAL_MS", 200) / 1000,
+        flush_size=app.config.get("KIOSK_FLUSH_MAX_RECORDS", 100),
+        flush_timeout=app.config.get("KIOSK_FLUSH_TIMEOUT_MS", 2000) / 1000,
+    )
@@ -0,0 +1,140 @@
+from sqlalchemy import text
+from app.bulk import json_array, summarize
+from app.jobs import job_handler
+from app.models import Club, Membership, Student
+from app.serializers import MODEL_FIELDS
+from app.write_queue import submit_write
+
+# Membership.active_status values (CHECK constraint in schema.sql)
+MEMBERSHIP_STATUSES = ("Active", "Inactive", "Pending")
+
+
+def validate_member_row(row):
+    """Normalize one bulk member row. Returns (member, error)."""
+    student_id = str(row.get("student_id") or "").strip()
+    if not student_id:
+        return None, "student_id is required"
+
+    active_status = row.get("active_status") or "Active"
+    if active_status not in MEMBERSHIP_STATUSES:
+        return None, f"active_status must be one of {', '.join(MEMBERSHIP_STATUSES)}"
+
+    graduation_year = row.get("graduation_year")
+    if graduation_year is not None:
+        try:
+            graduation_year = int(graduation_year)
+        except (TypeError, ValueError):
+            return None, "graduation_year must be an integer"
+        if not 2000 <= graduation_year <= 2100:
+            return None, "graduation_year must be between 2000 and 2100"
+
+    email = row.get("email")
+    return {
+        "student_id": student_id,
+        "first_name": row.get("first_name"),
+        "last_name": row.get("last_name"),
+        "email": email.strip() if isinstance(email, str) else email,
+        "phone_number": row.get("phone_number"),
+        "major": row.get("major"),
+        "graduation_year": graduation_year,
+        "active_status": active_status,
+    }, None
+
+
+def import_members(club_id, rows):
+    """
+    Import members in one transaction. Students are matched against existing
+    ones by id and email with a single set-based lookup; new students and
+    memberships are inserted with executemany. Returns (body, status), where
+    the body has a result per row: "created" (new student added to the
+    club), "added" (existing student added), "already_member", or "invalid"
+    with an error message.
+    """
+    results = []
+    candidates = []
+    for index, row in enumerate(rows, start=1):
+        member, error = validate_member_row(row)
+        if error:
+            results.append({"row": index, "student_id": row.get("student_id"), "status": "invalid", "error": error})
+        else:
+            candidates.append((index, member))
+
+    def mutation(session):
+        if session.get(Club, club_id) is None:
+            return {"error": "Club not found"}, 404
+
+        ids = json_array(member["student_id"] for _, member in candidates)
+        emails = json_array(member["email"] for _, member in candidates if member["email"])
+
+        # One lookup for every student matching an id or an email in the upload
+        student_by_id, student_by_email = {}, {}
+        for student_id, email in session.execute(
+            text(
+                "SELECT student_id, email FROM Students "
+                "WHERE student_id IN (SELECT value FROM json_each(:ids)) "
+                "OR email IN (SELECT value FROM json_each(:emails))"
+            ),
+            {"ids": ids, "emails": emails},
+        ):
+            student_by_id[student_id] = email
+            student_by_email[email] = student_id
+
+        members = set(
+            session.execute(
+                text(
+                    "SELECT student_id FROM Membership WHERE club_id = :club_id "
+                    "AND student_id IN (SELECT value FROM json_each(:ids))"
+                ),
+                {"club_id": club_id, "ids": ids},
+            ).scalars()
+        )
+
+        report = list(results)
+        new_students, new_memberships = [], []
+        for index, member in candidates:
+            student_id, email = member["student_id"], member["email"]
+            result = {"row": index, "student_id": student_id}
+            report.append(result)
+
+            if student_id in members:
+                result["status"] = "already_member"
+                continue
+
+            if student_id in student_by_id:
+                result["status"] = "added"
+            else:
+                if not (member["first_name"] and member["last_name"] and email):
+                    result.update(status="invalid", error="first_name, last_name and email are required for new students")
+                    continue
+                owner = student_by_email.get(email)
+                if owner is not None:
+                    result.update(status="invalid", error=f"email is already used by student {owner}")
+                    continue
+                result["status"] = "created"
+                new_students.append({name: member[name] for name in MODEL_FIELDS[Student]})
+                student_by_id[student_id] = email
+                student_by_email[email] = student_id
+
+            members.add(student_id)
+            new_memberships.append(
+                {"club_id": club_id, "student_id": student_id, "active_status": member["active_status"]}
+            )
+
+        if new_students:
+            session.execute(Student.__table__.insert(), new_students)
+        if new_memberships:
+            session.execute(Membership.__table__.insert(), new_memberships)
+
+        report.sort(key=lambda result: result["row"])
+        return {"summary": summarize(report), "results": report}, 200
+
+    return submit_write(mutation)
+
+
+@job_handler("member_import")
+def run_member_import(job):
+    """Background variant of POST /api/clubs/<id>/members/bulk?async=true."""
+    body, status = import_members(job.params["club_id"], job.params["rows"])
+    if status != 200:
+        raise ValueError(body["error"])
+    return body
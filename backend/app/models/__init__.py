@@ -1,11 +1,14 @@
 from flask_sqlalchemy import SQLAlchemy
+from app.db_utils import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 # Import all models here
 from .club import Club, Membership
 from .student import Student, EventAttendance
 from .event import Event, EventHosting
 from .sponsor import Sponsor, SponsorshipContribution
-from .budget import Budget, Expense
-from .role import Role, ClubRole
\ No newline at end of file
+from .budget import Budget, BudgetCategorySpend, Expense, FinanceRollup, EXPENSE_CATEGORIES
+from .role import Role, ClubRole
+from .data_version import DataVersion
+from .job import Job
@@ -1,11 +1,23 @@
 from app.models import db
 
+# Allowed Expenses.category values (CHECK constraint in schema.sql)
+EXPENSE_CATEGORIES = ['Event', 'Supplies', 'Travel', 'Food', 'Other']
+
 class Budget(db.Model):
     __tablename__ = 'Budget'
     budget_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     club_id = db.Column(db.Integer, db.ForeignKey('Clubs.club_id'), nullable=False)
     fiscal_year = db.Column(db.Integer, nullable=False)
     total_budget = db.Column(db.Float, nullable=False)
+    # Maintained by triggers on Expenses (see migration 4 in app/db_utils.py)
+    spent_amount = db.Column(db.Float, nullable=False, default=0)
+    remaining_amount = db.Column(db.Float, db.Computed("total_budget - spent_amount"))
+
+class BudgetCategorySpend(db.Model):
+    __tablename__ = 'BudgetCategorySpend'
+    budget_id = db.Column(db.Integer, primary_key=True)
+    category = db.Column(db.Text, primary_key=True)
+    spent_amount = db.Column(db.Float, nullable=False, default=0)
 
 class Expense(db.Model):
     __tablename__ = 'Expenses'
@@ -17,3 +29,13 @@ class Expense(db.Model):
     expense_date = db.Column(db.Date, nullable=False)
     description = db.Column(db.Text)
     category = db.Column(db.Text)
+
+class FinanceRollup(db.Model):
+    # Maintained by triggers on Expenses and SponsorshipContribution (migration 5)
+    __tablename__ = 'FinanceRollup'
+    club_id = db.Column(db.Integer, primary_key=True)
+    fiscal_year = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.Integer, primary_key=True)
+    category = db.Column(db.Text, primary_key=True)
+    expense_total = db.Column(db.Float, nullable=False, default=0)
+    contribution_total = db.Column(db.Float, nullable=False, default=0)
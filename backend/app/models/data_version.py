@@ -0,0 +1,7 @@
+from app.models import db
+
+class DataVersion(db.Model):
+    __tablename__ = 'DataVersions'
+    club_id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.Text, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
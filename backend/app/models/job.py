@@ -0,0 +1,19 @@
+from app.models import db
+
+class Job(db.Model):
+    # Queue of long-running operations (migration 6, see app/jobs.py)
+    __tablename__ = 'Jobs'
+    job_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    kind = db.Column(db.Text, nullable=False)
+    params = db.Column(db.Text, nullable=False, default='{}')
+    status = db.Column(db.Text, nullable=False, default='queued')
+    progress = db.Column(db.Text)
+    result = db.Column(db.Text)
+    error = db.Column(db.Text)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    lease_owner = db.Column(db.Text)
+    lease_expires_at = db.Column(db.Float)
+    created_at = db.Column(db.Text, nullable=False)
+    started_at = db.Column(db.Text)
+    finished_at = db.Column(db.Text)
@@ -0,0 +1,106 @@
+import base64
+import json
+from datetime import date
+from flask import request
+from sqlalchemy import Date, tuple_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class PaginationError(ValueError):
+    """Raised for a malformed `limit` or `cursor` query parameter."""
+
+
+def wants_all():
+    """True when the client asked for the legacy unpaginated response (?all=true)."""
+    return request.args.get("all", "").lower() in ("1", "true", "yes")
+
+
+def encode_cursor(values):
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, date) else value for value in values]
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, key_columns):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise PaginationError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(key_columns):
+        raise PaginationError("Invalid cursor")
+    # Only scalars may be bound as key values (bool is an int, but never a key)
+    if any(isinstance(value, bool) or not isinstance(value, (str, int, float, type(None))) for value in values):
+        raise PaginationError("Invalid cursor")
+
+    # Restore the Python types the columns expect
+    try:
+        return [
+            date.fromisoformat(value) if isinstance(column.type, Date) and value is not None else value
+            for value, column in zip(values, key_columns)
+        ]
+    except (TypeError, ValueError):
+        raise PaginationError("Invalid cursor")
+
+
+def get_page_size():
+    raw = request.args.get("limit")
+    if raw is None:
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise PaginationError("limit must be a positive integer")
+    if limit < 1:
+        raise PaginationError("limit must be a positive integer")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def paginate(query, key_columns, key_of=None):
+    """
+    Keyset-paginate `query` using the request's `cursor` and `limit` parameters.
+
+    `key_columns` must uniquely and stably order the rows (end with a primary
+    key), and should match an index so every page is an index seek no matter
+    how deep the client pages. `key_of(row)` returns the key values of a
+    result row; by default they are read as attributes named after the columns.
+
+    Returns (rows, next_cursor). next_cursor is None on the last page, and
+    always None with ?all=true, which returns every row.
+    """
+    query = query.order_by(*key_columns)
+    if wants_all():
+        return query.all(), None
+
+    limit = get_page_size()
+    cursor = request.args.get("cursor")
+    if cursor:
+        values = decode_cursor(cursor, key_columns)
+        if len(key_columns) == 1:
+            query = query.filter(key_columns[0] > values[0])
+        else:
+            query = query.filter(tuple_(*key_columns) > tuple(values))
+
+    return fetch_page(query, key_columns, limit, key_of)
+
+
+def fetch_page(query, key_columns, limit, key_of=None):
+    """
+    Fetch up to `limit` rows of `query` (already ordered by `key_columns`).
+    Returns (rows, next_cursor) like paginate().
+    """
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    if key_of is None:
+        key_values = [getattr(rows[-1], column.key) for column in key_columns]
+    else:
+        key_values = key_of(rows[-1])
+    return rows, encode_cursor(key_values)
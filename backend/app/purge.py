@@ -0,0 +1,110 @@
+import time
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.db_utils import READONLY_BIND, readonly_bind_arguments
+from app.jobs import JobError, JobNotFound, job_handler
+from app.models import db, Club
+from app.write_queue import submit_write
+
+# Club rows to delete, children before parents (foreign keys are enforced).
+# Each entry is (table, WHERE clause selecting the club's rows). Event-owned
+# rows are found with a subquery, so no id lists are pulled into Python and
+# no statement grows with the size of the club.
+_CLUB_EVENTS = "SELECT event_id FROM Events WHERE club_id = :club_id"
+CLUB_DELETE_STEPS = [
+    ("EventAttendance", f"event_id IN ({_CLUB_EVENTS})"),
+    ("EventHosting", f"club_id = :club_id OR event_id IN ({_CLUB_EVENTS})"),
+    ("ClubRoles", "club_id = :club_id"),
+    ("SponsorshipContribution", "club_id = :club_id"),
+    ("Membership", "club_id = :club_id"),
+    ("Expenses", "club_id = :club_id"),
+    ("Budget", "club_id = :club_id"),
+    ("Events", "club_id = :club_id"),
+    ("Clubs", "club_id = :club_id"),
+]
+
+# Rows deleted per transaction by purge_club
+DEFAULT_PURGE_BATCH_SIZE = 5000
+
+
+def delete_club_rows(session, club_id):
+    """
+    Delete a club and everything that references it with one set-based
+    statement per table, in the session's transaction. Returns
+    {table: rows deleted}.
+    """
+    return {
+        table: session.execute(text(f"DELETE FROM {table} WHERE {where}"), {"club_id": club_id}).rowcount
+        for table, where in CLUB_DELETE_STEPS
+    }
+
+
+def count_club_rows(session, club_id):
+    """{table: rows belonging to the club} for every table a club delete touches."""
+    return {
+        table: session.execute(
+            text(f"SELECT COUNT(*) FROM {table} WHERE {where}"), {"club_id": club_id}
+        ).scalar()
+        for table, where in CLUB_DELETE_STEPS
+    }
+
+
+def purge_club(club_id, batch_size=DEFAULT_PURGE_BATCH_SIZE, pause=0.0):
+    """
+    Delete a club in batches of at most `batch_size` rows, each submitted to
+    the write queue as its own mutation, so other writes get the lock between
+    batches however large the club is. Yields a progress dict after every
+    batch; the last one has "done": True.
+
+    The club row goes last, together with a set-based sweep of anything
+    added to the club while the purge ran. Until then the club stays
+    visible, partly emptied.
+    """
+    # Counted on the read-only engine: the writer connection is only taken per batch
+    with Session(db.engines[READONLY_BIND]) as session:
+        totals = count_club_rows(session, club_id)
+    deleted = dict.fromkeys(totals, 0)
+    progress = {"club_id": club_id, "totals": totals, "deleted": deleted, "batches": 0, "done": False}
+
+    for table, where in CLUB_DELETE_STEPS[:-1]:
+        statement = text(
+            f"DELETE FROM {table} WHERE rowid IN "
+            f"(SELECT rowid FROM {table} WHERE {where} LIMIT :batch_size)"
+        )
+        params = {"club_id": club_id, "batch_size": batch_size}
+        while True:
+            count = submit_write(lambda session: session.execute(statement, params).rowcount)
+            if not count:
+                break
+            deleted[table] += count
+            progress["batches"] += 1
+            yield progress
+            if pause:
+                time.sleep(pause)
+
+    for table, count in submit_write(lambda session: delete_club_rows(session, club_id)).items():
+        deleted[table] += count
+    progress["batches"] += 1
+    progress["done"] = True
+    yield progress
+
+
+def check_purge_params(params):
+    """Reject a club_purge job for a missing club or a bad batch size before it is queued."""
+    club_id = params.get("club_id")
+    batch_size = params.get("batch_size", DEFAULT_PURGE_BATCH_SIZE)
+    if not isinstance(club_id, int) or isinstance(club_id, bool):
+        raise JobError("club_id must be an integer")
+    if not isinstance(batch_size, int) or isinstance(batch_size, bool) or batch_size < 1:
+        raise JobError("batch_size must be a positive integer")
+    if not db.session.get(Club, club_id, bind_arguments=readonly_bind_arguments()):
+        raise JobNotFound("Club not found")
+
+
+@job_handler("club_purge", check_params=check_purge_params)
+def run_club_purge(job):
+    """Background variant of DELETE /api/clubs/<id>?mode=purge."""
+    progress = None
+    for progress in purge_club(job.params["club_id"], job.params.get("batch_size", DEFAULT_PURGE_BATCH_SIZE)):
+        job.report(progress)
+    return progress
@@ -0,0 +1,100 @@
+import json
+import logging
+from collections import Counter
+from flask import current_app, request
+from app.query_metrics import current_recorder
+
+logger = logging.getLogger(__name__)
+
+# Most distinct statements listed in a budget warning
+_MAX_REPORTED_STATEMENTS = 50
+
+# Not counted against budgets: how many of these run depends on how the
+# write queue batches transactions, not on the route
+_TRANSACTION_CONTROL = ("BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK", "COMMIT")
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in test mode when a request runs more statements than its route allows."""
+
+
+def query_budget(max_queries, max_repeats=None):
+    """
+    Declare the most SQL statements one request to the decorated view may
+    run, and optionally how often any one statement may repeat (overriding
+    QUERY_REPEAT_THRESHOLD). Transaction control statements don't count.
+    Put it right below the route decorator:
+
+        @clubs_bp.route("/<int:club_id>/members", methods=["POST"])
+        @query_budget(4)
+        def add_member_to_club(club_id): ...
+    """
+    def declare(view):
+        view.query_budget = max_queries
+        if max_repeats is not None:
+            view.query_max_repeats = max_repeats
+        return view
+    return declare
+
+
+def budgeted_statements(statements):
+    """The statements that count against a budget (all but transaction control)."""
+    return [sql for sql in statements if not sql.lstrip().upper().startswith(_TRANSACTION_CONTROL)]
+
+
+def repeated_statements(statements, threshold):
+    """Statements run more than `threshold` times, as {sql: count} (likely N+1 loops)."""
+    return {sql: count for sql, count in Counter(statements).items() if count > threshold}
+
+
+def _violations(view, statements, default_repeats):
+    violations = []
+    budget = getattr(view, "query_budget", None)
+    if budget is not None and len(statements) > budget:
+        violations.append(f"ran {len(statements)} statements, over its budget of {budget}")
+    threshold = getattr(view, "query_max_repeats", default_repeats)
+    if threshold is not None:
+        for sql, count in repeated_statements(statements, threshold).items():
+            violations.append(f"ran the same statement {count} times (N+1?): {sql}")
+    return violations
+
+
+def check_query_budget(response):
+    """
+    after_request hook: compare the request's statements with its route's
+    budget and look for repeated identical statements. Violations raise
+    QueryBudgetExceeded under TESTING and are logged as a structured warning
+    otherwise.
+    """
+    recorder = current_recorder()
+    view = current_app.view_functions.get(request.endpoint)
+    if recorder is None or view is None:
+        return response
+
+    statements = budgeted_statements(recorder.statements)
+    violations = _violations(view, statements, current_app.config.get("QUERY_REPEAT_THRESHOLD"))
+    if not violations:
+        return response
+    if current_app.testing:
+        raise QueryBudgetExceeded(f"{request.method} {request.path} ({recorder.endpoint}) " + "; ".join(violations))
+
+    counts = Counter(statements)
+    logger.warning(json.dumps({
+        "event": "query_budget_exceeded",
+        "endpoint": recorder.endpoint,
+        "method": request.method,
+        "path": request.path,
+        "queries": len(statements),
+        "budget": getattr(view, "query_budget", None),
+        "violations": violations,
+        # Distinct statements in the order they first ran, with how often
+        "statements": [
+            {"sql": sql, "count": count} for sql, count in list(counts.items())[:_MAX_REPORTED_STATEMENTS]
+        ],
+    }))
+    return response
+
+
+def init_query_budget(app):
+    """Enforce @query_budget declarations (needs init_query_metrics' recorder)."""
+    app.after_request(check_query_budget)
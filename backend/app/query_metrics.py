@@ -0,0 +1,409 @@
+import atexit
+import glob
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from flask import request
+from sqlalchemy import event
+
+try:
+    import fcntl
+except ImportError:  # Windows: files of exited workers are never archived
+    fcntl = None
+
+METRIC_PREFIX = "club_management_"
+
+# Per-request histograms: name -> (help text, bucket upper bounds; +Inf is implied)
+HISTOGRAMS = {
+    "db_queries_per_request": (
+        "SQL statements executed per request.",
+        (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+    ),
+    "db_rows_per_request": (
+        "Rows returned by SQL statements per request.",
+        (0, 1, 10, 100, 1000, 10000, 100000, 1000000),
+    ),
+    "db_seconds_per_request": (
+        "Time spent executing SQL statements per request, in seconds.",
+        (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+    ),
+}
+
+# Recorder of the request running on this thread (the write queue's thread
+# borrows the submitting request's recorder while it runs its mutation)
+_current = threading.local()
+
+
+class QueryRecorder:
+    """Statements, rows and DB time of one request."""
+
+    __slots__ = ("endpoint", "queries", "rows", "seconds", "statements")
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.queries = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self.statements = []  # SQL of each statement, in order (see app/query_budget.py)
+
+    def observations(self):
+        return {
+            "db_queries_per_request": self.queries,
+            "db_rows_per_request": self.rows,
+            "db_seconds_per_request": self.seconds,
+        }
+
+
+def current_recorder():
+    """The recorder statements on this thread are attributed to, if any."""
+    return getattr(_current, "recorder", None)
+
+
+@contextmanager
+def recording(recorder):
+    """Attribute statements run on this thread to `recorder` for the block."""
+    previous = current_recorder()
+    _current.recorder = recorder
+    try:
+        yield
+    finally:
+        _current.recorder = previous
+
+
+def _count_row(cursor, row):
+    recorder = getattr(_current, "recorder", None)
+    if recorder is not None:
+        recorder.rows += 1
+    return row
+
+
+def _count_rows(rows):
+    recorder = getattr(_current, "recorder", None)
+    if recorder is not None:
+        recorder.rows += len(rows)
+    return rows
+
+
+class CountingCursor(sqlite3.Cursor):
+    """
+    Counts the rows fetched for the current recorder. fetchall() and
+    fetchmany() (SQLAlchemy's .all(), yield_per) count a whole batch at
+    once; fetchone() (iterating a result) counts through a row factory.
+    """
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self.row_factory = _count_row
+
+    def fetchmany(self, size=None):
+        self.row_factory = None
+        try:
+            return _count_rows(super().fetchmany(self.arraysize if size is None else size))
+        finally:
+            self.row_factory = _count_row
+
+    def fetchall(self):
+        self.row_factory = None
+        try:
+            return _count_rows(super().fetchall())
+        finally:
+            self.row_factory = _count_row
+
+
+class CountingConnection(sqlite3.Connection):
+    def cursor(self, factory=CountingCursor):
+        return super().cursor(factory)
+
+
+def install_query_instrumentation(engine):
+    """Count the statements, rows and execute time of `engine`'s connections."""
+
+    @event.listens_for(engine, "do_connect")
+    def count_rows(dialect, conn_rec, cargs, cparams):
+        cparams["factory"] = CountingConnection
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def record_query(conn, cursor, statement, parameters, context, executemany):
+        recorder = getattr(_current, "recorder", None)
+        if recorder is not None:
+            recorder.queries += 1
+            recorder.seconds += time.perf_counter() - conn.info["query_started"]
+            recorder.statements.append(statement)
+
+
+class QueryMetrics:
+    """
+    Fixed-bucket histograms of each endpoint's statements, rows and DB time
+    per request.
+
+    Each process keeps its own counts. With `directory` set, a background
+    thread writes them every `flush_interval` seconds to a JSON file there,
+    named after the process id and a random token (so a reused pid never
+    overwrites an exited worker's counts), and collect() adds up every
+    process's file, so any gunicorn worker can serve the totals of all of
+    them.
+
+    Live processes touch their file on every tick. collect() folds files
+    untouched for `stale_after` seconds (exited workers) into one archive
+    file, under an exclusive lock that flushes share, so the directory does
+    not grow with every restart and the totals never go backwards.
+    """
+
+    def __init__(self, directory=None, flush_interval=1.0, stale_after=300.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.stale_after = stale_after
+        self._series = {}  # endpoint -> name -> [count per bucket..., sum]
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flusher = None
+        self._flusher_pid = None
+        self._file_pid = None
+        self._file_token = None
+        self._written = None  # counts last written to this process's file
+        self._baseline = {}  # counts already folded into the archive
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            atexit.register(self.flush)
+
+    def observe(self, recorder):
+        with self._lock:
+            series = self._series.setdefault(recorder.endpoint, {})
+            for name, value in recorder.observations().items():
+                bounds = HISTOGRAMS[name][1]
+                counts = series.setdefault(name, [0] * (len(bounds) + 2))
+                counts[bisect_left(bounds, value)] += 1
+                counts[-1] += value
+            self._dirty = True
+        if self.directory:
+            self._ensure_flusher()
+
+    def _ensure_flusher(self):
+        # Started lazily, so each forked worker gets its own thread
+        if self._flusher_pid == os.getpid() and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher_pid != os.getpid() or not self._flusher.is_alive():
+                self._flusher = threading.Thread(target=self._flush_periodically, name="query-metrics", daemon=True)
+                self._flusher_pid = os.getpid()
+                self._flusher.start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Failed to write query metrics, will retry: {e}")
+
+    def _path(self):
+        # A new token after a fork, so each process has its own file
+        if self._file_pid != os.getpid():
+            self._file_pid = os.getpid()
+            self._file_token = secrets.token_hex(4)
+            self._written = None
+            self._baseline = {}
+        return os.path.join(self.directory, f"queries-{self._file_pid}-{self._file_token}.json")
+
+    def _archive_path(self):
+        return os.path.join(self.directory, "archive.json")
+
+    @contextmanager
+    def _file_lock(self, exclusive=False):
+        # Shared by flushes, exclusive while stale files are archived
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.directory, "metrics.lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                endpoint: {name: list(counts) for name, counts in series.items()}
+                for endpoint, series in self._series.items()
+            }
+
+    def flush(self):
+        """
+        Write this process's counts to its file in the metrics directory, or
+        just touch the file when they haven't changed.
+        """
+        if not self.directory:
+            return
+        path = self._path()
+        with self._file_lock():
+            if self._written is not None and not os.path.exists(path):
+                # Archived as stale (e.g. the process was suspended): only
+                # write counts newer than what the archive holds
+                self._baseline, self._written = self._written, None
+                self._dirty = True
+            if not self._dirty:
+                if self._written is not None:
+                    os.utime(path)
+                return
+            self._dirty = False
+            counts = _subtract(self.snapshot(), self._baseline)
+            with open(f"{path}.tmp", "w") as f:
+                json.dump(counts, f)
+            os.replace(f"{path}.tmp", path)
+            self._written = _add(self._baseline, counts)
+
+    def collect(self):
+        """Counts summed over every process (just this one without a directory)."""
+        totals = self.snapshot()
+        if not self.directory:
+            return totals
+        own = self._path()
+        self._archive_stale(own)
+        totals = _subtract(totals, self._baseline)
+        for path in [self._archive_path()] + glob.glob(os.path.join(self.directory, "queries-*.json")):
+            if path == own:
+                continue
+            try:
+                with open(path) as f:
+                    other = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if path == self._archive_path():
+                other = other.get("counts", {})
+            totals = _add(totals, other)
+        return totals
+
+    def _archive_stale(self, own):
+        """Fold the files of processes that stopped touching them into the archive."""
+        if fcntl is None:
+            return
+        cutoff = time.time() - self.stale_after
+        paths = glob.glob(os.path.join(self.directory, "queries-*.json"))
+        if not any(path != own and _mtime(path) < cutoff for path in paths):
+            return
+
+        with self._file_lock(exclusive=True):
+            try:
+                with open(self._archive_path()) as f:
+                    archive = json.load(f)
+            except (OSError, ValueError):
+                archive = {"counts": {}, "merged": []}
+            # Files already added by a compaction that died before deleting them
+            merged = {(name, mtime) for name, mtime in archive.get("merged", [])}
+            stale, counts = [], archive.get("counts", {})
+            for path in glob.glob(os.path.join(self.directory, "queries-*.json")):
+                mtime = _mtime(path)
+                if path == own or mtime >= cutoff:
+                    continue
+                key = (os.path.basename(path), mtime)
+                if key not in merged:
+                    try:
+                        with open(path) as f:
+                            counts = _add(counts, json.load(f))
+                    except (OSError, ValueError):
+                        pass
+                stale.append(key)
+
+            with open(f"{self._archive_path()}.tmp", "w") as f:
+                json.dump({"counts": counts, "merged": stale}, f)
+            os.replace(f"{self._archive_path()}.tmp", self._archive_path())
+            for name, _ in stale:
+                os.remove(os.path.join(self.directory, name))
+
+    def render(self):
+        """Every histogram in the Prometheus text exposition format."""
+        totals = self.collect()
+        lines = []
+        for name, (help_text, bounds) in HISTOGRAMS.items():
+            metric = METRIC_PREFIX + name
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for endpoint in sorted(totals):
+                counts = totals[endpoint].get(name)
+                if counts is None:
+                    continue
+                label = f'endpoint="{_escape(endpoint)}"'
+                cumulative = 0
+                for bound, count in zip(bounds + ("+Inf",), counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f"{metric}_sum{{{label}}} {counts[-1]}")
+                lines.append(f"{metric}_count{{{label}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _add(totals, other):
+    """Histogram counts of `totals` plus `other`, skipping malformed series."""
+    totals = {endpoint: dict(series) for endpoint, series in totals.items()}
+    for endpoint, series in other.items():
+        merged = totals.setdefault(endpoint, {})
+        for name, counts in series.items():
+            if name not in HISTOGRAMS or len(counts) != len(HISTOGRAMS[name][1]) + 2:
+                continue
+            if name in merged:
+                merged[name] = [a + b for a, b in zip(merged[name], counts)]
+            else:
+                merged[name] = list(counts)
+    return totals
+
+
+def _subtract(totals, baseline):
+    """Histogram counts of `totals` minus `baseline` (an earlier copy of them)."""
+    if not baseline:
+        return totals
+    negated = {
+        endpoint: {name: [-value for value in counts] for name, counts in series.items()}
+        for endpoint, series in baseline.items()
+    }
+    return _add(totals, negated)
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return float("inf")
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def init_query_metrics(app, engines):
+    """
+    Record the statements each request runs on `engines` under its endpoint
+    (blueprint.view), for /api/_metrics and query budgets.
+    """
+    metrics = None
+    if app.config.get("QUERY_METRICS_ENABLED", True):
+        metrics = QueryMetrics(
+            app.config.get("QUERY_METRICS_DIR"),
+            flush_interval=app.config.get("QUERY_METRICS_FLUSH_INTERVAL_MS", 1000) / 1000,
+            stale_after=app.config.get("QUERY_METRICS_STALE_SECONDS", 300),
+        )
+    app.extensions["query_metrics"] = metrics
+
+    # Statements are recorded even without metrics, for query budgets
+    for engine in engines:
+        install_query_instrumentation(engine)
+
+    @app.before_request
+    def start_recording():
+        _current.recorder = QueryRecorder(request.endpoint or "unmatched")
+
+    @app.teardown_request
+    def finish_recording(exc):
+        recorder = current_recorder()
+        _current.recorder = None
+        if recorder is not None and metrics is not None:
+            metrics.observe(recorder)
@@ -0,0 +1,237 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# A cached 200 response, valid while the request's ETag still equals `etag`
+CachedResponse = namedtuple("CachedResponse", ["etag", "mimetype", "body"])
+
+
+class CacheStats:
+    """Thread-safe hit/miss/eviction counters for one cache backend."""
+
+    FIELDS = ("hits", "misses", "stale", "stores", "evictions", "errors")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self._counts[name] += amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+
+class LRUCache:
+    """
+    In-process cache bounded by total body size and entry count, evicting the
+    least recently used entries first. One per worker process.
+    """
+
+    def __init__(self, max_bytes, max_entries):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, etag):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.etag != etag:
+                # The data behind this URL changed since it was cached
+                self._remove(key)
+                self.stats.incr("stale")
+                entry = None
+            if entry is None:
+                self.stats.incr("misses")
+                return None
+            self._entries.move_to_end(key)
+            self.stats.incr("hits")
+            return entry
+
+    def put(self, key, entry):
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += len(entry.body)
+            self.stats.incr("stores")
+
+            evicted = 0
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+            if evicted:
+                self.stats.incr("evictions", evicted)
+
+    def _remove(self, key):
+        self._bytes -= len(self._entries.pop(key).body)
+
+    def report(self):
+        with self._lock:
+            size = {"entries": len(self._entries), "bytes": self._bytes}
+        return {**self.stats.snapshot(), **size, "max_bytes": self.max_bytes}
+
+
+class SQLiteCache:
+    """
+    Cache stored in a local SQLite file, shared by every worker process on
+    the host. Bounded by total body size; the least recently used entries are
+    evicted first. Errors (e.g. a busy file) are counted and treated as a miss
+    so the cache can never fail a request.
+    """
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    etag TEXT NOT NULL,
+                    mimetype TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used);
+                """
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            # Losing cache entries on a crash is harmless
+            conn.execute("PRAGMA synchronous = OFF")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, etag):
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT etag, mimetype, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[0] != etag:
+                conn.execute("DELETE FROM responses WHERE key = ? AND etag = ?", (key, row[0]))
+                self.stats.incr("stale")
+                row = None
+            if row is None:
+                self.stats.incr("misses")
+                return None
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error:
+            self.stats.incr("errors")
+            return None
+
+        self.stats.incr("hits")
+        return CachedResponse(row[0], row[1], bytes(row[2]))
+
+    def put(self, key, entry):
+        if len(entry.body) > self.max_bytes:
+            return
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, mimetype, body, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, entry.etag, entry.mimetype, entry.body, len(entry.body), time.time()),
+            )
+            # Drop everything past the newest max_bytes worth of entries
+            evicted = conn.execute(
+                """
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS running
+                        FROM responses
+                    ) WHERE running > ?
+                )
+                """,
+                (self.max_bytes,),
+            ).rowcount
+        except sqlite3.Error:
+            self.stats.incr("errors")
+            return
+
+        self.stats.incr("stores")
+        if evicted:
+            self.stats.incr("evictions", evicted)
+
+    def report(self):
+        size = {"entries": None, "bytes": None}
+        try:
+            entries, total = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            size = {"entries": entries, "bytes": total}
+        except sqlite3.Error:
+            self.stats.incr("errors")
+        return {**self.stats.snapshot(), **size, "max_bytes": self.max_bytes}
+
+
+class ResponseCache:
+    """
+    Two-tier response cache: the worker's LRU first, then the optional shared
+    backend (whose hits are copied into the LRU).
+
+    Entries are keyed by URL and carry the ETag computed from the club's data
+    versions, so an entry is served only while none of the tables the
+    response was built from has been written since it was stored.
+    """
+
+    def __init__(self, local, shared=None):
+        self.local = local
+        self.shared = shared
+
+    def get(self, key, etag):
+        entry = self.local.get(key, etag)
+        if entry is None and self.shared is not None:
+            entry = self.shared.get(key, etag)
+            if entry is not None:
+                self.local.put(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        self.local.put(key, entry)
+        if self.shared is not None:
+            self.shared.put(key, entry)
+
+    def report(self):
+        return {
+            "local": self.local.report(),
+            "shared": self.shared.report() if self.shared is not None else None,
+        }
+
+
+def init_response_cache(app):
+    """Create the app's response cache from its RESPONSE_CACHE_* settings."""
+    if not app.config.get("RESPONSE_CACHE_ENABLED", True):
+        app.extensions["response_cache"] = None
+        return
+
+    local = LRUCache(
+        max_bytes=app.config.get("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024),
+        max_entries=app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 1024),
+    )
+    shared = None
+    shared_path = app.config.get("RESPONSE_CACHE_SHARED_PATH")
+    if shared_path:
+        os.makedirs(os.path.dirname(os.path.abspath(shared_path)), exist_ok=True)
+        shared = SQLiteCache(
+            shared_path,
+            max_bytes=app.config.get("RESPONSE_CACHE_SHARED_MAX_BYTES", 256 * 1024 * 1024),
+        )
+    app.extensions["response_cache"] = ResponseCache(local, shared)
@@ -4,6 +4,10 @@ from app.routes.sponsors import sponsors_bp
 from app.routes.expenses import expenses_bp
 from app.routes.students import students_bp
 from app.routes.roles import roles_bp
+from app.routes.internal import internal_bp
+from app.routes.jobs import jobs_bp
+from app.routes.search import search_bp
+from app.routes.metrics import metrics_bp
 
 def register_blueprints(app):
     # Register blueprints
@@ -13,4 +17,8 @@ def register_blueprints(app):
     app.register_blueprint(sponsors_bp, url_prefix="/api/sponsors")
     app.register_blueprint(expenses_bp, url_prefix="/api/expenses")
     app.register_blueprint(roles_bp, url_prefix="/api/roles")
+    app.register_blueprint(jobs_bp, url_prefix="/api/jobs")
+    app.register_blueprint(search_bp, url_prefix="/api/search")
+    app.register_blueprint(internal_bp, url_prefix="/api/_internal")
+    app.register_blueprint(metrics_bp, url_prefix="/api/_metrics")
  
\ No newline at end of file
@@ -1,19 +1,30 @@
 from flask import Blueprint, jsonify, request
 from flask_cors import CORS
-from sqlalchemy import and_
+from sqlalchemy import and_, literal_column
 from datetime import datetime
+from app.write_queue import submit_write
+from app.pagination import PaginationError, get_page_size, paginate, wants_all
+from app.streaming import stream_json_collection, wants_stream
+from app.fieldsets import FieldsetError, apply_fieldset, parse_fields
+from app.serializers import serialize_officer, serializer_for
+from app.bulk import BulkError, read_bulk_rows
+from app.etags import conditional_get
+from app.query_budget import query_budget
+from app.dashboard import DashboardError, build_dashboard, parse_sections
+from app.purge import CLUB_DELETE_STEPS, DEFAULT_PURGE_BATCH_SIZE, delete_club_rows
+from app.members import import_members
+from app.jobs import JobError, JobNotFound, enqueue_job, job_accepted, wants_background
+from app.search import match_expression, search_hits
+from app.stats import MEMBER_DIMENSIONS, StatsError, member_counts, parse_group_by
 from app.models import (
     db,
     Club,
     ClubRole,
-    EventHosting,
     Student,
-    SponsorshipContribution,
-    Expense,
     Membership,
     Budget,
-    Event,
-    EventAttendance,
+    BudgetCategorySpend,
+    FinanceRollup,
     Role,
     ClubRole
 )
@@ -23,21 +34,26 @@ clubs_bp = Blueprint("clubs", __name__)
 
 # Route to get all clubs
 @clubs_bp.route("/", methods=["GET"])
+@conditional_get(global_tables=("Clubs",))
 def get_clubs():
-    clubs = Club.query.all()
-    return jsonify(
-        [
-            {
-                "club_id": club.club_id,
-                "club_name": club.club_name,
-                "club_description": club.club_description,
-                "founded_date": club.founded_date,
-                "contact_email": club.contact_email,
-                "faculty_advisor": club.faculty_advisor,
-            }
-            for club in clubs
-        ]
-    )
+    # ?stream=true streams every club instead of returning one page
+    if wants_stream():
+        return stream_json_collection(
+            "clubs", Club.query.order_by(Club.club_id), serializer_for(Club)
+        )
+
+    try:
+        clubs, next_cursor = paginate(Club.query, [Club.club_id])
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    serialize = serializer_for(Club)
+    club_list = [serialize(club) for club in clubs]
+
+    # ?all=true keeps the original bare-list response
+    if wants_all():
+        return jsonify(club_list)
+    return jsonify({"clubs": club_list, "next_cursor": next_cursor})
 
 
 # Route to add a new club
@@ -85,92 +101,168 @@ def update_club(club_id):
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
-# Delete a club by ID
+# Delete a club by ID (an existence check plus one set-based delete per table)
 @clubs_bp.route("/<int:club_id>", methods=["DELETE"])
+@query_budget(len(CLUB_DELETE_STEPS) + 1)
 def delete_club(club_id):
-    club = db.session.get(Club, club_id)
-    if not club:
-        return jsonify({"error": "Club not found"}), 404
+    # ?mode=purge queues a job that deletes the club in batches (see
+    # app/purge.py) instead of holding the write lock for the whole delete
+    if request.args.get("mode") == "purge":
+        try:
+            batch_size = int(request.args.get("batch_size", DEFAULT_PURGE_BATCH_SIZE))
+        except ValueError:
+            return jsonify({"error": "batch_size must be an integer"}), 400
+        try:
+            # The job's params check answers for a missing club (404) or a bad batch size
+            return job_accepted(enqueue_job("club_purge", {"club_id": club_id, "batch_size": batch_size}))
+        except JobNotFound as e:
+            return jsonify({"error": str(e)}), 404
+        except JobError as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    def remove_club(session):
+        if not session.get(Club, club_id):
+            return {"error": "Club not found"}, 404
+        # One set-based delete per table, children before parents
+        deleted = delete_club_rows(session, club_id)
+        return {"message": f"Club with ID {club_id} deleted successfully", "deleted": deleted}, 200
 
     try:
-        # Remove dependencies manually
-        db.session.query(ClubRole).filter_by(club_id=club_id).delete()
-        db.session.query(EventHosting).filter_by(club_id=club_id).delete()
-        db.session.query(SponsorshipContribution).filter_by(club_id=club_id).delete()
-        db.session.query(Membership).filter_by(club_id=club_id).delete()
-        db.session.query(Budget).filter_by(club_id=club_id).delete()
-
-        # Handle events and their dependencies
-        event_ids = [
-            event.event_id
-            for event in db.session.query(Event).filter_by(club_id=club_id).all()
-        ]
-        db.session.query(EventAttendance).filter(
-            EventAttendance.event_id.in_(event_ids)
-        ).delete()
-        db.session.query(Event).filter_by(club_id=club_id).delete()
-
-        # Delete the club itself
-        db.session.delete(club)
-        db.session.commit()
-        return jsonify({"message": f"Club with ID {club_id} deleted successfully"}), 200
+        body, status = submit_write(remove_club)
+        return jsonify(body), status
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 400
     
+# Route to load everything the club page shows in one request
+@clubs_bp.route("/<int:club_id>/dashboard", methods=["GET"])
+@query_budget(10)
+@conditional_get(
+    tables=("Membership", "ClubRoles", "Budget", "Expenses", "Events", "SponsorshipContribution"),
+    global_tables=("Clubs", "Students", "Roles", "Sponsors"),
+    daily=True,
+    cache=True,
+)
+def get_club_dashboard(club_id):
+    club = db.session.get(Club, club_id)
+    if not club:
+        return jsonify({"error": "Club not found"}), 404
+
+    try:
+        # ?sections=members,budget limits the response to those sections
+        sections = parse_sections(request.args.get("sections"))
+        # Long lists return their first page (?limit=, or every row with ?all=true)
+        limit = None if wants_all() else get_page_size()
+    except (DashboardError, PaginationError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    dashboard = build_dashboard(
+        club_id,
+        sections,
+        fiscal_year=request.args.get("fiscal_year", type=int),
+        limit=limit,
+    )
+    return jsonify({"club": serializer_for(Club)(club), **dashboard}), 200
+
+
 # Route to find all members part of specific club
 @clubs_bp.route("/<int:club_id>/members", methods=["GET"])
+@conditional_get(tables=("Membership",), global_tables=("Students",), cache=True)
 def get_club_members(club_id):
-    # Query to find members associated with the club_id
-    members = (
-        db.session.query(Student)
-        .join(Membership)
-        .filter(Membership.club_id == club_id)
-        .all()
-    )
+    # Query to find members associated with the club_id, in
+    # Membership(club_id, student_id) index order
+    query = db.session.query(Student).join(Membership).filter(Membership.club_id == club_id)
+    key_of, serialize = (lambda member: [member.student_id]), serializer_for(Student)
+
+    try:
+        # ?fields= selects only the requested columns (e.g. ?fields=major for charts)
+        fields = parse_fields(Student)
+        if fields:
+            query, key_of, serialize = apply_fieldset(
+                query, Student, fields, [Membership.student_id]
+            )
+
+        # ?stream=true streams every member instead of returning one page
+        if wants_stream():
+            return stream_json_collection(
+                "members", query.order_by(Membership.student_id), serialize
+            )
+
+        members, next_cursor = paginate(query, [Membership.student_id], key_of=key_of)
+    except (PaginationError, FieldsetError) as e:
+        return jsonify({"error": str(e)}), 400
 
     # If no members are found, return an empty list
     if not members:
         return (
             jsonify(
-                {"message": "No members found for the specified club", "members": []}
+                {
+                    "message": "No members found for the specified club",
+                    "members": [],
+                    "next_cursor": None,
+                }
             ),
             200,
         )
 
     # Format the response
-    member_list = [
-        {
-            "student_id": member.student_id,
-            "first_name": member.first_name,
-            "last_name": member.last_name,
-            "email": member.email,
-            "phone_number": member.phone_number,
-            "major": member.major,
-            "graduation_year": member.graduation_year,
-        }
-        for member in members
-    ]
+    member_list = [serialize(member) for member in members]
 
     return (
-        jsonify({"message": "Members retrieved successfully", "members": member_list}),
+        jsonify(
+            {
+                "message": "Members retrieved successfully",
+                "members": member_list,
+                "next_cursor": next_cursor,
+            }
+        ),
         200,
     )
 
 
+# Route to count a club's members by major, graduation year and/or status
+@clubs_bp.route("/<int:club_id>/members/stats", methods=["GET"])
+@conditional_get(tables=("Membership",), global_tables=("Students",), cache=True)
+def get_club_member_stats(club_id):
+    try:
+        group_by = parse_group_by(MEMBER_DIMENSIONS)
+    except StatsError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"group_by": group_by, "stats": member_counts(group_by, [club_id])}), 200
+
+
+# Route to count members across clubs (all clubs, or ?club_ids=1,2)
+@clubs_bp.route("/members/stats", methods=["GET"])
+def get_member_stats():
+    try:
+        group_by = parse_group_by(MEMBER_DIMENSIONS)
+        raw_ids = request.args.get("club_ids", "").strip()
+        club_ids = [int(club_id) for club_id in raw_ids.split(",")] if raw_ids else None
+    except StatsError as e:
+        return jsonify({"error": str(e)}), 400
+    except ValueError:
+        return jsonify({"error": "club_ids must be a comma-separated list of integers"}), 400
+
+    return jsonify({"group_by": group_by, "stats": member_counts(group_by, club_ids)}), 200
+
+
 # Route to add a new member to a club
 @clubs_bp.route("/<int:club_id>/members", methods=["POST"])
+@query_budget(4)
 def add_member_to_club(club_id):
     data = request.json
 
-    # Check if the club exists
-    club = db.session.get(Club, club_id)
-    if not club:
-        return jsonify({"error": "Club not found"}), 404
+    def insert_member(session):
+        # Check if the club exists
+        club = session.get(Club, club_id)
+        if not club:
+            return {"error": "Club not found"}, 404
 
-    try:
         # Check if the member already exists
-        member = Student.query.filter_by(student_id=data["student_id"]).first()
+        member = session.query(Student).filter_by(student_id=data["student_id"]).first()
         if not member:
             # Create a new member if they don't exist
             member = Student(
@@ -182,47 +274,61 @@ def add_member_to_club(club_id):
                 major=data.get("major"),
                 graduation_year=data.get("graduation_year"),
             )
-            db.session.add(member)
-            db.session.commit()
-
-        # Check if the membership already exists
-        membership = Membership.query.filter_by(
-            club_id=club_id, student_id=member.student_id
-        ).first()
-        if membership:
-            return jsonify({"message": "Member already exists in this club"}), 200
-        if not membership:
-            # Link the member to the club if not already linked
-            new_membership = Membership(
-                club_id=club_id,
-                student_id=member.student_id,
-                active_status=data.get("active_status", "Active"),
-            )
-            db.session.add(new_membership)
-            db.session.commit()
+            session.add(member)
+            session.flush()  # Students row must exist before the Membership row references it
+        else:
+            # Check if the membership already exists
+            membership = session.query(Membership).filter_by(
+                club_id=club_id, student_id=member.student_id
+            ).first()
+            if membership:
+                return {"message": "Member already exists in this club"}, 200
+
+        # Link the member to the club
+        new_membership = Membership(
+            club_id=club_id,
+            student_id=member.student_id,
+            active_status=data.get("active_status", "Active"),
+        )
+        session.add(new_membership)
 
         # Return the member details
-        return (
-            jsonify(
-                {
-                    "student_id": member.student_id,
-                    "first_name": member.first_name,
-                    "last_name": member.last_name,
-                    "email": member.email,
-                    "phone_number": member.phone_number,
-                    "major": member.major,
-                    "graduation_year": member.graduation_year,
-                }
-            ),
-            201,
-        )
+        return serializer_for(Student)(member), 201
+
+    try:
+        body, status = submit_write(insert_member)
+        return jsonify(body), status
 
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 400
     
+# Route to add many members to a club at once (JSON array or CSV upload)
+@clubs_bp.route("/<int:club_id>/members/bulk", methods=["POST"])
+def bulk_add_members(club_id):
+    """
+    Import members in one transaction (see app/members.py) and return a
+    result per row. With ?async=true the import is queued as a job instead
+    and the response is 202 with the job's status URL.
+    """
+    try:
+        rows = read_bulk_rows("members")
+    except BulkError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        if wants_background():
+            return job_accepted(enqueue_job("member_import", {"club_id": club_id, "rows": rows}))
+        body, status = import_members(club_id, rows)
+        return jsonify(body), status
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
 # Remove a student from a membership of a club
 @clubs_bp.route("/<int:club_id>/members/<string:student_id>", methods=["DELETE"])
+@query_budget(3)
 def remove_member_from_club(club_id, student_id):
     try:
         # Check if the club exists
@@ -248,52 +354,39 @@ def remove_member_from_club(club_id, student_id):
 
 # Route to find members in a club based on search params
 @clubs_bp.route("/<int:club_id>/members/search", methods=["GET"])
+@conditional_get(tables=("Membership",), global_tables=("Students",))
 def search_members(club_id):
-    # Get search parameters from the request
-    first_name = request.args.get("first_name", "").strip()
-    last_name = request.args.get("last_name", "").strip()
-    student_id = request.args.get("student_id", "").strip()
-    email = request.args.get("email", "").strip()
-    major = request.args.get("major", "").strip()
+    # Get search parameters from the request. Text fields match word
+    # prefixes through the StudentsSearch full-text index; q searches all of them.
+    match = match_expression({
+        None: request.args.get("q", ""),
+        "first_name": request.args.get("first_name", ""),
+        "last_name": request.args.get("last_name", ""),
+        "student_id": request.args.get("student_id", ""),
+        "email": request.args.get("email", ""),
+        "major": request.args.get("major", ""),
+    })
     graduation_year = request.args.get("graduation_year", "").strip()
 
     try:
         # Build query filters
         filters = [Membership.club_id == club_id]
-
-        if first_name:
-            filters.append(Student.first_name.ilike(f"%{first_name}%"))
-        if last_name:
-            filters.append(Student.last_name.ilike(f"%{last_name}%"))
-        if student_id:
-            filters.append(Student.student_id.ilike(f"%{student_id}%"))
-        if email:
-            filters.append(Student.email.ilike(f"%{email}%"))
-        if major:
-            filters.append(Student.major.ilike(f"%{major}%"))
         if graduation_year:
             filters.append(Student.graduation_year == graduation_year)
 
-        # Query members
-        members = db.session.query(Student).join(Membership).filter(and_(*filters)).all()
+        # Query members, best matches first
+        query = db.session.query(Student).join(Membership).filter(and_(*filters))
+        if match:
+            hits = search_hits("StudentsSearch", match)
+            query = query.join(hits, hits.c.rowid == literal_column("Students.rowid")).order_by(hits.c.rank)
+        members = query.all()
 
         if not members:
             return jsonify({"members": []}), 200
 
         # Format members for JSON response
-        member_list = [
-            {
-                "student_id": member.student_id,
-                "first_name": member.first_name,
-                "last_name": member.last_name,
-                "student_id": member.student_id,
-                "email": member.email,
-                "phone_number": member.phone_number,
-                "major": member.major,
-                "graduation_year": member.graduation_year,
-            }
-            for member in members
-        ]
+        serialize = serializer_for(Student)
+        member_list = [serialize(member) for member in members]
 
         return jsonify({"members": member_list}), 200
 
@@ -303,6 +396,7 @@ def search_members(club_id):
 
 # Get the budget of a club based on the provided fiscal year
 @clubs_bp.route("/<int:club_id>/budget", methods=["GET"])
+@conditional_get(tables=("Budget", "Expenses"), cache=True)
 def get_club_budget(club_id):
     fiscal_year = request.args.get("fiscal_year", type=int)
 
@@ -313,28 +407,20 @@ def get_club_budget(club_id):
     if not budget:
         return jsonify({"message": "No budget data found"}), 404
 
-    # Calculate spent amount from Expenses table
-    spent = (
-        db.session.query(db.func.sum(Expense.expense_amount))
-        .filter(
-            Expense.club_id == club_id,
-            Expense.expense_date.between(
-                f"{fiscal_year}-01-01", f"{fiscal_year}-12-31"
-            ),
-        )
-        .scalar()
-        or 0
-    )
-
-    remaining = budget.total_budget - spent
+    # Spend totals are kept current by triggers on Expenses
+    spent_by_category = {
+        row.category: row.spent_amount
+        for row in BudgetCategorySpend.query.filter_by(budget_id=budget.budget_id)
+    }
 
     # Format the response
     budget_details = {
         "budget_id": budget.budget_id,
         "fiscal_year": budget.fiscal_year,
         "total_budget": budget.total_budget,
-        "spent_amount": spent,
-        "remaining_amount": remaining,
+        "spent_amount": budget.spent_amount,
+        "remaining_amount": budget.remaining_amount,
+        "spent_by_category": spent_by_category,
     }
 
     return jsonify({"budget": budget_details}), 200
@@ -342,6 +428,7 @@ def get_club_budget(club_id):
 
 # Route to find all fiscal years stored for a club
 @clubs_bp.route("/<int:club_id>/budget/years", methods=["GET"])
+@conditional_get(tables=("Budget",))
 def get_budget_years(club_id):
     fiscal_years = (
         db.session.query(Budget.fiscal_year)
@@ -373,26 +460,18 @@ def update_budget(club_id):
         if not budget:
             return jsonify({"error": "Budget record not found for the given fiscal year"}), 404
 
-        # Calculate the spent amount dynamically from the Expenses table
-        spent_amount = db.session.query(
-            db.func.sum(Expense.expense_amount)
-        ).filter(
-            Expense.club_id == club_id,
-            Expense.budget_id == budget.budget_id
-        ).scalar() or 0
-
-        # Update the total_budget and remaining_amount
+        # Update the total_budget; spent_amount is maintained by triggers on Expenses
         budget.total_budget = total_budget
-        remaining_amount = total_budget - spent_amount
+        spent_amount = budget.spent_amount
 
         # Commit changes to the database
         db.session.commit()
 
         return jsonify({
-            "fiscal_year": budget.fiscal_year,
-            "total_budget": budget.total_budget,
+            "fiscal_year": fiscal_year,
+            "total_budget": total_budget,
             "spent_amount": spent_amount,
-            "remaining_amount": remaining_amount,
+            "remaining_amount": total_budget - spent_amount,
         }), 200
 
     except Exception as e:
@@ -433,7 +512,61 @@ def add_budget(club_id):
         return jsonify({"error": str(e)}), 500
     
 
+# Route to get monthly expense and contribution totals for every fiscal year
+@clubs_bp.route("/<int:club_id>/finances/timeseries", methods=["GET"])
+@conditional_get(tables=("Budget", "Expenses", "SponsorshipContribution"), cache=True)
+def get_finance_timeseries(club_id):
+    from_year = request.args.get("from_year", type=int)
+    to_year = request.args.get("to_year", type=int)
+
+    # One read of the rollup (kept current by triggers) in primary key order
+    query = FinanceRollup.query.filter(FinanceRollup.club_id == club_id)
+    budgets = Budget.query.filter(Budget.club_id == club_id)
+    if from_year is not None:
+        query = query.filter(FinanceRollup.fiscal_year >= from_year)
+        budgets = budgets.filter(Budget.fiscal_year >= from_year)
+    if to_year is not None:
+        query = query.filter(FinanceRollup.fiscal_year <= to_year)
+        budgets = budgets.filter(Budget.fiscal_year <= to_year)
+    rollup = query.order_by(
+        FinanceRollup.fiscal_year, FinanceRollup.month, FinanceRollup.category
+    ).all()
+    total_budgets = {budget.fiscal_year: budget.total_budget for budget in budgets}
+
+    # Every month of every year with a budget or any activity, zero-filled
+    years = {}
+    for fiscal_year in sorted(set(total_budgets).union(row.fiscal_year for row in rollup)):
+        years[fiscal_year] = {
+            "fiscal_year": fiscal_year,
+            "total_budget": total_budgets.get(fiscal_year),
+            "expense_total": 0,
+            "contribution_total": 0,
+            "months": [
+                {
+                    "month": month,
+                    "expense_total": 0,
+                    "contribution_total": 0,
+                    "expenses_by_category": {},
+                }
+                for month in range(1, 13)
+            ],
+        }
+
+    for row in rollup:
+        year = years[row.fiscal_year]
+        month = year["months"][row.month - 1]
+        year["expense_total"] += row.expense_total
+        year["contribution_total"] += row.contribution_total
+        month["expense_total"] += row.expense_total
+        month["contribution_total"] += row.contribution_total
+        if row.expense_total:
+            month["expenses_by_category"][row.category] = row.expense_total
+
+    return jsonify({"years": list(years.values())}), 200
+
+
 @clubs_bp.route("/<int:club_id>/officers", methods=["GET"])
+@conditional_get(tables=("ClubRoles",), global_tables=("Students", "Roles"), cache=True)
 def get_club_officers(club_id):
     try:
         # Query the ClubRoles and join with Students and Roles tables
@@ -459,19 +592,7 @@ def get_club_officers(club_id):
             return jsonify({"officers": []}), 200
 
         # Format the response
-        officer_list = [
-            {
-                "student_id": officer.student_id,
-                "first_name": officer.first_name,
-                "last_name": officer.last_name,
-                "email": officer.email,
-                "phone_number": officer.phone_number,
-                "role_id": officer.role_id,
-                "role_name": officer.role_name,
-                "role_description": officer.role_description,
-            }
-            for officer in officers
-        ]
+        officer_list = [serialize_officer(officer) for officer in officers]
 
         return jsonify({"officers": officer_list}), 200
 
@@ -481,6 +602,7 @@ def get_club_officers(club_id):
     
 
 @clubs_bp.route("/<int:club_id>/officers", methods=["POST"])
+@query_budget(3)
 def add_officer_to_club(club_id):
     """
     Add an officer to a specific club, ensuring they are a member first.
@@ -1,97 +1,111 @@
-from flask import Blueprint, jsonify, request
-from app.models import db, Event, Student, EventAttendance
+from flask import Blueprint, current_app, jsonify, request
+from app.models import db, Event, EventHosting, Student, EventAttendance
 from datetime import datetime
+from sqlalchemy import text
+from app.write_queue import submit_write
+from app.pagination import PaginationError, paginate
+from app.streaming import stream_json_collection, wants_stream
+from app.fieldsets import FieldsetError, apply_fieldset, parse_fields
+from app.serializers import serializer_for
+from app.etags import conditional_get, event_club_id
+from app.bulk import BulkError, json_array, read_bulk_rows, summarize
+from app.attendance import insert_attendance_records, validate_attendance_row
 
 # Define the blueprint
 events_bp = Blueprint("events", __name__)
 
+def select_event_fields(query):
+    """Apply ?fields= to an events query. Returns (query, serialize)."""
+    fields = parse_fields(Event)
+    if not fields:
+        return query, serializer_for(Event)
+    query, _, serialize = apply_fieldset(query, Event, fields)
+    return query, serialize
+
+
+def format_attendance(att):
+    return {
+        "attendance_id": att.EventAttendance.attendance_id,
+        "student_id": att.EventAttendance.student_id,
+        "attendance_status": att.EventAttendance.attendance_status,
+        "check_in_time": att.EventAttendance.check_in_time,
+        "member_name": f"{att.Student.first_name} {att.Student.last_name}",
+    }
+
+
 @events_bp.route("/<int:event_id>/attendance", methods=["GET"])
+@conditional_get(tables=("EventAttendance",), global_tables=("Students",), club_id_of=event_club_id)
 def get_attendance_for_event(event_id):
-    attendance = (
+    query = (
         db.session.query(EventAttendance, Student)
         .join(Student)
         .filter(EventAttendance.event_id == event_id)
-        .all()
     )
 
+    # ?stream=true streams every record instead of returning one page
+    if wants_stream():
+        return stream_json_collection(
+            "attendance", query.order_by(EventAttendance.student_id), format_attendance
+        )
+
+    # Page in EventAttendance(event_id, student_id) index order
+    try:
+        attendance, next_cursor = paginate(
+            query,
+            [EventAttendance.student_id],
+            key_of=lambda att: [att.EventAttendance.student_id],
+        )
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
     return jsonify(
         {
-            "attendance": [
-                {
-                    "attendance_id": att.EventAttendance.attendance_id,
-                    "student_id": att.EventAttendance.student_id,
-                    "attendance_status": att.EventAttendance.attendance_status,
-                    "check_in_time": (
-                        att.EventAttendance.check_in_time.strftime("%H:%M:%S")
-                        if att.EventAttendance.check_in_time
-                        else None
-                    ),  # Format time
-                    "member_name": f"{att.Student.first_name} {att.Student.last_name}",
-                }
-                for att in attendance
-            ]
+            "attendance": [format_attendance(att) for att in attendance],
+            "next_cursor": next_cursor,
         }
     )
 
 
 # Route to get all events for a club
 @events_bp.route("/<int:club_id>", methods=["GET"])
+@conditional_get(tables=("Events",), cache=True)
 def get_events_for_club(club_id):
-    events = Event.query.filter_by(club_id=club_id).all()
-    return jsonify({
-        "events": [{
-            "event_id": event.event_id,
-            "event_name": event.event_name,
-            "event_description": event.event_description,
-            "event_date": event.event_date.isoformat(),
-            "event_time": event.event_time.strftime("%H:%M:%S") if event.event_time else None,
-            "location": event.location,
-        } for event in events]
-    })
+    try:
+        query, serialize = select_event_fields(Event.query.filter_by(club_id=club_id))
+    except FieldsetError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"events": [serialize(event) for event in query.all()]})
 
 
 # Route to get all events in the future from present date
 @events_bp.route("/<int:club_id>/upcoming", methods=["GET"])
+@conditional_get(tables=("Events",), daily=True, cache=True)
 def get_upcoming_events(club_id):
     now = datetime.now().date()
-    events = Event.query.filter(Event.club_id == club_id, Event.event_date >= now).all()
-    return jsonify(
-        [
-            {
-                "event_id": event.event_id,
-                "event_name": event.event_name,
-                "event_description": event.event_description,
-                "event_date": event.event_date.isoformat(),
-                "event_time": (
-                    event.event_time.isoformat() if event.event_time else None
-                ),
-                "location": event.location,
-            }
-            for event in events
-        ]
-    )
+    try:
+        query, serialize = select_event_fields(
+            Event.query.filter(Event.club_id == club_id, Event.event_date >= now)
+        )
+    except FieldsetError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify([serialize(event) for event in query.all()])
 
 
 # Route to get all events that occurred before present date
 @events_bp.route("/<int:club_id>/past", methods=["GET"])
+@conditional_get(tables=("Events",), daily=True, cache=True)
 def get_past_events(club_id):
     now = datetime.now().date()
-    events = Event.query.filter(Event.club_id == club_id, Event.event_date < now).all()
-    return jsonify(
-        [
-            {
-                "event_id": event.event_id,
-                "event_name": event.event_name,
-                "event_description": event.event_description,
-                "event_date": event.event_date.isoformat(),
-                "event_time": (
-                    event.event_time.isoformat() if event.event_time else None
-                ),
-                "location": event.location,
-            }
-            for event in events
-        ]
-    )
+    try:
+        query, serialize = select_event_fields(
+            Event.query.filter(Event.club_id == club_id, Event.event_date < now)
+        )
+    except FieldsetError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify([serialize(event) for event in query.all()])
 
 
 @events_bp.route("/<int:club_id>/events", methods=["POST"])
@@ -130,8 +144,9 @@ def delete_event(club_id, event_id):
         if not event:
             return jsonify({"error": "Event not found for the specified club"}), 404
 
-        # Delete associated attendance records
+        # Delete associated attendance and hosting records
         db.session.query(EventAttendance).filter_by(event_id=event_id).delete()
+        db.session.query(EventHosting).filter_by(event_id=event_id).delete()
 
         # Delete the event
         db.session.delete(event)
@@ -151,23 +166,6 @@ def add_event_attendance(event_id):
     try:
         data = request.json
 
-        # Ensure the event exists
-        event = Event.query.filter_by(event_id=event_id).first()
-        if not event:
-            return jsonify({"error": "Event not found"}), 404
-
-        # Check if the student is a registered student
-        student = Student.query.filter_by(student_id=data["student_id"]).first()
-        if not student:
-            return jsonify({"error": "Student is not registered"}), 400
-
-        # Check if the member has already attended the event
-        existing_attendance = EventAttendance.query.filter_by(
-            event_id=event_id, student_id=data["student_id"]
-        ).first()
-        if existing_attendance:
-            return jsonify({"error": "Student has already been recorded for this event"}), 400
-
         # Validate and convert check_in_time
         try:
             check_in_time = (
@@ -178,23 +176,145 @@ def add_event_attendance(event_id):
         except ValueError:
             return jsonify({"error": "Invalid time format. Use HH:MM"}), 400
 
-        # Create a new attendance record
-        new_attendance = EventAttendance(
-            event_id=event_id,
-            student_id=data["student_id"],
-            attendance_status=data["attendance_status"],
-            check_in_time=check_in_time,
+        def insert_attendance(session):
+            # Ensure the event exists
+            event = session.query(Event).filter_by(event_id=event_id).first()
+            if not event:
+                return {"error": "Event not found"}, 404
+
+            # Check if the student is a registered student
+            student = session.query(Student).filter_by(student_id=data["student_id"]).first()
+            if not student:
+                return {"error": "Student is not registered"}, 400
+
+            # Check if the member has already attended the event
+            existing_attendance = session.query(EventAttendance).filter_by(
+                event_id=event_id, student_id=data["student_id"]
+            ).first()
+            if existing_attendance:
+                return {"error": "Student has already been recorded for this event"}, 400
+
+            # Create a new attendance record
+            new_attendance = EventAttendance(
+                event_id=event_id,
+                student_id=data["student_id"],
+                attendance_status=data["attendance_status"],
+                check_in_time=check_in_time,
+            )
+            session.add(new_attendance)
+            return {"message": "Attendance record added successfully"}, 201
+
+        body, status = submit_write(insert_attendance)
+        return jsonify(body), status
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+
+@events_bp.route("/<int:event_id>/attendance/bulk", methods=["POST"])
+def bulk_add_event_attendance(event_id):
+    """
+    Record attendance for many students in one transaction. Student ids are
+    validated with one IN query and duplicates are left to the
+    UNIQUE(event_id, student_id) constraint (INSERT ... ON CONFLICT DO
+    NOTHING). Returns a result per row: "recorded", "duplicate" (already
+    recorded for this event), or "invalid" with an error message.
+    """
+    try:
+        rows = read_bulk_rows("attendance")
+    except BulkError as e:
+        return jsonify({"error": str(e)}), 400
+
+    results = []
+    candidates = []
+    for index, row in enumerate(rows, start=1):
+        record, error = validate_attendance_row(row)
+        if error:
+            results.append({"row": index, "student_id": row.get("student_id"), "status": "invalid", "error": error})
+        else:
+            candidates.append((index, record))
+
+    def insert_attendance(session):
+        if session.get(Event, event_id) is None:
+            return {"error": "Event not found"}, 404
+
+        registered = set(
+            session.execute(
+                text("SELECT student_id FROM Students WHERE student_id IN (SELECT value FROM json_each(:ids))"),
+                {"ids": json_array(record["student_id"] for _, record in candidates)},
+            ).scalars()
         )
 
-        db.session.add(new_attendance)
-        db.session.commit()
-        return jsonify({"message": "Attendance record added successfully"}), 201
+        report = list(results)
+        records = []
+        for index, record in candidates:
+            if record["student_id"] in registered:
+                records.append((index, record))
+            else:
+                report.append({"row": index, "student_id": record["student_id"], "status": "invalid", "error": "Student is not registered"})
+
+        # One statement for every record; only rows actually inserted come back
+        inserted = insert_attendance_records(session, event_id, [record for _, record in records])
+
+        for index, record in records:
+            student_id = record["student_id"]
+            if student_id in inserted:
+                inserted.discard(student_id)  # later rows for the same student are duplicates
+                report.append({"row": index, "student_id": student_id, "status": "recorded"})
+            else:
+                report.append({"row": index, "student_id": student_id, "status": "duplicate"})
+
+        report.sort(key=lambda result: result["row"])
+        return {"summary": summarize(report), "results": report}, 200
 
+    try:
+        body, status = submit_write(insert_attendance)
+        return jsonify(body), status
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
+# Route to open (or reopen) a kiosk check-in session for an event
+@events_bp.route("/<int:event_id>/kiosk", methods=["POST"])
+def open_kiosk(event_id):
+    session = current_app.extensions["kiosk"].get(event_id)
+    if session is None:
+        return jsonify({"error": "Event not found"}), 404
+    return jsonify(session.counts()), 200
+
+
+# Route to check a student in through the event's kiosk session
+@events_bp.route("/<int:event_id>/kiosk/check-in", methods=["POST"])
+def kiosk_check_in(event_id):
+    kiosk = current_app.extensions["kiosk"]
+    session = kiosk.get(event_id)
+    if session is None:
+        return jsonify({"error": "Event not found"}), 404
+
+    body, status = kiosk.check_in(session, request.json or {})
+    return jsonify(body), status
+
+
+# Route to get the live check-in count, including check-ins not yet written
+@events_bp.route("/<int:event_id>/kiosk", methods=["GET"])
+def get_kiosk_counts(event_id):
+    session = current_app.extensions["kiosk"].get(event_id, create=False)
+    if session is None:
+        return jsonify({"error": "No kiosk session for this event"}), 404
+    return jsonify(session.counts()), 200
+
+
+# Route to flush and close the event's kiosk session
+@events_bp.route("/<int:event_id>/kiosk", methods=["DELETE"])
+def close_kiosk(event_id):
+    counts = current_app.extensions["kiosk"].close(event_id)
+    if counts is None:
+        return jsonify({"error": "No kiosk session for this event"}), 404
+    return jsonify(counts), 200
+
 
 @events_bp.route("/<int:event_id>/attendance/<string:attendance_id>", methods=["DELETE"])
 def remove_event_attendance(event_id, attendance_id):
@@ -1,23 +1,33 @@
 from flask import Blueprint, jsonify, request
-from app.models import db, Expense, Budget
+from app.models import db, Expense, Budget, EXPENSE_CATEGORIES
 from datetime import datetime, date
 from sqlalchemy import and_
+from app.write_queue import submit_write
+from app.pagination import PaginationError, paginate
+from app.streaming import stream_json_collection, wants_stream
+from app.fieldsets import FieldsetError, apply_fieldset, parse_fields
+from app.serializers import serializer_for
+from app.etags import conditional_get
+from app.search import match_expression, search_hits
+from app.bulk import BulkError, read_bulk_rows, wants_dry_run
+from app.finance_imports import import_expenses
+from app.jobs import enqueue_job, job_accepted, wants_background
 
 # Define the blueprint
 expenses_bp = Blueprint("expenses", __name__)
 
 @expenses_bp.route("/categories", methods=["GET"])
+@conditional_get()
 def get_expense_categories():
     try:
-        # Hardcoded list based on the database schema
-        categories = ['Event', 'Supplies', 'Travel', 'Food', 'Other']
-        return jsonify({"categories": categories}), 200
+        return jsonify({"categories": EXPENSE_CATEGORIES}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
     
 
 # Route to find expenses for a club within the chosen fiscal year
 @expenses_bp.route("/<int:club_id>", methods=["GET"])
+@conditional_get(tables=("Expenses",))
 def get_expenses_for_club(club_id):
     fiscal_year = request.args.get("fiscal_year")  # Get fiscal year from query parameters
     # Query expenses based on club_id
@@ -33,23 +43,29 @@ def get_expenses_for_club(club_id):
         # Filter expenses based on their date being within the fiscal year range
         query = query.filter(Expense.expense_date >= fiscal_year_start, Expense.expense_date < fiscal_year_end)
 
-    expenses = query.all()
+    key_columns = [Expense.expense_date, Expense.expense_id]
+    key_of, serialize = None, serializer_for(Expense)
+
+    try:
+        # ?fields= selects only the requested columns
+        fields = parse_fields(Expense)
+        if fields:
+            query, key_of, serialize = apply_fieldset(query, Expense, fields, key_columns)
+
+        # ?stream=true streams every matching expense instead of returning one page
+        if wants_stream():
+            return stream_json_collection("expenses", query.order_by(*key_columns), serialize)
+
+        # Page in Expenses(club_id, expense_date) index order
+        expenses, next_cursor = paginate(query, key_columns, key_of=key_of)
+    except (PaginationError, FieldsetError) as e:
+        return jsonify({"error": str(e)}), 400
 
     if not expenses:
         return jsonify({"message": "No expenses found for this club"}), 200
 
-    expense_list = [
-        {
-            "expense_id": expense.expense_id,
-            "expense_name": expense.expense_name,
-            "expense_amount": expense.expense_amount,
-            "expense_date": expense.expense_date.isoformat(),
-            "description": expense.description,
-            "category": expense.category,
-        }
-        for expense in expenses
-    ]
-    return jsonify({"expenses": expense_list}), 200
+    expense_list = [serialize(expense) for expense in expenses]
+    return jsonify({"expenses": expense_list, "next_cursor": next_cursor}), 200
     
 
 # Route to add an expense to the club
@@ -65,30 +81,58 @@ def add_expense(club_id):
         expense_date = datetime.strptime(data["expense_date"], "%Y-%m-%d").date()
         fiscal_year = expense_date.year
 
-        # Find the appropriate budget for the fiscal year
-        budget = Budget.query.filter_by(club_id=club_id, fiscal_year=fiscal_year).first()
-        if not budget:
-            return jsonify({"error": "No budget found for the given fiscal year"}), 404
-
-        # Create a new expense
-        new_expense = Expense(
-            club_id=club_id,
-            budget_id=budget.budget_id,
-            expense_name=data["expense_name"],
-            expense_amount=data["expense_amount"],
-            expense_date=expense_date,
-            description=data.get("description"),
-            category=data.get("category"),
-        )
-        db.session.add(new_expense)
-        db.session.commit()
-
-        return jsonify({"message": "Expense added successfully"}), 201
+        def insert_expense(session):
+            # Find the appropriate budget for the fiscal year
+            budget = session.query(Budget).filter_by(club_id=club_id, fiscal_year=fiscal_year).first()
+            if not budget:
+                return {"error": "No budget found for the given fiscal year"}, 404
+
+            # Create a new expense
+            new_expense = Expense(
+                club_id=club_id,
+                budget_id=budget.budget_id,
+                expense_name=data["expense_name"],
+                expense_amount=data["expense_amount"],
+                expense_date=expense_date,
+                description=data.get("description"),
+                category=data.get("category"),
+            )
+            session.add(new_expense)
+            return {"message": "Expense added successfully"}, 201
+
+        body, status = submit_write(insert_expense)
+        return jsonify(body), status
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
     
 
+# Route to import many expenses at once (JSON array or CSV upload)
+@expenses_bp.route("/<int:club_id>/bulk", methods=["POST"])
+def bulk_add_expenses(club_id):
+    """
+    Import expenses in one transaction. The club's budgets are loaded once
+    and each expense is assigned to the budget for its fiscal year, as in
+    add_expense. Returns a result per row: "created" ("valid" with
+    ?dry_run=true, which writes nothing) or "invalid" with an error message.
+    With ?async=true the import runs as an expense_import job instead.
+    """
+    try:
+        rows = read_bulk_rows("expenses")
+    except BulkError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        dry_run = wants_dry_run()
+        if wants_background():
+            return job_accepted(enqueue_job("expense_import", {"club_id": club_id, "rows": rows, "dry_run": dry_run}))
+        body, status = import_expenses(club_id, rows, dry_run)
+        return jsonify(body), status
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
 # Route to remove an expense from the club
 @expenses_bp.route("/<int:club_id>/<int:expense_id>", methods=["DELETE"])
 def delete_expense(club_id, expense_id):
@@ -109,16 +153,21 @@ def delete_expense(club_id, expense_id):
 
 # Route to search expenses based on search params within the chosen fiscal year
 @expenses_bp.route("/<int:club_id>/search", methods=["GET"])
+@conditional_get(tables=("Expenses",))
 def search_expenses(club_id):
-    name = request.args.get("expense_name", "").strip()
+    # Name and description match word prefixes through the ExpensesSearch
+    # full-text index; q searches both
+    match = match_expression({
+        None: request.args.get("q", ""),
+        "expense_name": request.args.get("expense_name", ""),
+        "description": request.args.get("description", ""),
+    })
     category = request.args.get("category", "").strip()
     fiscal_year = request.args.get("fiscal_year")  # Get fiscal year from query parameters
 
     try:
         # Build query filters
         filters = [Expense.club_id == club_id]
-        if name:
-            filters.append(Expense.expense_name.ilike(f"%{name}%"))
         if category:
             filters.append(Expense.category.ilike(f"%{category}%"))
         if fiscal_year:
@@ -128,24 +177,19 @@ def search_expenses(club_id):
             filters.append(Expense.expense_date >= fiscal_year_start)
             filters.append(Expense.expense_date < fiscal_year_end)
 
-        # Query expenses
-        expenses = Expense.query.filter(and_(*filters)).all()
+        # Query expenses, best matches first
+        query = Expense.query.filter(and_(*filters))
+        if match:
+            hits = search_hits("ExpensesSearch", match)
+            query = query.join(hits, hits.c.rowid == Expense.expense_id).order_by(hits.c.rank)
+        expenses = query.all()
 
         if not expenses:
             return jsonify({"expenses": []}), 200
 
         # Format the result
-        expense_list = [
-            {
-                "expense_id": expense.expense_id,
-                "expense_name": expense.expense_name,
-                "expense_amount": expense.expense_amount,
-                "expense_date": expense.expense_date.isoformat(),
-                "description": expense.description,
-                "category": expense.category,
-            }
-            for expense in expenses
-        ]
+        serialize = serializer_for(Expense)
+        expense_list = [serialize(expense) for expense in expenses]
 
         return jsonify({"expenses": expense_list}), 200
 
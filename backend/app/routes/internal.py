@@ -0,0 +1,17 @@
+from flask import Blueprint, current_app, jsonify
+
+# Define the blueprint
+internal_bp = Blueprint("internal", __name__)
+
+# Route to report this worker's response cache counters and size
+@internal_bp.route("/cache", methods=["GET"])
+def get_cache_stats():
+    response_cache = current_app.extensions.get("response_cache")
+    if response_cache is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **response_cache.report()})
+
+# Route to report the size of this worker's student typeahead index
+@internal_bp.route("/suggest", methods=["GET"])
+def get_suggest_stats():
+    return jsonify(current_app.extensions["student_suggest"].report())
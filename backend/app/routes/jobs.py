@@ -0,0 +1,39 @@
+from flask import Blueprint, jsonify, request
+from app.jobs import JobError, JobNotFound, cancel_job, enqueue_job, job_accepted, serialize_job
+from app.models import db, Job
+
+# Define the blueprint
+jobs_bp = Blueprint("jobs", __name__)
+
+# Route to queue a job: {"kind": "...", "params": {...}}
+@jobs_bp.route("/", methods=["POST"])
+def create_job():
+    data = request.get_json(silent=True) or {}
+    params = data.get("params", {})
+    if not isinstance(params, dict):
+        return jsonify({"error": "params must be an object"}), 400
+    try:
+        return job_accepted(enqueue_job(data.get("kind"), params))
+    except JobNotFound as e:
+        return jsonify({"error": str(e)}), 404
+    except JobError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# Route to get a job's status, progress and result
+@jobs_bp.route("/<int:job_id>", methods=["GET"])
+def get_job(job_id):
+    job = db.session.get(Job, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(serialize_job(job))
+
+# Route to cancel a queued or running job
+@jobs_bp.route("/<int:job_id>/cancel", methods=["POST"])
+def cancel(job_id):
+    try:
+        body, status = cancel_job(job_id)
+        return jsonify(body), status
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
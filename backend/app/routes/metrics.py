@@ -0,0 +1,12 @@
+from flask import Blueprint, Response, current_app, jsonify
+
+# Define the blueprint
+metrics_bp = Blueprint("metrics", __name__)
+
+# Route to expose per-endpoint SQL metrics, summed over every worker, for Prometheus
+@metrics_bp.route("", methods=["GET"])
+def get_metrics():
+    query_metrics = current_app.extensions.get("query_metrics")
+    if query_metrics is None:
+        return jsonify({"error": "Query metrics are disabled"}), 404
+    return Response(query_metrics.render(), mimetype="text/plain; version=0.0.4")
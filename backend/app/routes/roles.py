@@ -1,25 +1,22 @@
 from flask import Blueprint, jsonify
 from app.models import Role
+from app.serializers import serializer_for
+from app.etags import conditional_get
 
 # Define the blueprint
 roles_bp = Blueprint("roles", __name__)
 
 # Route to fetch all roles
 @roles_bp.route("/", methods=["GET"])
+@conditional_get(global_tables=("Roles",))
 def get_roles():
     try:
         # Query all roles
         roles = Role.query.all()
 
         # Format the response
-        role_list = [
-            {
-                "role_id": role.role_id,
-                "role_name": role.role_name,
-                "role_description": role.role_description,
-            }
-            for role in roles
-        ]
+        serialize = serializer_for(Role)
+        role_list = [serialize(role) for role in roles]
 
         return jsonify({"roles": role_list}), 200
 
@@ -0,0 +1,26 @@
+from flask import Blueprint, current_app, jsonify, request
+from app.global_search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, GlobalSearchError, parse_types
+from app.pagination import PaginationError
+
+# Define the blueprint
+search_bp = Blueprint("search", __name__)
+
+# Route to search clubs, students, events, sponsors and expenses at once:
+# ?q=<terms>&types=club,event&limit=20&cursor=<next_cursor>
+@search_bp.route("/", methods=["GET"])
+def global_search():
+    q = request.args.get("q", "").strip()
+    if not q:
+        return jsonify({"error": "q is required"}), 400
+    limit = request.args.get("limit", DEFAULT_SEARCH_LIMIT, type=int)
+    if limit is None or not 1 <= limit <= MAX_SEARCH_LIMIT:
+        return jsonify({"error": f"limit must be between 1 and {MAX_SEARCH_LIMIT}"}), 400
+    try:
+        # Each entity is searched on its own thread (see app/global_search.py)
+        types = parse_types(request.args.get("types"))
+        page = current_app.extensions["global_search"].search(q, types, limit, request.args.get("cursor"))
+        return jsonify(page), 200
+    except (GlobalSearchError, PaginationError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
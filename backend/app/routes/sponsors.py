@@ -2,43 +2,60 @@ from flask import Blueprint, jsonify, request
 from app.models import db, Sponsor, SponsorshipContribution
 from datetime import datetime
 from sqlalchemy import and_
+from app.pagination import PaginationError, paginate
+from app.streaming import stream_json_collection, wants_stream
+from app.fieldsets import FieldsetError, apply_fieldset, parse_fields
+from app.serializers import serializer_for
+from app.etags import conditional_get
+from app.search import match_expression, search_hits
+from app.bulk import BulkError, read_bulk_rows, wants_dry_run
+from app.finance_imports import import_contributions
+from app.jobs import enqueue_job, job_accepted, wants_background
 
 # Define the blueprint
 sponsors_bp = Blueprint("sponsors", __name__)
 
 # Route to get all registered sponsors
 @sponsors_bp.route("/", methods=["GET"])
+@conditional_get(global_tables=("Sponsors",))
 def get_all_sponsors():
     """
     Retrieve all sponsors across all clubs.
     """
     try:
-        # Query all sponsors
-        sponsors = Sponsor.query.all()
+        # ?fields= selects only the requested columns
+        query, key_of, serialize = Sponsor.query, None, serializer_for(Sponsor)
+        fields = parse_fields(Sponsor)
+        if fields:
+            query, key_of, serialize = apply_fieldset(
+                query, Sponsor, fields, [Sponsor.sponsor_id]
+            )
+
+        # ?stream=true streams every sponsor instead of returning one page
+        if wants_stream():
+            return stream_json_collection(
+                "sponsors", query.order_by(Sponsor.sponsor_id), serialize
+            )
+
+        # Query a page of sponsors
+        sponsors, next_cursor = paginate(query, [Sponsor.sponsor_id], key_of=key_of)
 
         # Format sponsors for JSON response
-        sponsor_list = [
-            {
-                "sponsor_id": sponsor.sponsor_id,
-                "sponsor_name": sponsor.sponsor_name,
-                "contact_person": sponsor.contact_person,
-                "contact_email": sponsor.contact_email,
-                "phone_number": sponsor.phone_number,
-                "address": sponsor.address,
-            }
-            for sponsor in sponsors
-        ]
+        sponsor_list = [serialize(sponsor) for sponsor in sponsors]
 
-        return jsonify({"sponsors": sponsor_list}), 200
+        return jsonify({"sponsors": sponsor_list, "next_cursor": next_cursor}), 200
 
+    except (PaginationError, FieldsetError) as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 # Route to find all sponsors associated with a club
 @sponsors_bp.route("/<int:club_id>", methods=["GET"])
+@conditional_get(tables=("SponsorshipContribution",), global_tables=("Sponsors",), cache=True)
 def get_club_sponsors(club_id):
-    sponsors = (
+    query = (
         db.session.query(
             Sponsor.sponsor_id,
             Sponsor.sponsor_name,
@@ -55,25 +72,34 @@ def get_club_sponsors(club_id):
             SponsorshipContribution.sponsor_id == Sponsor.sponsor_id,
         )
         .filter(SponsorshipContribution.club_id == club_id)
-        .all()
     )
+    key_of, serialize = None, serializer_for(SponsorshipContribution)
 
-    sponsor_list = [
-        {
-            "sponsor_id": sponsor.sponsor_id,
-            "sponsor_name": sponsor.sponsor_name,
-            "contact_person": sponsor.contact_person,
-            "contact_email": sponsor.contact_email,
-            "phone_number": sponsor.phone_number,
-            "address": sponsor.address,
-            "sponsorship_id": sponsor.sponsorship_id,
-            "contribution_amount": sponsor.contribution_amount,
-            "contribution_date": sponsor.contribution_date.isoformat(),
-        }
-        for sponsor in sponsors
-    ]
+    try:
+        # ?fields= selects only the requested columns
+        fields = parse_fields(SponsorshipContribution)
+        if fields:
+            query, key_of, serialize = apply_fieldset(
+                query, SponsorshipContribution, fields, [SponsorshipContribution.sponsorship_id]
+            )
+
+        # ?stream=true streams every contribution instead of returning one page
+        if wants_stream():
+            return stream_json_collection(
+                "sponsors",
+                query.order_by(SponsorshipContribution.sponsorship_id),
+                serialize,
+            )
+
+        sponsors, next_cursor = paginate(
+            query, [SponsorshipContribution.sponsorship_id], key_of=key_of
+        )
+    except (PaginationError, FieldsetError) as e:
+        return jsonify({"error": str(e)}), 400
 
-    return jsonify({"sponsors": sponsor_list}), 200
+    sponsor_list = [serialize(sponsor) for sponsor in sponsors]
+
+    return jsonify({"sponsors": sponsor_list, "next_cursor": next_cursor}), 200
 
 
 # Route to add a new sponsor and/or sponsorship contribution
@@ -121,13 +147,46 @@ def add_sponsor_or_contribution(club_id):
         return jsonify({"error": str(e)}), 400
     
 
+# Route to import many sponsorship contributions at once (JSON array or CSV upload)
+@sponsors_bp.route("/<int:club_id>/bulk", methods=["POST"])
+def bulk_add_contributions(club_id):
+    """
+    Import contributions in one transaction. Sponsors named in the upload are
+    resolved with one lookup by name, and the missing ones are created with
+    one insert (contact details from the first row naming them). Returns a
+    result per row: "created" ("valid" with ?dry_run=true, which writes
+    nothing), "duplicate" (same sponsor and date already recorded for the
+    club), or "invalid" with an error message.
+    With ?async=true the import runs as a contribution_import job instead.
+    """
+    try:
+        rows = read_bulk_rows("contributions")
+    except BulkError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        dry_run = wants_dry_run()
+        if wants_background():
+            return job_accepted(enqueue_job("contribution_import", {"club_id": club_id, "rows": rows, "dry_run": dry_run}))
+        body, status = import_contributions(club_id, rows, dry_run)
+        return jsonify(body), status
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
 # Route to search sponsors that contribute to a club based on params
 @sponsors_bp.route("/<int:club_id>/search", methods=["GET"])
+@conditional_get(tables=("SponsorshipContribution",), global_tables=("Sponsors",))
 def search_sponsors(club_id):
-    # Get search parameters from the request
-    sponsor_name = request.args.get("sponsor_name", "").strip()
-    contact_person = request.args.get("contact_person", "").strip()
-    contact_email = request.args.get("contact_email", "").strip()
+    # Get search parameters from the request. Text fields match word
+    # prefixes through the SponsorsSearch full-text index; q searches all of them.
+    match = match_expression({
+        None: request.args.get("q", ""),
+        "sponsor_name": request.args.get("sponsor_name", ""),
+        "contact_person": request.args.get("contact_person", ""),
+        "contact_email": request.args.get("contact_email", ""),
+    })
     from_date = request.args.get("from_date", "").strip()  # Search from this date onwards
     to_date = request.args.get("to_date", "").strip()  # Search up to this date
 
@@ -135,12 +194,6 @@ def search_sponsors(club_id):
         # Build query filters
         filters = [SponsorshipContribution.club_id == club_id]
 
-        if sponsor_name:
-            filters.append(Sponsor.sponsor_name.ilike(f"%{sponsor_name}%"))
-        if contact_person:
-            filters.append(Sponsor.contact_person.ilike(f"%{contact_person}%"))
-        if contact_email:
-            filters.append(Sponsor.contact_email.ilike(f"%{contact_email}%"))
         if from_date:
             from_date_obj = datetime.strptime(from_date, "%Y-%m-%d").date()
             filters.append(SponsorshipContribution.contribution_date >= from_date_obj)
@@ -149,7 +202,7 @@ def search_sponsors(club_id):
             filters.append(SponsorshipContribution.contribution_date <= to_date_obj)
 
         # Query sponsors
-        sponsors = (
+        query = (
             db.session.query(
                 Sponsor.sponsor_id,
                 Sponsor.sponsor_name,
@@ -166,27 +219,19 @@ def search_sponsors(club_id):
                 SponsorshipContribution.sponsor_id == Sponsor.sponsor_id,
             )
             .filter(and_(*filters))
-            .all()
         )
+        # Best matches first
+        if match:
+            hits = search_hits("SponsorsSearch", match)
+            query = query.join(hits, hits.c.rowid == Sponsor.sponsor_id).order_by(hits.c.rank)
+        sponsors = query.all()
 
         if not sponsors:
             return jsonify({"sponsors": []}), 200
 
         # Format sponsors for JSON response
-        sponsor_list = [
-            {
-                "sponsor_id": sponsor.sponsor_id,
-                "sponsor_name": sponsor.sponsor_name,
-                "contact_person": sponsor.contact_person,
-                "contact_email": sponsor.contact_email,
-                "phone_number": sponsor.phone_number,
-                "address": sponsor.address,
-                "sponsorship_id": sponsor.sponsorship_id,
-                "contribution_amount": sponsor.contribution_amount,
-                "contribution_date": sponsor.contribution_date.isoformat(),
-            }
-            for sponsor in sponsors
-        ]
+        serialize = serializer_for(SponsorshipContribution)
+        sponsor_list = [serialize(sponsor) for sponsor in sponsors]
 
         return jsonify({"sponsors": sponsor_list}), 200
 
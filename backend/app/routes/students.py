@@ -1,30 +1,55 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify, request
 from app.models import Student
+from app.pagination import PaginationError, paginate
+from app.streaming import stream_json_collection, wants_stream
+from app.fieldsets import FieldsetError, apply_fieldset, parse_fields
+from app.serializers import serializer_for
+from app.etags import conditional_get
+from app.suggest import MAX_SUGGESTIONS
 
 # Define the blueprint
 students_bp = Blueprint("students", __name__)
 
 # Route to fetch all students
 @students_bp.route('/', methods=['GET'])
+@conditional_get(global_tables=("Students",))
 def get_all_students():
     try:
-        # Fetch all students from the database
-        students = Student.query.all()
+        # ?fields= selects only the requested columns
+        query, key_of, serialize = Student.query, None, serializer_for(Student)
+        fields = parse_fields(Student)
+        if fields:
+            query, key_of, serialize = apply_fieldset(
+                query, Student, fields, [Student.student_id]
+            )
+
+        # ?stream=true streams every student instead of returning one page
+        if wants_stream():
+            return stream_json_collection(
+                "students", query.order_by(Student.student_id), serialize
+            )
+
+        # Fetch a page of students from the database
+        students, next_cursor = paginate(query, [Student.student_id], key_of=key_of)
 
         # Format the students into a list of dictionaries
-        student_list = [
-            {
-                "student_id": student.student_id,
-                "first_name": student.first_name,
-                "last_name": student.last_name,
-                "email": student.email,
-                "phone_number": student.phone_number,
-                "major": student.major,
-                "graduation_year": student.graduation_year,
-            }
-            for student in students
-        ]
+        student_list = [serialize(student) for student in students]
 
-        return jsonify({"students": student_list}), 200
+        return jsonify({"students": student_list, "next_cursor": next_cursor}), 200
+    except (PaginationError, FieldsetError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# Route to suggest students whose id, name or email starts with ?q= (typeahead)
+@students_bp.route('/suggest', methods=['GET'])
+def suggest_students():
+    limit = request.args.get("limit", 10, type=int)
+    if not 1 <= limit <= MAX_SUGGESTIONS:
+        return jsonify({"error": f"limit must be between 1 and {MAX_SUGGESTIONS}"}), 400
+    try:
+        # Served from this worker's in-memory index (see app/suggest.py)
+        students = current_app.extensions["student_suggest"].suggest(request.args.get("q", ""), limit)
+        return jsonify({"students": students}), 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
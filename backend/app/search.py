@@ -0,0 +1,37 @@
+import re
+from sqlalchemy import Float, Integer, column, text
+
+# Words of a search term, as FTS5's unicode61 tokenizer splits them
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def match_expression(terms):
+    """
+    FTS5 MATCH expression for `terms` ({column: text}, or {None: text} to
+    search every indexed column). Each word of a term matches as a prefix, and
+    all of them must match, so "ali john" finds "Alice Johnson" and
+    "alice.jo" finds "alice.johnson@example.com". Returns None when no term
+    has any words.
+    """
+    parts = []
+    for name, value in terms.items():
+        words = _TOKEN.findall(value or "")
+        if not words:
+            continue
+        phrase = " ".join(f'"{word}"*' for word in words)
+        parts.append(f"{name} : ({phrase})" if name else f"({phrase})")
+    return " AND ".join(parts) or None
+
+
+def search_hits(index, match):
+    """
+    Subquery of (rowid, rank) for the rows of FTS5 table `index` matching
+    `match`, ranked by bm25 (lower is better). Join it to the content table on
+    rowid and order by rank.
+    """
+    return (
+        text(f"SELECT rowid, bm25({index}) AS rank FROM {index} WHERE {index} MATCH :match")
+        .bindparams(match=match)
+        .columns(column("rowid", Integer), column("rank", Float))
+        .subquery(index.lower())
+    )
@@ -0,0 +1,72 @@
+import keyword
+from app.models import (
+    Club,
+    Event,
+    Expense,
+    Role,
+    Sponsor,
+    SponsorshipContribution,
+    Student,
+)
+
+# Fields each model serializes to by default, in response order. Rows from
+# joined sponsor/contribution queries use the SponsorshipContribution entry.
+SPONSOR_FIELDS = ("sponsor_id", "sponsor_name", "contact_person", "contact_email", "phone_number", "address")
+
+MODEL_FIELDS = {
+    Club: ("club_id", "club_name", "club_description", "founded_date", "contact_email", "faculty_advisor"),
+    Student: ("student_id", "first_name", "last_name", "email", "phone_number", "major", "graduation_year"),
+    Event: ("event_id", "event_name", "event_description", "event_date", "event_time", "location"),
+    Expense: ("expense_id", "expense_name", "expense_amount", "expense_date", "description", "category"),
+    Sponsor: SPONSOR_FIELDS,
+    SponsorshipContribution: SPONSOR_FIELDS + ("sponsorship_id", "contribution_amount", "contribution_date"),
+    Role: ("role_id", "role_name", "role_description"),
+}
+
+# Rows of the officers query (Students joined with ClubRoles and Roles)
+OFFICER_FIELDS = (
+    "student_id", "first_name", "last_name", "email", "phone_number",
+    "role_id", "role_name", "role_description",
+)
+
+# (model, fields) -> compiled serializer
+_serializers = {}
+
+
+def compile_serializer(fields):
+    """
+    Generate a function equivalent to
+    `lambda row: {"a": row.a, "b": row.b, ...}` for the given fields.
+    Works for ORM entities and for column-only result rows alike. Values are
+    copied as-is; dates and times are encoded by the app's JSON provider.
+    """
+    for field in fields:
+        if not field.isidentifier() or keyword.iskeyword(field):
+            raise ValueError(f"Invalid field name: {field!r}")
+
+    items = ", ".join(f"{field!r}: row.{field}" for field in fields)
+    namespace = {}
+    exec(f"def serialize(row):\n    return {{{items}}}\n", namespace)
+    return namespace["serialize"]
+
+
+def serializer_for(model, fields=None):
+    """Return the cached row-to-dict function for `model` and `fields` (default: all)."""
+    fields = tuple(fields) if fields else MODEL_FIELDS[model]
+    key = (model, fields)
+    serializer = _serializers.get(key)
+    if serializer is None:
+        serializer = _serializers[key] = compile_serializer(fields)
+    return serializer
+
+
+def model_columns(model):
+    """Map each serializable field of `model` to the column it is read from."""
+    columns = {}
+    for field in MODEL_FIELDS[model]:
+        source = model if hasattr(model, field) else Sponsor
+        columns[field] = getattr(source, field)
+    return columns
+
+
+serialize_officer = compile_serializer(OFFICER_FIELDS)
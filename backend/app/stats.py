@@ -0,0 +1,50 @@
+from flask import request
+from sqlalchemy import func
+from app.models import db, Membership, Student
+
+# Columns GET /members/stats can group by
+MEMBER_DIMENSIONS = {
+    "major": Student.major,
+    "graduation_year": Student.graduation_year,
+    "active_status": Membership.active_status,
+    "club_id": Membership.club_id,
+}
+
+
+class StatsError(ValueError):
+    """Raised for a missing or unknown ?group_by= dimension."""
+
+
+def parse_group_by(dimensions):
+    """Dimensions named in ?group_by=a,b, in request order."""
+    raw = request.args.get("group_by", "").strip()
+    group_by = list(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    if not group_by:
+        raise StatsError(f"group_by is required. Available: {', '.join(dimensions)}")
+
+    unknown = [name for name in group_by if name not in dimensions]
+    if unknown:
+        raise StatsError(
+            f"Unknown group_by: {', '.join(unknown)}. Available: {', '.join(dimensions)}"
+        )
+    return group_by
+
+
+def member_counts(group_by, club_ids=None):
+    """
+    Count memberships grouped by `group_by` (names from MEMBER_DIMENSIONS),
+    for the clubs in `club_ids` (every club when None). Returns a list of
+    {dimension: value, ..., "count": n} ordered by the dimensions.
+    """
+    columns = [MEMBER_DIMENSIONS[name].label(name) for name in group_by]
+    query = db.session.query(*columns, func.count().label("count")).select_from(Membership).join(
+        Student, Student.student_id == Membership.student_id
+    )
+    if club_ids is not None:
+        query = query.filter(Membership.club_id.in_(club_ids))
+    query = query.group_by(*columns).order_by(*columns)
+
+    return [
+        {**{name: getattr(row, name) for name in group_by}, "count": row.count}
+        for row in query
+    ]
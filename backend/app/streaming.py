@@ -0,0 +1,36 @@
+from flask import Response, current_app, request, stream_with_context
+
+# Rows fetched from SQLite per round trip, and rows encoded per response chunk
+STREAM_FETCH_SIZE = 1000
+STREAM_CHUNK_ROWS = 500
+
+
+def wants_stream():
+    """True when the client asked for a streamed response (?stream=true)."""
+    return request.args.get("stream", "").lower() in ("1", "true", "yes")
+
+
+def stream_json_collection(key, query, serialize, fetch_size=STREAM_FETCH_SIZE):
+    """
+    Stream every row of `query` as `{"<key>": [...]}`, encoding rows as they
+    are fetched. Rows are loaded `fetch_size` at a time with yield_per, so
+    memory stays flat no matter how many rows the query returns.
+    `serialize(row)` turns one row into a JSON-serializable dict.
+    """
+    dumps = current_app.json.dumps
+
+    def generate():
+        yield f'{{"{key}":['
+        chunk = []
+        first = True
+        for row in query.yield_per(fetch_size):
+            chunk.append(dumps(serialize(row)))
+            if len(chunk) >= STREAM_CHUNK_ROWS:
+                yield ("" if first else ",") + ",".join(chunk)
+                first = False
+                chunk = []
+        if chunk:
+            yield ("" if first else ",") + ",".join(chunk)
+        yield "]}"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
@@ -0,0 +1,305 @@
+import bisect
+import heapq
+import os
+import sqlite3
+import sys
+import threading
+from array import array
+from app.bulk import json_array
+from app.db_utils import STUDENT_CHANGES_KEPT, readonly_uri
+from app.search import match_expression
+
+# Most suggestions returned by one request
+MAX_SUGGESTIONS = 50
+
+# Apply at most this many changed students in place; more means a rebuild
+_MAX_INCREMENTAL_CHANGES = 1000
+# Keys added since the last rebuild before they are merged into the base
+_MAX_DELTA_KEYS = 20000
+
+_STUDENT_COLUMNS = "student_id, first_name, last_name, email"
+
+# Ends each key in the key blob, and separates the fields of a packed record.
+# Both sort before any printable character and are stripped from the data.
+_END = "\x00"
+_FIELD = "\x1f"
+
+
+def _clean(value):
+    return (value or "").replace(_END, "").replace(_FIELD, "")
+
+
+def _search_keys(student_id, first_name, last_name, email):
+    """Lowercase strings a student can be found by the prefix of."""
+    return (
+        student_id.lower(),
+        f"{first_name} {last_name}".lower(),
+        last_name.lower(),
+        email.lower(),
+    )
+
+
+class StudentSuggestIndex:
+    """
+    Per-worker typeahead index over Students. Every student's id, full name,
+    last name and email, lowercased, are the search keys; prefix lookups are
+    a bisect over the keys in sorted order.
+
+    To stay compact the keys live in one string (each ended by a NUL), with
+    arrays of their sorted offsets and of the record each belongs to, and
+    each student is a single packed string. That is about 200 bytes per
+    student, against well over 600 as Python tuples and strings.
+
+    Built on first use from a dedicated read-only connection. Before each
+    lookup the index compares that connection's PRAGMA data_version, which
+    changes whenever another connection commits, and only then reads the ids
+    written since its last refresh from StudentChanges. Changed students are
+    retired in place and re-added to a small sorted delta list, which is
+    merged by a rebuild once it grows. If the index would grow past
+    `max_bytes` it is dropped and lookups use the StudentsSearch full-text
+    index instead; the build is retried after a write that leaves fewer
+    students than there were when it was dropped.
+    """
+
+    def __init__(self, db_path, max_bytes):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+        self._data_version = None
+        self._last_seq = 0
+        self._built = False
+        self.over_cap = False
+        self._over_cap_students = 0  # student count when the index was dropped
+        self.rebuilds = 0
+        self.incremental_updates = 0
+        self._reset()
+
+    def _reset(self):
+        self._blob = ""  # every base key, each followed by _END
+        self._offsets = array("I")  # start of each base key in _blob, in key order
+        self._positions = array("I")  # record position of each base key
+        self._delta = []  # sorted (key, position) added since the last rebuild
+        self._records = []  # packed records, None once replaced or deleted
+        self._record_bytes = 0
+        self._removed = 0
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                readonly_uri(self.db_path), uri=True, check_same_thread=False, isolation_level=None
+            )
+        return self._conn
+
+    def suggest(self, prefix, limit):
+        """Up to `limit` students whose id, name or email starts with `prefix`, as dicts."""
+        prefix = " ".join(_clean(prefix).lower().split())
+        if not prefix:
+            return []
+        with self._lock:
+            self._refresh()
+            if self.over_cap:
+                return self._search_fallback(prefix, limit)
+
+            found = []
+            seen = set()
+            for _, position in heapq.merge(self._base_matches(prefix), self._delta_matches(prefix)):
+                record = self._records[position]
+                if record is not None and position not in seen:
+                    seen.add(position)
+                    found.append(record)
+                    if len(found) >= limit:
+                        break
+        return [_unpack(record) for record in found]
+
+    def _base_matches(self, prefix):
+        # Comparing each key's first len(prefix) characters keeps the sorted
+        # order, so bisect finds the first match; _END sorts before any
+        # character, so a key shorter than the prefix never matches
+        blob, offsets, size = self._blob, self._offsets, len(prefix)
+        low, high = 0, len(offsets)
+        while low < high:
+            middle = (low + high) // 2
+            if blob[offsets[middle]:offsets[middle] + size] < prefix:
+                low = middle + 1
+            else:
+                high = middle
+        index = low
+        while index < len(offsets):
+            offset = offsets[index]
+            if blob[offset:offset + size] != prefix:
+                return
+            yield blob[offset:blob.index(_END, offset)], self._positions[index]
+            index += 1
+
+    def _delta_matches(self, prefix):
+        index = bisect.bisect_left(self._delta, (prefix,))
+        while index < len(self._delta) and self._delta[index][0].startswith(prefix):
+            yield self._delta[index]
+            index += 1
+
+    def _search_fallback(self, prefix, limit):
+        match = match_expression({None: prefix})
+        if match is None:
+            return []
+        rows = self._connect().execute(
+            """
+            SELECT Students.student_id, Students.first_name, Students.last_name, Students.email
+            FROM StudentsSearch JOIN Students ON Students.rowid = StudentsSearch.rowid
+            WHERE StudentsSearch MATCH ? ORDER BY StudentsSearch.rank LIMIT ?
+            """,
+            (match, limit),
+        )
+        return [
+            {"student_id": student_id, "first_name": first_name, "last_name": last_name, "email": email}
+            for student_id, first_name, last_name, email in rows
+        ]
+
+    def _refresh(self):
+        conn = self._connect()
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._built and data_version == self._data_version:
+            return
+        if self.over_cap:
+            if data_version == self._data_version:
+                return
+            students = conn.execute("SELECT COUNT(*) FROM Students").fetchone()[0]
+            if students >= self._over_cap_students:
+                self._data_version = data_version
+                return
+            self.over_cap = False
+
+        if not self._built:
+            self._rebuild(conn)
+        else:
+            oldest, newest = conn.execute("SELECT MIN(seq), MAX(seq) FROM StudentChanges").fetchone()
+            if newest is not None and newest > self._last_seq:
+                if oldest > self._last_seq + 1 or newest - self._last_seq > _MAX_INCREMENTAL_CHANGES:
+                    # Fell behind the change log (or too much changed): start over
+                    self._rebuild(conn)
+                else:
+                    self._apply_changes(conn, newest)
+        self._data_version = data_version
+
+    def _rebuild(self, conn):
+        self._reset()
+        self._built = False
+        # Read the change log position first, so changes made while the
+        # table is being read are applied (again) on the next refresh
+        self._last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM StudentChanges").fetchone()[0]
+        keys = []
+        key_bytes = 0
+        for row in conn.execute(f"SELECT {_STUDENT_COLUMNS} FROM Students"):
+            record = _pack(row)
+            position = len(self._records)
+            self._records.append(record)
+            self._record_bytes += sys.getsizeof(record)
+            for key in _search_keys(*record.split(_FIELD)):
+                keys.append((key, position))
+                key_bytes += len(key) + 1 + 2 * self._offsets.itemsize
+            if self._record_bytes + key_bytes > self.max_bytes:
+                self._drop(conn)
+                return
+
+        keys.sort()
+        parts, offset = [], 0
+        for key, position in keys:
+            parts.append(key)
+            self._offsets.append(offset)
+            self._positions.append(position)
+            offset += len(key) + 1
+        parts.append("")
+        self._blob = _END.join(parts)
+        self._built = True
+        self.rebuilds += 1
+
+    def _apply_changes(self, conn, newest):
+        changed = {
+            student_id
+            for (student_id,) in conn.execute(
+                "SELECT student_id FROM StudentChanges WHERE seq > ? AND seq <= ?", (self._last_seq, newest)
+            )
+        }
+        for student_id in changed:
+            self._remove(student_id)
+        for row in conn.execute(
+            f"SELECT {_STUDENT_COLUMNS} FROM Students WHERE student_id IN (SELECT value FROM json_each(?))",
+            (json_array(changed),),
+        ):
+            self._add(_pack(row))
+        self._last_seq = newest
+        self.incremental_updates += 1
+
+        # Merge the delta and drop retired records once they pile up
+        if len(self._delta) > _MAX_DELTA_KEYS or self._removed > len(self._records) // 4:
+            self._rebuild(conn)
+        elif self._size() > self.max_bytes:
+            self._drop(conn)
+
+    def _drop(self, conn):
+        # Too big: fall back to the full-text index until students are deleted
+        self._reset()
+        self._built = False
+        self.over_cap = True
+        self._over_cap_students = conn.execute("SELECT COUNT(*) FROM Students").fetchone()[0]
+
+    def _add(self, record):
+        position = len(self._records)
+        self._records.append(record)
+        self._record_bytes += sys.getsizeof(record)
+        for key in _search_keys(*record.split(_FIELD)):
+            bisect.insort(self._delta, (key, position))
+
+    def _remove(self, student_id):
+        # The student's id is one of its keys, so an exact lookup finds it
+        key = _clean(student_id).lower()
+        for _, position in heapq.merge(self._base_matches(key + _END), self._delta_matches(key)):
+            record = self._records[position]
+            if record is not None and record.split(_FIELD, 1)[0] == student_id:
+                self._records[position] = None
+                self._record_bytes -= sys.getsizeof(record)
+                self._removed += 1
+
+    def _size(self):
+        return (
+            sys.getsizeof(self._blob)
+            + self._offsets.itemsize * len(self._offsets)
+            + self._positions.itemsize * len(self._positions)
+            + sys.getsizeof(self._records)
+            + self._record_bytes
+            + sum(sys.getsizeof(entry) + sys.getsizeof(entry[0]) for entry in self._delta)
+        )
+
+    def report(self):
+        """Size and refresh counters for /api/_internal/suggest."""
+        with self._lock:
+            return {
+                "built": self._built,
+                "over_cap": self.over_cap,
+                "students": len(self._records) - self._removed,
+                "keys": len(self._offsets) + len(self._delta),
+                "delta_keys": len(self._delta),
+                "bytes": self._size(),
+                "max_bytes": self.max_bytes,
+                "rebuilds": self.rebuilds,
+                "incremental_updates": self.incremental_updates,
+                "change_log_position": self._last_seq,
+                "change_log_size": STUDENT_CHANGES_KEPT,
+            }
+
+
+def _pack(row):
+    return _FIELD.join(_clean(value) for value in row)
+
+
+def _unpack(record):
+    student_id, first_name, last_name, email = record.split(_FIELD)
+    return {"student_id": student_id, "first_name": first_name, "last_name": last_name, "email": email}
+
+
+def init_student_suggest(app):
+    """Create the app's (lazily built) student typeahead index."""
+    db_path = app.config.get("DATABASE_PATH") or os.path.join(app.instance_path, "database.db")
+    app.extensions["student_suggest"] = StudentSuggestIndex(
+        db_path, max_bytes=app.config.get("STUDENT_SUGGEST_MAX_BYTES", 64 * 1024 * 1024)
+    )
@@ -0,0 +1,223 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models import db
+from app.query_metrics import current_recorder, recording
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, SQLite's own locking still applies
+    fcntl = None
+
+
+# Statements that don't change the database, for spotting uncommitted writes
+_READ_STATEMENTS = ("SELECT", "WITH", "PRAGMA", "BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK")
+
+
+class WriteQueueError(RuntimeError):
+    """Raised when a write can't be queued, e.g. because the caller holds the writer connection."""
+
+
+class WriteQueueTimeout(WriteQueueError):
+    """Raised when the writer thread did not start a queued write in time."""
+
+
+class WriteQueue:
+    """
+    Serializes mutations through a single writer thread per process, and
+    through a lock file so only one process writes to the database file at a
+    time.
+
+    Mutations that arrive while the writer is busy are group-committed: up to
+    `max_batch` of them run in one transaction, each inside its own SAVEPOINT
+    so a failing mutation is rolled back on its own and the rest still commit.
+    Every caller gets back its own result or exception.
+
+    The writer engine has a single connection, so a caller that still holds
+    it would wait forever on the writer thread. submit() hands a caller's
+    read-only checkout back first, refuses a caller with uncommitted writes,
+    and gives up on a write the writer thread hasn't started after `timeout`
+    seconds.
+    """
+
+    def __init__(self, engine, lock_path, max_batch=64, max_delay=0.002, timeout=30.0):
+        self.engine = engine
+        self.lock_path = lock_path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self._pending = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._holders = {}  # thread ident -> pool record of its writer connection
+        self._track_checkouts(engine)
+
+    def _track_checkouts(self, engine):
+        @event.listens_for(engine, "checkout")
+        def remember_holder(dbapi_connection, connection_record, connection_proxy):
+            self._holders[threading.get_ident()] = connection_record
+
+        @event.listens_for(engine, "checkin")
+        def forget_holder(dbapi_connection, connection_record):
+            connection_record.info.pop("uncommitted_writes", None)
+            for ident, record in list(self._holders.items()):
+                if record is connection_record:
+                    del self._holders[ident]
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def note_write(conn, cursor, statement, parameters, context, executemany):
+            if not statement.lstrip().upper().startswith(_READ_STATEMENTS):
+                conn.info["uncommitted_writes"] = True
+
+        @event.listens_for(engine, "commit")
+        @event.listens_for(engine, "rollback")
+        def clear_writes(conn):
+            conn.info.pop("uncommitted_writes", None)
+
+    def submit(self, mutation, timeout=None):
+        """
+        Run `mutation(session)` on the writer thread and return its result.
+        Exceptions raised by the mutation (or by the commit) are re-raised here.
+        The mutation must only return plain data, not ORM objects, since its
+        session is closed once the batch commits. `timeout` overrides the
+        queue's own for this write.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        self._release_writer()
+        self._ensure_started()
+        future = Future()
+        # Statements run for the caller still count towards its request
+        self._pending.put((mutation, future, current_recorder()))
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Once running, a mutation is waited for: it may already have written
+            if future.done() or not future.cancel():
+                return future.result()
+            raise WriteQueueTimeout(f"The write queue did not start this write within {timeout:g}s")
+
+    def _release_writer(self):
+        record = self._holders.get(threading.get_ident())
+        if record is None:
+            return
+        if threading.current_thread() is self._thread:
+            raise WriteQueueError("submit_write cannot be called from inside a mutation")
+        session = db.session()
+        if record.info.get("uncommitted_writes") or session.new or session.dirty or session.deleted:
+            raise WriteQueueError(
+                "db.session has uncommitted writes; commit them or move them into the mutation before submit_write"
+            )
+        # The session has only read: end its (empty) transaction to hand the
+        # connection back, keeping what it loaded usable
+        expire_on_commit = session.expire_on_commit
+        session.expire_on_commit = False
+        try:
+            session.commit()
+        finally:
+            session.expire_on_commit = expire_on_commit
+        if threading.get_ident() in self._holders:
+            raise WriteQueueError("This thread holds the writer connection outside db.session; release it before submit_write")
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="write-queue", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._pending.get()]
+
+            # Collect whatever else arrives within max_delay into the same transaction
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._pending.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+
+            self._commit_batch(batch)
+
+    def _commit_batch(self, batch):
+        outcomes = []
+        try:
+            with self._file_lock(), Session(self.engine) as session:
+                for mutation, future, recorder in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with recording(recorder), session.begin_nested():
+                            result = mutation(session)
+                        outcomes.append((future, result, None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+                session.commit()
+        except Exception as e:
+            # The whole batch failed to commit; every caller sees the error
+            for mutation, future, recorder in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def init_write_queue(app):
+    """Create the app's write queue. Must be called inside an app context."""
+    if not app.config.get("WRITE_QUEUE_ENABLED", True):
+        app.extensions["write_queue"] = None
+        return
+
+    db_path = app.config.get("DATABASE_PATH") or os.path.join(app.instance_path, "database.db")
+    app.extensions["write_queue"] = WriteQueue(
+        db.engine,
+        lock_path=f"{db_path}.write.lock",
+        max_batch=app.config.get("WRITE_QUEUE_MAX_BATCH", 64),
+        max_delay=app.config.get("WRITE_QUEUE_MAX_DELAY_MS", 2) / 1000,
+        timeout=app.config.get("WRITE_QUEUE_TIMEOUT_MS", 30000) / 1000,
+    )
+
+
+def submit_write(mutation):
+    """
+    Run `mutation(session)` through the app's write queue and return its
+    result. With the queue disabled, the mutation runs on db.session and is
+    committed straight from the request thread.
+    """
+    write_queue = current_app.extensions.get("write_queue")
+    if write_queue is not None:
+        return write_queue.submit(mutation)
+
+    try:
+        result = mutation(db.session)
+        db.session.commit()
+        return result
+    except Exception:
+        db.session.rollback()
+        raise
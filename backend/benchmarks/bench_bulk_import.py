@@ -0,0 +1,89 @@
+"""
+Bulk member import throughput (POST /api/clubs/<id>/members/bulk).
+
+Imports --members new students into a club through the real Flask route, as
+a JSON array and as a CSV upload, and compares the rate with adding members
+one request at a time through POST /api/clubs/<id>/members.
+
+Usage (from /backend):
+    python benchmarks/bench_bulk_import.py [--members 10000] [--single 500]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import Config  # noqa: E402
+from app import create_app  # noqa: E402
+from app.db_utils import migrate_db, seed_database  # noqa: E402
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "instance", "schema.sql")
+
+
+def make_app(tmp):
+    db_path = os.path.join(tmp, "database.db")
+    with sqlite3.connect(db_path) as conn:
+        with open(SCHEMA_PATH, "r") as f:
+            conn.executescript(f.read())
+    seed_database(db_path)
+    migrate_db(db_path)
+
+    class BenchConfig(Config):
+        DATABASE_PATH = db_path
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+
+    return create_app(BenchConfig)
+
+
+def member(prefix, i):
+    return {
+        "student_id": f"{prefix}{i:07d}",
+        "first_name": "Bench",
+        "last_name": f"Member{i}",
+        "email": f"{prefix.lower()}{i}@example.com",
+        "major": "Computer Science",
+        "graduation_year": 2026,
+    }
+
+
+def report(name, count, elapsed):
+    print(f"{name:<14} {count:>8} {elapsed:>9.2f} {count / elapsed:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--members", type=int, default=10000)
+    parser.add_argument("--single", type=int, default=500, help="members added one request at a time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client = make_app(tmp).test_client()
+        print(f"{'mode':<14} {'members':>8} {'seconds':>9} {'members/s':>12}")
+
+        rows = [member("J", i) for i in range(args.members)]
+        start = time.perf_counter()
+        response = client.post("/api/clubs/1/members/bulk", json=rows)
+        report("bulk json", args.members, time.perf_counter() - start)
+        assert response.get_json()["summary"] == {"created": args.members}
+
+        fields = list(rows[0])
+        lines = [",".join(fields)] + [
+            ",".join(str(value) for value in member("C", i).values()) for i in range(args.members)
+        ]
+        start = time.perf_counter()
+        response = client.post("/api/clubs/2/members/bulk", data="\n".join(lines), content_type="text/csv")
+        report("bulk csv", args.members, time.perf_counter() - start)
+        assert response.get_json()["summary"] == {"created": args.members}
+
+        start = time.perf_counter()
+        for i in range(args.single):
+            client.post("/api/clubs/3/members", json=member("O", i))
+        report("one by one", args.single, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Row counting overhead of the query metrics (app/query_metrics.py).
+
+Fetches --rows rows from an in-memory table with plain sqlite3 connections,
+with a per-row counting row_factory (the previous approach), and with
+CountingConnection (what the app installs now), both with fetchall() (as
+SQLAlchemy's .all() does) and one row at a time with fetchone() (as
+iterating a result does). Reports the best time and the cost per row.
+
+Usage (from /backend):
+    python benchmarks/bench_query_metrics.py [--rows 100000] [--repeat 20]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.query_metrics import CountingConnection, QueryRecorder, _count_row, recording  # noqa: E402
+
+
+def make_connection(rows, factory=sqlite3.Connection, row_factory=None):
+    conn = sqlite3.connect(":memory:", factory=factory)
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, first_name TEXT, last_name TEXT, email TEXT)")
+    conn.executemany(
+        "INSERT INTO t VALUES (?, ?, ?, ?)",
+        [(i, f"First{i}", f"Last{i}", f"student{i}@example.com") for i in range(rows)],
+    )
+    conn.row_factory = row_factory
+    return conn
+
+
+def fetch(conn, mode):
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, first_name, last_name, email FROM t")
+    if mode == "fetchall":
+        cursor.fetchall()
+    else:
+        while cursor.fetchone() is not None:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    variants = {
+        "no counting": make_connection(args.rows),
+        "row_factory": make_connection(args.rows, row_factory=_count_row),
+        "counting cursor": make_connection(args.rows, factory=CountingConnection),
+    }
+
+    # Variants run interleaved, so drift on a noisy machine hits them alike
+    best = {}
+    with recording(QueryRecorder("bench")):
+        for _ in range(args.repeat):
+            for name, conn in variants.items():
+                for mode in ("fetchall", "fetchone"):
+                    start = time.perf_counter()
+                    fetch(conn, mode)
+                    best[name, mode] = min(best.get((name, mode), float("inf")), time.perf_counter() - start)
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    print(f"{'variant':<16} {'mode':<9} {'ms':>8} {'ns/row over none':>17}")
+    for mode in ("fetchall", "fetchone"):
+        for name in variants:
+            seconds = best[name, mode]
+            extra = (seconds - best["no counting", mode]) / args.rows * 1e9
+            print(f"{name:<16} {mode:<9} {seconds * 1000:>8.1f} {extra:>17.0f}")
+
+
+if __name__ == "__main__":
+    main()
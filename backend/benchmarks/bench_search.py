@@ -0,0 +1,125 @@
+"""
+Member search latency: FTS5 prefix match vs. the old leading-wildcard ILIKE.
+
+Loads --students students into one club, then runs each search term through
+both query shapes of GET /api/clubs/<id>/members/search: the StudentsSearch
+full-text index ranked by bm25 (what the route does now) and `ilike('%term%')`
+on the Students columns (what it did before). Reports median and p95 latency.
+
+Usage (from /backend):
+    python benchmarks/bench_search.py [--students 100000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import and_, literal_column  # noqa: E402
+from config import Config  # noqa: E402
+from app import create_app  # noqa: E402
+from app.db_utils import migrate_db, seed_database  # noqa: E402
+from app.models import db, Membership, Student  # noqa: E402
+from app.search import match_expression, search_hits  # noqa: E402
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "instance", "schema.sql")
+
+FIRST_NAMES = ["Alice", "Bob", "Carmen", "Deepak", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jamal",
+               "Kofi", "Lena", "Mateo", "Nadia", "Omar", "Priya", "Quinn", "Rosa", "Sven", "Tariq"]
+LAST_NAMES = ["Anderson", "Brown", "Chen", "Diaz", "Evans", "Fischer", "Garcia", "Haddad", "Ivanova",
+              "Johnson", "Kim", "Lopez", "Martin", "Nguyen", "Okafor", "Patel", "Rossi", "Singh", "Tanaka"]
+MAJORS = ["Computer Science", "Mechanical Engineering", "Mathematics", "Physics", "Biology",
+          "Civil Engineering", "Economics", "History", "Chemistry", "Psychology"]
+
+# (description, search fields) in the route's query parameter names
+SEARCHES = [
+    ("common first name", {"first_name": "alice"}),
+    ("first name prefix", {"first_name": "ca"}),
+    ("full name", {"first_name": "grace", "last_name": "okafor"}),
+    ("email fragment", {"email": "patel12"}),
+    ("major word", {"major": "engineering"}),
+    ("no match", {"last_name": "zzyzx"}),
+]
+
+
+def make_app(tmp, students):
+    db_path = os.path.join(tmp, "database.db")
+    with sqlite3.connect(db_path) as conn:
+        with open(SCHEMA_PATH, "r") as f:
+            conn.executescript(f.read())
+    seed_database(db_path)
+    migrate_db(db_path)
+
+    rng = random.Random(42)
+    with sqlite3.connect(db_path) as conn:
+        rows = []
+        for i in range(students):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            rows.append((f"B{i:07d}", first, last, f"{first.lower()}.{last.lower()}{i}@example.com",
+                         rng.choice(MAJORS), rng.randint(2024, 2030)))
+        conn.executemany(
+            "INSERT INTO Students (student_id, first_name, last_name, email, major, graduation_year) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.executemany(
+            "INSERT INTO Membership (club_id, student_id, active_status) VALUES (1, ?, 'Active')",
+            [(row[0],) for row in rows],
+        )
+
+    class BenchConfig(Config):
+        DATABASE_PATH = db_path
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+        JOB_WORKERS = 0
+
+    return create_app(BenchConfig)
+
+
+def fts_search(club_id, fields):
+    query = db.session.query(Student).join(Membership).filter(Membership.club_id == club_id)
+    hits = search_hits("StudentsSearch", match_expression(fields))
+    return query.join(hits, hits.c.rowid == literal_column("Students.rowid")).order_by(hits.c.rank).all()
+
+
+def ilike_search(club_id, fields):
+    filters = [Membership.club_id == club_id]
+    filters += [getattr(Student, name).ilike(f"%{value}%") for name, value in fields.items()]
+    return db.session.query(Student).join(Membership).filter(and_(*filters)).all()
+
+
+def measure(search, fields, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(search(1, fields))
+        timings.append((time.perf_counter() - start) * 1000)
+        db.session.expunge_all()
+    timings.sort()
+    return count, statistics.median(timings), timings[max(int(len(timings) * 0.95) - 1, 0)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(tmp, args.students)
+        print(f"{args.students} students in club 1, {args.repeat} runs per search (ms)")
+        print(f"{'search':<18} {'rows':>6} {'fts p50':>9} {'fts p95':>9} {'ilike p50':>10} {'ilike p95':>10}")
+        with app.app_context():
+            for name, fields in SEARCHES:
+                count, fts_p50, fts_p95 = measure(fts_search, fields, args.repeat)
+                ilike_count, ilike_p50, ilike_p95 = measure(ilike_search, fields, args.repeat)
+                note = "" if count == ilike_count else f"  (ilike: {ilike_count} rows)"
+                print(f"{name:<18} {count:>6} {fts_p50:>9.2f} {fts_p95:>9.2f} {ilike_p50:>10.2f} {ilike_p95:>10.2f}{note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Serialization throughput: hand-written dicts + Flask's default JSON provider
+(the old route code) versus compiled serializers + FastJSONProvider.
+
+Builds 100k Event rows in memory (no database involved) and reports rows/sec
+for each pipeline: row -> dict, and row -> dict -> JSON bytes.
+
+Usage (from /backend):
+    python benchmarks/bench_serialization.py [--rows 100000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, time as dtime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+from app.json_provider import FastJSONProvider, orjson  # noqa: E402
+from app.models import Event  # noqa: E402
+from app.serializers import serializer_for  # noqa: E402
+
+
+def make_rows(count):
+    return [
+        Event(
+            event_id=i,
+            event_name=f"Event {i}",
+            event_description="Benchmark event with a short description.",
+            event_date=date(2025, (i % 12) + 1, (i % 28) + 1),
+            event_time=dtime(i % 24, i % 60),
+            location="Main Hall",
+            club_id=1,
+        )
+        for i in range(count)
+    ]
+
+
+def old_serialize(event):
+    # As previously copy-pasted in events.py
+    return {
+        "event_id": event.event_id,
+        "event_name": event.event_name,
+        "event_description": event.event_description,
+        "event_date": event.event_date.isoformat(),
+        "event_time": event.event_time.strftime("%H:%M:%S") if event.event_time else None,
+        "location": event.location,
+    }
+
+
+def best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    old_provider = DefaultJSONProvider(app)
+    old_provider.compact = True
+    new_provider = FastJSONProvider(app)
+    new_serialize = serializer_for(Event)
+    rows = make_rows(args.rows)
+
+    cases = [
+        ("old dicts", lambda: [old_serialize(row) for row in rows]),
+        ("new dicts", lambda: [new_serialize(row) for row in rows]),
+        ("old dicts+json", lambda: old_provider.dumps([old_serialize(row) for row in rows])),
+        ("new dicts+json", lambda: new_provider.dumps_bytes([new_serialize(row) for row in rows])),
+    ]
+
+    print(f"{args.rows} Event rows, best of {args.repeat}, encoder: {'orjson' if orjson else 'json'}")
+    print(f"{'pipeline':<16} {'seconds':>9} {'rows/sec':>12}")
+    for name, fn in cases:
+        seconds = best_of(args.repeat, fn)
+        print(f"{name:<16} {seconds:>9.3f} {args.rows / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Read/write throughput of the SQLite PRAGMA profiles in config.py.
+
+Spawns several processes (4 by default, matching `gunicorn -w 4` in the
+Procfile) against one database file. Each process runs a mix of the
+dashboard's read queries and single-row expense inserts, and counts
+completed operations and "database is locked" errors.
+
+Usage (from /backend):
+    python benchmarks/bench_sqlite_profile.py [--processes 4] [--duration 5] [--write-ratio 0.2]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import SQLITE_PROFILES  # noqa: E402
+from app.db_utils import apply_sqlite_pragmas, migrate_db, seed_database  # noqa: E402
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "instance", "schema.sql")
+
+READ_QUERIES = [
+    (
+        "SELECT SUM(expense_amount) FROM Expenses "
+        "WHERE club_id = ? AND expense_date BETWEEN '2025-01-01' AND '2025-12-31'"
+    ),
+    "SELECT * FROM Events WHERE club_id = ? AND event_date >= '2025-01-01'",
+    (
+        "SELECT s.* FROM Students s JOIN Membership m ON m.student_id = s.student_id "
+        "WHERE m.club_id = ?"
+    ),
+]
+
+# budget_id of each seeded club's fiscal year 2025 budget
+BUDGETS_2025 = {1: 4, 2: 6, 3: 8}
+
+WRITE_QUERY = (
+    "INSERT INTO Expenses (club_id, budget_id, expense_name, expense_date, expense_amount, category) "
+    "VALUES (1, 4, 'Benchmark', '2025-06-01', 1.0, 'Other')"
+)
+
+
+def create_database(path, expense_rows=20000):
+    with sqlite3.connect(path) as conn:
+        with open(SCHEMA_PATH, "r") as f:
+            conn.executescript(f.read())
+    seed_database(path)
+    migrate_db(path)
+
+    # Give the read queries something to do
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO Expenses (club_id, budget_id, expense_name, expense_date, expense_amount, category) "
+            "VALUES (?, ?, 'Seed', ?, 10.0, 'Other')",
+            [
+                (club_id, BUDGETS_2025[club_id], f"2025-{(i % 12) + 1:02d}-01")
+                for i in range(expense_rows)
+                for club_id in [(i % 3) + 1]
+            ],
+        )
+
+
+def worker(db_path, pragmas, duration, write_ratio, seed, results):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    apply_sqlite_pragmas(conn, pragmas)
+
+    reads = writes = errors = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        try:
+            if rng.random() < write_ratio:
+                conn.execute(WRITE_QUERY)
+                conn.commit()
+                writes += 1
+            else:
+                conn.execute(rng.choice(READ_QUERIES), (rng.randint(1, 3),)).fetchall()
+                reads += 1
+        except sqlite3.OperationalError:
+            errors += 1
+            if conn.in_transaction:
+                conn.rollback()
+
+    conn.close()
+    results.put((reads, writes, errors))
+
+
+def run_profile(name, pragmas, processes, duration, write_ratio):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "database.db")
+        create_database(db_path)
+
+        # journal_mode is persistent, so switch it once before the workers start
+        with sqlite3.connect(db_path) as conn:
+            apply_sqlite_pragmas(conn, pragmas)
+
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(
+                target=worker, args=(db_path, pragmas, duration, write_ratio, i, results)
+            )
+            for i in range(processes)
+        ]
+        for proc in procs:
+            proc.start()
+        totals = [results.get() for _ in procs]
+        for proc in procs:
+            proc.join()
+
+    reads = sum(t[0] for t in totals)
+    writes = sum(t[1] for t in totals)
+    errors = sum(t[2] for t in totals)
+    print(
+        f"{name:<10} {reads / duration:>12.0f} {writes / duration:>12.0f} {errors:>8}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--profile", action="append", choices=sorted(SQLITE_PROFILES))
+    args = parser.parse_args()
+
+    print(
+        f"{args.processes} processes, {args.duration:g}s per profile, "
+        f"{args.write_ratio:.0%} writes"
+    )
+    print(f"{'profile':<10} {'reads/s':>12} {'writes/s':>12} {'errors':>8}")
+    for name in args.profile or ["default", "tuned"]:
+        run_profile(name, SQLITE_PROFILES[name], args.processes, args.duration, args.write_ratio)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Student typeahead latency (GET /api/students/suggest).
+
+Loads --students students, then times typeahead requests through the real
+Flask route: the first (which builds the worker's index), steady-state
+lookups for random prefixes, and lookups right after a student is written
+(which apply the change incrementally). Also reports the index's memory use.
+
+Usage (from /backend):
+    python benchmarks/bench_suggest.py [--students 100000] [--requests 2000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import Config  # noqa: E402
+from app import create_app  # noqa: E402
+from app.db_utils import migrate_db, seed_database  # noqa: E402
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "instance", "schema.sql")
+
+FIRST_NAMES = ["Alice", "Bob", "Carmen", "Deepak", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jamal",
+               "Kofi", "Lena", "Mateo", "Nadia", "Omar", "Priya", "Quinn", "Rosa", "Sven", "Tariq"]
+LAST_NAMES = ["Anderson", "Brown", "Chen", "Diaz", "Evans", "Fischer", "Garcia", "Haddad", "Ivanova",
+              "Johnson", "Kim", "Lopez", "Martin", "Nguyen", "Okafor", "Patel", "Rossi", "Singh", "Tanaka"]
+
+
+def make_app(tmp, students):
+    db_path = os.path.join(tmp, "database.db")
+    with sqlite3.connect(db_path) as conn:
+        with open(SCHEMA_PATH, "r") as f:
+            conn.executescript(f.read())
+    seed_database(db_path)
+    migrate_db(db_path)
+
+    rng = random.Random(42)
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO Students (student_id, first_name, last_name, email) VALUES (?, ?, ?, ?)",
+            [
+                (f"B{i:07d}", first, last, f"{first.lower()}.{last.lower()}{i}@example.com")
+                for i, (first, last) in enumerate(
+                    (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)) for _ in range(students)
+                )
+            ],
+        )
+
+    class BenchConfig(Config):
+        DATABASE_PATH = db_path
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+        JOB_WORKERS = 0
+
+    return create_app(BenchConfig), db_path
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    pick = lambda fraction: timings[min(int(len(timings) * fraction), len(timings) - 1)]  # noqa: E731
+    return pick(0.5), pick(0.95), pick(0.99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app, db_path = make_app(tmp, args.students)
+        client = app.test_client()
+        rng = random.Random(7)
+        prefixes = [
+            rng.choice([rng.choice(FIRST_NAMES)[:n], f"b{rng.randint(0, args.students - 1):07d}"[:n + 2]])
+            for n in (rng.randint(1, 5) for _ in range(args.requests))
+        ]
+
+        start = time.perf_counter()
+        client.get("/api/students/suggest?q=a")
+        print(f"first request (builds index): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        timings = []
+        for prefix in prefixes:
+            start = time.perf_counter()
+            client.get("/api/students/suggest", query_string={"q": prefix})
+            timings.append((time.perf_counter() - start) * 1000)
+        print("steady state        p50 {:.3f} ms  p95 {:.3f} ms  p99 {:.3f} ms".format(*percentiles(timings)))
+
+        timings = []
+        writer = sqlite3.connect(db_path)
+        for i in range(min(args.requests, 200)):
+            with writer:
+                writer.execute("UPDATE Students SET first_name = ? WHERE student_id = ?", (f"Renamed{i}", f"B{i:07d}"))
+            start = time.perf_counter()
+            client.get("/api/students/suggest", query_string={"q": f"renamed{i}"})
+            timings.append((time.perf_counter() - start) * 1000)
+        writer.close()
+        print("after each write    p50 {:.3f} ms  p95 {:.3f} ms  p99 {:.3f} ms".format(*percentiles(timings)))
+
+        report = client.get("/api/_internal/suggest").get_json()
+        print(f"index: {report['students']} students, {report['keys']} keys, "
+              f"{report['bytes'] / 1024 / 1024:.1f} MiB (cap {report['max_bytes'] / 1024 / 1024:.0f} MiB), "
+              f"{report['rebuilds']} rebuilds, {report['incremental_updates']} incremental updates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Write contention with and without the write queue (app/write_queue.py).
+
+Simulates a check-in rush: several processes (4 by default, matching
+`gunicorn -w 4`), each with several request threads, POST attendance records
+for one event through the real Flask route. Reports p50/p99 request latency
+and the error rate for each mode.
+
+Usage (from /backend):
+    python benchmarks/bench_write_queue.py [--processes 4] [--threads 8] [--requests 50]
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import Config  # noqa: E402
+from app import create_app  # noqa: E402
+from app.db_utils import migrate_db, seed_database  # noqa: E402
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "instance", "schema.sql")
+EVENT_ID = 1
+
+
+def create_database(path, students):
+    with sqlite3.connect(path) as conn:
+        with open(SCHEMA_PATH, "r") as f:
+            conn.executescript(f.read())
+    seed_database(path)
+    migrate_db(path)
+
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO Students (student_id, first_name, last_name, email) VALUES (?, 'Bench', 'Student', ?)",
+            [(f"B{i:06d}", f"bench{i}@example.com") for i in range(students)],
+        )
+
+
+def make_config(db_path, use_queue):
+    class BenchConfig(Config):
+        DATABASE_PATH = db_path
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+        WRITE_QUEUE_ENABLED = use_queue
+
+    return BenchConfig
+
+
+def worker(db_path, use_queue, proc_index, threads, requests_per_thread, results):
+    app = create_app(make_config(db_path, use_queue))
+    client = app.test_client()
+    latencies = []
+    errors = []
+
+    def check_in(thread_index):
+        for i in range(requests_per_thread):
+            n = (proc_index * threads + thread_index) * requests_per_thread + i
+            start = time.perf_counter()
+            response = client.post(
+                f"/api/events/{EVENT_ID}/attendance",
+                json={"student_id": f"B{n:06d}", "attendance_status": "Present", "check_in_time": "10:00"},
+            )
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 201:
+                errors.append(response.status_code)
+
+    pool = [threading.Thread(target=check_in, args=(t,)) for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    results.put((latencies, len(errors)))
+
+
+def run_mode(name, use_queue, processes, threads, requests_per_thread):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "database.db")
+        create_database(db_path, processes * threads * requests_per_thread)
+
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(
+                target=worker,
+                args=(db_path, use_queue, p, threads, requests_per_thread, results),
+            )
+            for p in range(processes)
+        ]
+        start = time.perf_counter()
+        for proc in procs:
+            proc.start()
+        outcomes = [results.get() for _ in procs]
+        for proc in procs:
+            proc.join()
+        elapsed = time.perf_counter() - start
+
+        with sqlite3.connect(db_path) as conn:
+            stored = conn.execute(
+                "SELECT COUNT(*) FROM EventAttendance WHERE student_id LIKE 'B%'"
+            ).fetchone()[0]
+
+    latencies = sorted(latency for outcome in outcomes for latency in outcome[0])
+    errors = sum(outcome[1] for outcome in outcomes)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(
+        f"{name:<10} {len(latencies):>8} {stored:>8} {p50:>9.1f} {p99:>9.1f} "
+        f"{errors / len(latencies):>8.2%} {len(latencies) / elapsed:>9.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50, help="requests per thread")
+    args = parser.parse_args()
+
+    print(f"{args.processes} processes x {args.threads} threads x {args.requests} check-ins")
+    print(f"{'mode':<10} {'requests':>8} {'stored':>8} {'p50 ms':>9} {'p99 ms':>9} {'errors':>8} {'req/s':>9}")
+    run_mode("direct", False, args.processes, args.threads, args.requests)
+    run_mode("queued", True, args.processes, args.threads, args.requests)
+
+
+if __name__ == "__main__":
+    main()
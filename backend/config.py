@@ -3,10 +3,92 @@ import os
 # Load environment variable for the database path
 DATABASE_PATH = os.getenv("DATABASE_PATH", "backend/instance/database.db")
 
+# PRAGMA profiles applied to every SQLite connection opened by the app
+SQLITE_PROFILES = {
+    # SQLite's built-in behaviour: rollback journal, full fsync, no tuning
+    "default": {},
+    # WAL lets readers run while a writer commits; busy_timeout makes
+    # concurrent writers wait for the lock instead of failing immediately
+    "tuned": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456,  # 256 MiB
+        "cache_size": -65536,  # 64 MiB (negative values are KiB)
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,  # milliseconds
+        "foreign_keys": "ON",
+    },
+}
+
 class Config:
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
-    SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(BASE_DIR, 'instance', 'database.db')}"
+    DATABASE_PATH = os.path.join(BASE_DIR, 'instance', 'database.db')
+    SQLALCHEMY_DATABASE_URI = f"sqlite:///{DATABASE_PATH}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "tuned")
+    SQLITE_PRAGMAS = SQLITE_PROFILES[SQLITE_PROFILE]
+    # GET requests use a pool of read-only connections; everything else goes
+    # through a single writer connection per process. Reads in write requests
+    # that precede a submit_write use the read-only engine too (see
+    # readonly_bind_arguments in app/db_utils.py), so only the write queue
+    # waits on the writer.
+    READONLY_POOL_SIZE = 8
+    SQLALCHEMY_ENGINE_OPTIONS = {"pool_size": 1, "max_overflow": 0}
+    # Group commit for queued writes: up to WRITE_QUEUE_MAX_BATCH mutations
+    # arriving within WRITE_QUEUE_MAX_DELAY_MS share one transaction
+    WRITE_QUEUE_ENABLED = True
+    WRITE_QUEUE_MAX_BATCH = 64
+    WRITE_QUEUE_MAX_DELAY_MS = 2
+    # How long submit_write waits for the writer thread to start a write
+    WRITE_QUEUE_TIMEOUT_MS = 30000
+    # Cache for club-scoped GET responses, invalidated by data version. Each
+    # worker keeps an LRU; set RESPONSE_CACHE_SHARED_PATH to also share
+    # entries between workers through a local SQLite file.
+    RESPONSE_CACHE_ENABLED = True
+    RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    RESPONSE_CACHE_MAX_ENTRIES = 1024
+    RESPONSE_CACHE_SHARED_PATH = os.getenv("RESPONSE_CACHE_SHARED_PATH")
+    RESPONSE_CACHE_SHARED_MAX_BYTES = 256 * 1024 * 1024
+    # Kiosk check-ins are written to the database every KIOSK_FLUSH_INTERVAL_MS,
+    # or as soon as KIOSK_FLUSH_MAX_RECORDS are waiting. A flush the write
+    # queue hasn't started within KIOSK_FLUSH_TIMEOUT_MS is retried next time.
+    KIOSK_FLUSH_INTERVAL_MS = 200
+    KIOSK_FLUSH_MAX_RECORDS = 100
+    KIOSK_FLUSH_TIMEOUT_MS = 2000
+    # Background jobs (app/jobs.py): worker threads per process, how long a
+    # claimed job stays leased without a heartbeat, and how often idle
+    # workers look for new jobs. Set JOB_WORKERS=0 to run jobs only in
+    # `flask run-jobs` processes.
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+    JOB_LEASE_SECONDS = 30
+    JOB_POLL_INTERVAL_MS = 1000
+    JOB_MAX_ATTEMPTS = 3
+    JOB_RETENTION_DAYS = 7
+    # Memory cap for each worker's student typeahead index. A larger index is
+    # not kept; suggestions then come from the full-text index instead.
+    STUDENT_SUGGEST_MAX_BYTES = int(os.getenv("STUDENT_SUGGEST_MAX_BYTES", 64 * 1024 * 1024))
+    # GET /api/search: threads querying the entities' full-text indexes, and
+    # how long each entity may take before the page is returned without it
+    GLOBAL_SEARCH_WORKERS = 5
+    GLOBAL_SEARCH_TIMEOUT_MS = 250
+    # Per-endpoint SQL statement/row/time histograms served at /api/_metrics.
+    # With QUERY_METRICS_DIR set, each worker writes its counts to a file
+    # there every QUERY_METRICS_FLUSH_INTERVAL_MS, and /api/_metrics adds up
+    # every worker's file. Files not updated for QUERY_METRICS_STALE_SECONDS
+    # (exited workers) are folded into one archive file there.
+    QUERY_METRICS_ENABLED = True
+    QUERY_METRICS_DIR = os.getenv("QUERY_METRICS_DIR")
+    QUERY_METRICS_FLUSH_INTERVAL_MS = 1000
+    QUERY_METRICS_STALE_SECONDS = 300
+    # Any one SQL statement run more often than this in a request is flagged
+    # as a likely N+1 loop (raised in tests, logged in production). Routes
+    # can override it with @query_budget(..., max_repeats=N).
+    QUERY_REPEAT_THRESHOLD = 10
 
 class ProductionConfig(Config):
-    SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(Config.BASE_DIR, 'instance', 'database.db')}"
\ No newline at end of file
+    DATABASE_PATH = os.path.join(Config.BASE_DIR, 'instance', 'database.db')
+    SQLALCHEMY_DATABASE_URI = f"sqlite:///{DATABASE_PATH}"
+    RESPONSE_CACHE_SHARED_PATH = os.getenv(
+        "RESPONSE_CACHE_SHARED_PATH", os.path.join(Config.BASE_DIR, 'instance', 'response_cache.db')
+    )
+    QUERY_METRICS_DIR = os.getenv("QUERY_METRICS_DIR", os.path.join(Config.BASE_DIR, 'instance', 'metrics'))
\ No newline at end of file
@@ -0,0 +1,25 @@
+import pytest
+from app import create_app
+from app.models import db
+from config import Config
+
+
+@pytest.fixture
+def app(tmp_path):
+    class TestConfig(Config):
+        TESTING = True
+        DATABASE_PATH = str(tmp_path / "database.db")
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{DATABASE_PATH}"
+        # Tests run queued jobs explicitly with app.extensions["jobs"].run_pending()
+        JOB_WORKERS = 0
+
+    app = create_app(TestConfig)
+    yield app
+
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,50 @@
+import sqlite3
+from app.db_utils import reconcile_budget_totals
+
+
+def get_budget(client, year=2025):
+    return client.get(f"/api/clubs/1/budget?fiscal_year={year}").get_json()["budget"]
+
+
+def test_seeded_totals_are_backfilled(client):
+    budget = get_budget(client)
+    assert budget["spent_amount"] == 1900
+    assert budget["remaining_amount"] == 4100
+    assert budget["spent_by_category"] == {"Supplies": 400, "Event": 1500}
+
+
+def test_totals_follow_expense_writes(client):
+    client.post("/api/expenses/1", json={
+        "expense_name": "Pizza", "expense_amount": 100,
+        "expense_date": "2025-04-01", "category": "Food",
+    })
+    budget = get_budget(client)
+    assert budget["spent_amount"] == 2000
+    assert budget["spent_by_category"]["Food"] == 100
+
+    expenses = client.get("/api/expenses/1?all=true").get_json()["expenses"]
+    pizza = next(e for e in expenses if e["expense_name"] == "Pizza")
+    client.delete(f"/api/expenses/1/{pizza['expense_id']}")
+    budget = get_budget(client)
+    assert budget["spent_amount"] == 1900
+    assert budget["spent_by_category"]["Food"] == 0
+
+    updated = client.put("/api/clubs/1/budget/update", json={"fiscal_year": 2025, "total_budget": 3000})
+    assert updated.get_json()["remaining_amount"] == 1100
+
+
+def test_reconcile_rebuilds_drifted_totals(app, client):
+    db_path = app.config["DATABASE_PATH"]
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE Budget SET spent_amount = 0 WHERE budget_id = 4")
+        conn.execute("DELETE FROM BudgetCategorySpend WHERE budget_id = 4")
+
+    assert reconcile_budget_totals(db_path) == [4]
+    assert get_budget(client)["spent_amount"] == 1900
+    assert get_budget(client)["spent_by_category"] == {"Supplies": 400, "Event": 1500}
+    assert reconcile_budget_totals(db_path) == []
+
+
+def test_reconcile_command(app):
+    result = app.test_cli_runner().invoke(args=["reconcile-budgets"])
+    assert "already correct" in result.output
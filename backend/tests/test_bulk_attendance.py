@@ -0,0 +1,26 @@
+def test_bulk_check_in_reports_each_row(client):
+    client.post("/api/events/1/attendance", json={"student_id": "S002", "attendance_status": "Present"})
+
+    response = client.post("/api/events/1/attendance/bulk", json=[
+        {"student_id": "S003", "check_in_time": "09:55"},
+        {"student_id": "S002"},  # already checked in
+        {"student_id": "NOPE"},  # not a registered student
+        {"student_id": "S003"},  # repeated in the same upload
+        {"student_id": "S004", "attendance_status": "Late"},
+        {"student_id": "S005", "attendance_status": "Excused"},
+    ])
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [result["status"] for result in body["results"]] == [
+        "recorded", "duplicate", "invalid", "duplicate", "invalid", "recorded",
+    ]
+
+    attendance = client.get("/api/events/1/attendance?all=true").get_json()["attendance"]
+    by_student = {record["student_id"]: record for record in attendance}
+    assert by_student["S003"]["check_in_time"] == "09:55:00"
+    assert by_student["S005"]["attendance_status"] == "Excused"
+
+
+def test_bulk_check_in_unknown_event(client):
+    response = client.post("/api/events/999/attendance/bulk", json=[{"student_id": "S001"}])
+    assert response.status_code == 404
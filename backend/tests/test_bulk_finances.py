@@ -0,0 +1,72 @@
+def test_bulk_expenses_dry_run_then_import(client):
+    rows = [
+        {"expense_name": "Bus", "expense_amount": 120, "expense_date": "2025-05-01", "category": "Travel"},
+        {"expense_name": "Old", "expense_amount": 10, "expense_date": "2019-05-01"},  # no 2019 budget
+        {"expense_name": "Bad", "expense_amount": -5, "expense_date": "2025-05-01"},
+        {"expense_name": "Odd", "expense_amount": 5, "expense_date": "2025-05-01", "category": "Gifts"},
+        {"expense_name": "Pens", "expense_amount": "7.5", "expense_date": "2026-02-01"},
+    ]
+    before = client.get("/api/clubs/1/budget?fiscal_year=2025").get_json()["budget"]["spent_amount"]
+
+    dry = client.post("/api/expenses/1/bulk?dry_run=true", json=rows).get_json()
+    assert dry["dry_run"] is True
+    assert [r["status"] for r in dry["results"]] == ["valid", "invalid", "invalid", "invalid", "valid"]
+    assert client.get("/api/clubs/1/budget?fiscal_year=2025").get_json()["budget"]["spent_amount"] == before
+
+    done = client.post("/api/expenses/1/bulk", json=rows).get_json()
+    assert done["summary"] == {"created": 2, "invalid": 3}
+    assert client.get("/api/clubs/1/budget?fiscal_year=2025").get_json()["budget"]["spent_amount"] == before + 120
+
+
+def test_bulk_contributions_create_missing_sponsors_once(client):
+    csv_body = (
+        "sponsor_name,contribution_amount,contribution_date,contact_person\n"
+        "TechCorp,100,2025-01-01,\n"
+        "NewCo,200,2025-02-01,Pat\n"
+        "NewCo,300,2025-03-01,\n"
+        "NewCo,300,2025-03-01,\n"
+        "TechCorp,2000,2024-11-01,\n"
+        ",5,2025-01-01,\n"
+        "NewCo,nan,2025-04-01,\n"
+        "NewCo,inf,2025-04-02,\n"
+    )
+    dry = client.post("/api/sponsors/1/bulk?dry_run=true", data=csv_body, content_type="text/csv").get_json()
+    assert dry["new_sponsors"] == ["NewCo"]
+    assert dry["summary"] == {"valid": 3, "duplicate": 2, "invalid": 3}
+    assert [r["error"] for r in dry["results"][-2:]] == ["amount must be a number"] * 2
+
+    done = client.post("/api/sponsors/1/bulk", data=csv_body, content_type="text/csv").get_json()
+    assert done["summary"] == {"created": 3, "duplicate": 2, "invalid": 3}
+
+    sponsors = client.get("/api/sponsors/?all=true").get_json()["sponsors"]
+    newco = [s for s in sponsors if s["sponsor_name"] == "NewCo"]
+    assert len(newco) == 1 and newco[0]["contact_person"] == "Pat"
+
+    contributions = client.get("/api/sponsors/1?all=true").get_json()["sponsors"]
+    assert sum(c["contribution_amount"] for c in contributions if c["sponsor_name"] == "NewCo") == 500
+
+
+def test_bulk_finance_imports_as_jobs(app, client):
+    expenses = client.post(
+        "/api/expenses/1/bulk?async=true",
+        json=[{"expense_name": "Job bus", "expense_amount": 40, "expense_date": "2025-06-01"}],
+    )
+    contributions = client.post(
+        "/api/sponsors/1/bulk?async=true&dry_run=true",
+        data="sponsor_name,contribution_amount,contribution_date\nJobCo,50,2025-06-01\n",
+        content_type="text/csv",
+    )
+    assert expenses.status_code == contributions.status_code == 202
+    app.extensions["jobs"].run_pending()
+
+    job = client.get(expenses.headers["Location"]).get_json()
+    assert job["status"] == "succeeded"
+    assert job["result"]["summary"] == {"created": 1}
+    job = client.get(contributions.headers["Location"]).get_json()
+    assert job["result"]["dry_run"] is True
+    assert job["result"]["new_sponsors"] == ["JobCo"]
+
+    missing = client.post("/api/sponsors/999/bulk?async=true", json=[{"sponsor_name": "X"}])
+    app.extensions["jobs"].run_pending()
+    job = client.get(missing.headers["Location"]).get_json()
+    assert job["status"] == "failed" and job["error"] == "Club not found"
@@ -0,0 +1,44 @@
+def test_bulk_import_json_reports_each_row(client):
+    response = client.post("/api/clubs/1/members/bulk", json=[
+        {"student_id": "N001", "first_name": "New", "last_name": "One", "email": "n1@example.com"},
+        {"student_id": "S002"},  # existing student, not yet in club 1
+        {"student_id": "S001"},  # already a member of club 1
+        {"student_id": "N002", "first_name": "New", "last_name": "Two"},  # no email
+        {"student_id": "N003", "first_name": "Dup", "last_name": "Email", "email": "alice.johnson@example.com"},
+        {"student_id": "N001", "first_name": "New", "last_name": "One", "email": "n1@example.com"},
+        {"student_id": "N004", "first_name": "Bad", "last_name": "Year", "email": "n4@example.com", "graduation_year": 1900},
+    ])
+    assert response.status_code == 200
+    body = response.get_json()
+    statuses = [result["status"] for result in body["results"]]
+    assert statuses == ["created", "added", "already_member", "invalid", "invalid", "already_member", "invalid"]
+    assert body["summary"] == {"created": 1, "added": 1, "already_member": 2, "invalid": 3}
+
+    members = client.get("/api/clubs/1/members?all=true").get_json()["members"]
+    ids = {member["student_id"] for member in members}
+    assert {"N001", "S002"} <= ids
+    assert "N003" not in ids
+
+
+def test_bulk_import_csv_upload(client):
+    csv_body = (
+        "student_id,first_name,last_name,email,major,graduation_year,active_status\n"
+        "C001,Csv,One,c1@example.com,Physics,2026,Pending\n"
+        "C002,Csv,Two,c2@example.com,,,\n"
+    )
+    def pending():
+        stats = client.get("/api/clubs/2/members/stats?group_by=active_status").get_json()["stats"]
+        return sum(row["count"] for row in stats if row["active_status"] == "Pending")
+
+    before = pending()
+    response = client.post(
+        "/api/clubs/2/members/bulk", data=csv_body, content_type="text/csv"
+    )
+    assert response.get_json()["summary"] == {"created": 2}
+    assert pending() == before + 1
+
+
+def test_bulk_import_errors(client):
+    assert client.post("/api/clubs/1/members/bulk", json={"nope": 1}).status_code == 400
+    assert client.post("/api/clubs/1/members/bulk", json=[]).status_code == 400
+    assert client.post("/api/clubs/999/members/bulk", json=[{"student_id": "S001"}]).status_code == 404
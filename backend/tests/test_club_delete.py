@@ -0,0 +1,57 @@
+from sqlalchemy import event
+from app.models import db
+from app.purge import count_club_rows, purge_club
+
+
+def club_rows(app, club_id):
+    with app.app_context():
+        return count_club_rows(db.session, club_id)
+
+
+def test_delete_club_removes_dependent_rows(app, client):
+    before = club_rows(app, 1)
+    assert before["Clubs"] == 1 and before["Membership"] > 0
+
+    response = client.delete("/api/clubs/1")
+    assert response.status_code == 200
+    assert response.get_json()["deleted"] == before
+    assert not any(club_rows(app, 1).values())
+    # Other clubs are untouched
+    assert club_rows(app, 2)["Clubs"] == 1
+
+
+def test_purge_club_runs_as_a_batched_job(app, client):
+    before = club_rows(app, 1)
+
+    response = client.delete("/api/clubs/1?mode=purge&batch_size=1")
+    assert response.status_code == 202
+    status_url = response.headers["Location"]
+    assert client.get(status_url).get_json()["status"] == "queued"
+    # Nothing is deleted until a worker runs the job
+    assert club_rows(app, 1) == before
+
+    assert app.extensions["jobs"].run_pending() == 1
+    job = client.get(status_url).get_json()
+    assert job["status"] == "succeeded"
+    # Every row but the club itself is deleted one per batch, then the club goes
+    assert job["result"]["batches"] == sum(before.values())
+    assert job["result"]["deleted"] == job["result"]["totals"] == before
+    assert not any(club_rows(app, 1).values())
+
+
+def test_purge_counts_totals_off_the_writer(app):
+    writer_statements = []
+    with app.app_context():
+        listener = lambda conn, cursor, statement, *args: writer_statements.append(statement)
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            progress = next(purge_club(1, batch_size=1))
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+    assert progress["totals"]["Clubs"] == 1
+    assert not [sql for sql in writer_statements if "COUNT(*)" in sql]
+
+
+def test_purge_rejects_bad_batch_size(client):
+    assert client.delete("/api/clubs/1?mode=purge&batch_size=0").status_code == 400
+    assert client.delete("/api/clubs/999?mode=purge").status_code == 404
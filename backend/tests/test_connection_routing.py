@@ -0,0 +1,36 @@
+from sqlalchemy import event
+from app.db_utils import READONLY_BIND
+from app.models import db
+
+
+def record_engine_use(app):
+    used = []
+    with app.app_context():
+        engines = dict(db.engines)
+    for key, engine in engines.items():
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda *args, key=key: used.append(key),
+        )
+    return used
+
+
+def test_get_requests_use_readonly_engine(app, client):
+    used = record_engine_use(app)
+    assert client.get("/api/clubs/1/members").status_code == 200
+    assert client.get("/api/students/").status_code == 200
+    assert used and set(used) == {READONLY_BIND}
+
+
+def test_mutations_use_writer_engine(app, client):
+    used = record_engine_use(app)
+    response = client.post("/api/clubs/1/budget", json={"fiscal_year": 2030, "total_budget": 100})
+    assert response.status_code == 201
+    assert used and set(used) == {None}
+
+
+def test_readonly_engine_rejects_writes(app):
+    with app.app_context():
+        with db.engines[READONLY_BIND].connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA query_only").scalar() == 1
@@ -0,0 +1,63 @@
+from sqlalchemy import event
+from app.dashboard import DASHBOARD_SECTIONS
+from app.models import db
+
+# Upper bound on SQL statements for a full dashboard, whatever the club's size
+DASHBOARD_MAX_STATEMENTS = 10
+
+
+def count_statements(app, client, url):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return response, statements
+
+
+def test_dashboard_runs_in_fixed_number_of_statements(app, client):
+    # Grow the club so a per-row query pattern would show up in the count
+    for i in range(50):
+        client.post("/api/clubs/1/members", json={
+            "student_id": f"D{i:03d}", "first_name": "Dash", "last_name": str(i),
+            "email": f"dash{i}@example.com",
+        })
+
+    response, statements = count_statements(app, client, "/api/clubs/1/dashboard?all=true")
+    assert response.status_code == 200
+    assert len(statements) <= DASHBOARD_MAX_STATEMENTS, "\n".join(statements)
+
+    body = response.get_json()
+    for section in DASHBOARD_SECTIONS:
+        assert section in body
+    assert len(body["members"]) == 52
+    assert body["fiscal_year"] == 2026
+    assert body["budget"]["spent_amount"] == 1400
+
+
+def test_dashboard_matches_individual_routes(client):
+    body = client.get("/api/clubs/1/dashboard?fiscal_year=2025").get_json()
+    assert body["officers"] == client.get("/api/clubs/1/officers").get_json()["officers"]
+    assert body["budget"] == client.get("/api/clubs/1/budget?fiscal_year=2025").get_json()["budget"]
+    assert body["budget_years"] == client.get("/api/clubs/1/budget/years").get_json()["fiscal_years"]
+    assert body["upcoming_events"] == client.get("/api/events/1/upcoming").get_json()
+    assert body["expenses"] == client.get(
+        "/api/expenses/1?fiscal_year=2025"
+    ).get_json()["expenses"]
+
+
+def test_dashboard_sections(client):
+    body = client.get("/api/clubs/1/dashboard?sections=roles,categories").get_json()
+    assert set(body) == {"club", "roles", "categories", "fiscal_year"}
+
+    assert client.get("/api/clubs/1/dashboard?sections=nope").status_code == 400
+    assert client.get("/api/clubs/999/dashboard").status_code == 404
@@ -0,0 +1,47 @@
+def test_if_none_match_returns_304_until_club_data_changes(client):
+    first = client.get("/api/clubs/1/members?all=true")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get("/api/clubs/1/members?all=true", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+
+    # A write to another club leaves this club's ETag alone
+    client.post("/api/clubs/2/members", json={"student_id": "S001", "active_status": "Active"})
+    assert client.get(
+        "/api/clubs/1/members?all=true", headers={"If-None-Match": etag}
+    ).status_code == 304
+
+    # A write to this club invalidates it
+    client.delete("/api/clubs/1/members/S001")
+    changed = client.get("/api/clubs/1/members?all=true", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_etag_depends_on_query_string_and_global_tables(client):
+    members = client.get("/api/clubs/1/members?all=true").headers["ETag"]
+    paged = client.get("/api/clubs/1/members?limit=1").headers["ETag"]
+    assert members != paged
+
+    # Members responses include student names, so a new student (added
+    # through another club) invalidates them too
+    client.post("/api/clubs/2/members", json={
+        "student_id": "S999", "first_name": "New", "last_name": "Student",
+        "email": "new.student@example.com",
+    })
+    assert client.get(
+        "/api/clubs/1/members?all=true", headers={"If-None-Match": members}
+    ).status_code == 200
+
+
+def test_attendance_etag_follows_event_club(client):
+    etag = client.get("/api/events/1/attendance").headers["ETag"]
+    client.post(
+        "/api/events/1/attendance",
+        json={"student_id": "S006", "attendance_status": "Present", "check_in_time": "10:00"},
+    )
+    assert client.get(
+        "/api/events/1/attendance", headers={"If-None-Match": etag}
+    ).status_code == 200
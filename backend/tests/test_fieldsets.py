@@ -0,0 +1,38 @@
+import json
+
+
+def test_fields_narrow_each_row_to_the_requested_keys(client):
+    body = client.get("/api/students/?fields=email,first_name&limit=2").get_json()
+    assert set(body) == {"students", "next_cursor"}
+    assert [list(student) for student in body["students"]] == [["email", "first_name"]] * 2
+
+    # The cursor of a narrowed page still pages through every student
+    ids = client.get("/api/students/?fields=student_id&all=true").get_json()["students"]
+    seen, cursor = [], body["next_cursor"]
+    seen.extend(body["students"])
+    while cursor:
+        body = client.get(f"/api/students/?fields=email,first_name&limit=2&cursor={cursor}").get_json()
+        seen.extend(body["students"])
+        cursor = body["next_cursor"]
+    assert len(seen) == len(ids)
+
+    # Pagination key columns (expense_date, expense_id) are not leaked into rows
+    expenses = client.get("/api/expenses/1?fields=expense_name,expense_amount").get_json()["expenses"]
+    assert expenses and all(set(expense) == {"expense_name", "expense_amount"} for expense in expenses)
+
+
+def test_fields_apply_to_streamed_collections(client):
+    response = client.get("/api/students/?fields=student_id&stream=true")
+    assert response.status_code == 200
+    students = json.loads(response.get_data(as_text=True))["students"]
+    assert students and all(list(student) == ["student_id"] for student in students)
+
+
+def test_unknown_field_is_a_400_listing_the_available_fields(client):
+    response = client.get("/api/students/?fields=first_name,password,ssn")
+    assert response.status_code == 400
+    error = response.get_json()["error"]
+    assert error.startswith("Unknown fields: password, ssn. Available fields: ")
+    assert {"student_id", "first_name", "last_name", "email"} <= set(error.split("Available fields: ")[1].split(", "))
+
+    assert client.get("/api/expenses/1?fields=nope").status_code == 400
@@ -0,0 +1,50 @@
+import sqlite3
+from app.db_utils import reconcile_budget_totals
+
+
+def get_years(client, club_id=1):
+    body = client.get(f"/api/clubs/{club_id}/finances/timeseries").get_json()
+    return {year["fiscal_year"]: year for year in body["years"]}
+
+
+def test_timeseries_matches_expenses_and_contributions(client):
+    years = get_years(client)
+    assert sorted(years) == [2024, 2025, 2026]
+
+    for fiscal_year, year in years.items():
+        expenses = client.get(
+            f"/api/expenses/1?all=true&fiscal_year={fiscal_year}"
+        ).get_json().get("expenses", [])
+        assert year["expense_total"] == sum(e["expense_amount"] for e in expenses)
+        assert len(year["months"]) == 12
+
+    assert years[2024]["contribution_total"] == 2000
+    assert years[2024]["months"][10]["contribution_total"] == 2000
+    assert years[2025]["months"][2]["expenses_by_category"] == {"Event": 1500}
+    assert years[2025]["total_budget"] == 6000
+
+
+def test_timeseries_follows_writes(client):
+    client.post("/api/expenses/1", json={
+        "expense_name": "Bus", "expense_amount": 250,
+        "expense_date": "2025-03-20", "category": "Travel",
+    })
+    client.post("/api/sponsors/1", json={
+        "sponsor_name": "TechCorp", "contribution_amount": 700, "contribution_date": "2025-03-02",
+    })
+    march = get_years(client)[2025]["months"][2]
+    assert march["expenses_by_category"] == {"Event": 1500, "Travel": 250}
+    assert march["expense_total"] == 1750
+    assert march["contribution_total"] == 700
+
+    sponsors = client.get("/api/sponsors/1?all=true").get_json()["sponsors"]
+    new = next(s for s in sponsors if s["contribution_amount"] == 700)
+    client.delete(f"/api/sponsors/1/{new['sponsorship_id']}")
+    assert get_years(client)[2025]["months"][2]["contribution_total"] == 0
+
+
+def test_reconcile_rebuilds_rollup(app, client):
+    with sqlite3.connect(app.config["DATABASE_PATH"]) as conn:
+        conn.execute("DELETE FROM FinanceRollup")
+    reconcile_budget_totals(app.config["DATABASE_PATH"])
+    assert get_years(client)[2025]["expense_total"] == 1900
@@ -0,0 +1,111 @@
+import shutil
+import sqlite3
+import time
+import pytest
+from sqlalchemy import text
+from app.global_search import SEARCH_ENTITIES, GlobalSearch
+from app.models import db
+from app.search import match_expression
+
+# A club query that would take far longer than any search budget
+SLOW_CLUB_SELECT = (
+    "SELECT t.club_id, (WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+    "SELECT COUNT(*) FROM (SELECT x FROM n LIMIT 1000000000)), NULL, t.club_id FROM Clubs t"
+)
+
+
+def search(client, query):
+    response = client.get(f"/api/search/?{query}")
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_global_search_merges_entities_by_relevance(client):
+    page = search(client, "q=workshop")
+    assert [(result["type"], result["title"]) for result in page["results"]] == [
+        ("expense", "Workshop Materials"),
+        ("expense", "AI Workshop Materials"),
+        ("event", "AI Workshop"),
+    ]
+    scores = [result["score"] for result in page["results"]]
+    assert scores == sorted(scores, reverse=True)
+    assert page["next_cursor"] is None and page["timed_out"] == []
+
+    page = search(client, "q=ai&types=club,event")
+    assert {result["type"] for result in page["results"]} == {"club", "event"}
+    assert {"type": "club", "id": 1, "title": "AI Club", "subtitle": "Focuses on AI projects.", "club_id": 1} in [
+        {name: value for name, value in result.items() if name != "score"} for result in page["results"]
+    ]
+
+
+def test_global_search_pages_through_every_result(client):
+    everything = search(client, "q=a&limit=100")["results"]
+    assert len(everything) > 5
+
+    seen, cursor = [], None
+    while True:
+        page = search(client, "q=a&limit=2" + (f"&cursor={cursor}" if cursor else ""))
+        seen.extend(page["results"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == everything
+
+
+def test_global_search_follows_writes(app, client):
+    with app.app_context():
+        db.session.execute(text("UPDATE Clubs SET club_name = 'Astronomy Club' WHERE club_id = 2"))
+        db.session.commit()
+    assert [result["id"] for result in search(client, "q=astro")["results"]] == [2]
+    assert search(client, "q=robotics&types=club")["results"] == []
+
+
+def test_global_search_rejects_bad_parameters(client):
+    assert client.get("/api/search/").status_code == 400
+    assert client.get("/api/search/?q=ai&types=bogus").status_code == 400
+    assert client.get("/api/search/?q=ai&limit=0").status_code == 400
+    assert client.get("/api/search/?q=ai&cursor=bogus").status_code == 400
+
+
+def test_slow_entity_is_interrupted_at_its_budget(app, client, monkeypatch):
+    index, select = SEARCH_ENTITIES["club"]
+    monkeypatch.setitem(SEARCH_ENTITIES, "club", (index, SLOW_CLUB_SELECT))
+    app.extensions["global_search"].timeout = 0.2
+
+    started = time.monotonic()
+    page = search(client, "q=ai")
+    assert time.monotonic() - started < 2
+    assert page["timed_out"] == ["club"]
+    assert {result["type"] for result in page["results"]} == {"event", "expense"}
+
+    # The interrupted thread is free again straight away
+    monkeypatch.setitem(SEARCH_ENTITIES, "club", (index, select))
+    started = time.monotonic()
+    for _ in range(len(SEARCH_ENTITIES)):
+        assert search(client, "q=ai&types=club")["timed_out"] == []
+    assert time.monotonic() - started < 2
+
+
+def test_entity_query_stops_at_its_own_deadline(app, monkeypatch):
+    global_search = app.extensions["global_search"]
+    match = match_expression({None: "ai"})
+    index, select = SEARCH_ENTITIES["club"]
+    monkeypatch.setitem(SEARCH_ENTITIES, "club", (index, SLOW_CLUB_SELECT))
+
+    # Nobody interrupts the connection: the query gives up by itself
+    started = time.monotonic()
+    with pytest.raises(sqlite3.OperationalError, match="interrupted"):
+        global_search._search_entity("club", match, None, 10, time.monotonic() + 0.1)
+    assert time.monotonic() - started < 2
+
+    # The next query on the same connection runs under its own deadline
+    monkeypatch.setitem(SEARCH_ENTITIES, "club", (index, select))
+    assert global_search._search_entity("club", match, None, 10, time.monotonic() + 5)
+
+
+def test_global_search_opens_a_database_path_that_needs_quoting(app, tmp_path):
+    db_path = tmp_path / "club #1?%20" / "database.db"
+    db_path.parent.mkdir()
+    shutil.copy(app.config["DATABASE_PATH"], db_path)
+    found = GlobalSearch(str(db_path), workers=1, timeout=5).search("alice", ["student"])
+    assert [result["id"] for result in found["results"]] == ["S001"]
@@ -0,0 +1,164 @@
+import time
+import pytest
+from sqlalchemy import text
+from app import create_app
+from app.jobs import JOB_HANDLERS
+from app.models import db
+from config import Config
+
+calls = []
+
+
+def echo(job):
+    calls.append(job.params)
+    job.report({"step": 1})
+    return {"echo": job.params}
+
+
+def fail(job):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def test_handlers(app):
+    # Registered on this app's runner only, so other tests' apps never see them
+    app.extensions["jobs"].register("test_echo", echo)
+    app.extensions["jobs"].register("test_fail", fail)
+
+
+def queue(client, kind, params=None):
+    response = client.post("/api/jobs/", json={"kind": kind, "params": params or {}})
+    assert response.status_code == 202
+    return response.get_json()["job_id"]
+
+
+def test_job_lifecycle(app, client):
+    job_id = queue(client, "test_echo", {"value": 1})
+    assert client.get(f"/api/jobs/{job_id}").get_json()["status"] == "queued"
+
+    assert app.extensions["jobs"].run_pending() == 1
+    job = client.get(f"/api/jobs/{job_id}").get_json()
+    assert job["status"] == "succeeded"
+    assert job["progress"] == {"step": 1}
+    assert job["result"] == {"echo": {"value": 1}}
+    assert job["attempts"] == 1 and job["finished_at"]
+
+
+def test_failed_job_records_error(app, client):
+    job_id = queue(client, "test_fail")
+    app.extensions["jobs"].run_pending()
+    job = client.get(f"/api/jobs/{job_id}").get_json()
+    assert job["status"] == "failed"
+    assert job["error"] == "boom"
+
+
+def test_unknown_kind_and_missing_job(client):
+    assert client.post("/api/jobs/", json={"kind": "nope"}).status_code == 400
+    assert client.get("/api/jobs/999").status_code == 404
+    assert client.post("/api/jobs/999/cancel").status_code == 404
+
+
+def test_cancel_queued_job(app, client):
+    job_id = queue(client, "test_echo")
+    response = client.post(f"/api/jobs/{job_id}/cancel")
+    assert response.get_json()["status"] == "cancelled"
+    assert app.extensions["jobs"].run_pending() == 0
+    assert client.post(f"/api/jobs/{job_id}/cancel").status_code == 409
+
+
+def test_cancel_running_job_stops_at_next_report(app, client):
+    job_id = queue(client, "test_echo")
+    # Simulate a worker that has claimed the job
+    with app.app_context():
+        db.session.execute(
+            text("UPDATE Jobs SET status = 'running', lease_owner = 'other', lease_expires_at = :t WHERE job_id = :id"),
+            {"t": time.time() + 60, "id": job_id},
+        )
+        db.session.commit()
+    response = client.post(f"/api/jobs/{job_id}/cancel")
+    assert response.status_code == 202
+    assert response.get_json()["cancel_requested"]
+
+
+def test_abandoned_job_is_claimed_again(app, client):
+    calls.clear()
+    job_id = queue(client, "test_echo", {"value": 2})
+    # A worker claimed the job and died: its lease has run out
+    with app.app_context():
+        db.session.execute(
+            text(
+                "UPDATE Jobs SET status = 'running', attempts = 1, lease_owner = 'dead', "
+                "lease_expires_at = :t WHERE job_id = :id"
+            ),
+            {"t": time.time() - 1, "id": job_id},
+        )
+        db.session.commit()
+
+    assert app.extensions["jobs"].run_pending() == 1
+    job = client.get(f"/api/jobs/{job_id}").get_json()
+    assert job["status"] == "succeeded" and job["attempts"] == 2
+    assert calls == [{"value": 2}]
+
+
+def test_worker_threads_run_jobs(app, client):
+    runner = app.extensions["jobs"]
+    runner.workers = 2
+    runner.start()
+    try:
+        job_id = queue(client, "test_echo")
+        deadline = time.time() + 10
+        while client.get(f"/api/jobs/{job_id}").get_json()["status"] != "succeeded":
+            assert time.time() < deadline
+            time.sleep(0.05)
+    finally:
+        runner.stop()
+
+
+def test_bulk_member_import_as_job(app, client):
+    response = client.post(
+        "/api/clubs/1/members/bulk?async=true",
+        json=[{"student_id": "J001", "first_name": "Job", "last_name": "Import", "email": "j1@example.com"}],
+    )
+    assert response.status_code == 202
+    app.extensions["jobs"].run_pending()
+    job = client.get(response.headers["Location"]).get_json()
+    assert job["status"] == "succeeded"
+    assert job["result"]["summary"] == {"created": 1}
+
+
+
+def test_handlers_are_scoped_to_their_app(app):
+    assert {"test_echo", "member_import", "expense_import", "contribution_import", "club_purge"} <= set(app.extensions["jobs"].handlers)
+    # Built-in handlers are shared; test_echo does not leak into apps created later
+    assert "test_echo" not in JOB_HANDLERS
+
+
+def test_club_purge_job_for_missing_club(client):
+    response = client.post("/api/jobs/", json={"kind": "club_purge", "params": {"club_id": 999}})
+    assert response.status_code == 404
+    assert response.get_json()["error"] == "Club not found"
+    response = client.post("/api/jobs/", json={"kind": "club_purge", "params": {"club_id": 1, "batch_size": 0}})
+    assert response.status_code == 400
+
+
+def test_workers_start_with_the_first_request(tmp_path):
+    class WorkerConfig(Config):
+        TESTING = True
+        DATABASE_PATH = str(tmp_path / "database.db")
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{DATABASE_PATH}"
+        JOB_WORKERS = 1
+
+    app = create_app(WorkerConfig)
+    runner = app.extensions["jobs"]
+    try:
+        # A process that serves no requests (flask commands, the reloader's watcher) runs no jobs
+        assert runner._threads == []
+        app.test_client().get("/api/jobs/999")
+        assert len(runner._threads) == 2 and all(thread.is_alive() for thread in runner._threads)
+        threads = list(runner._threads)
+        app.test_client().get("/api/jobs/999")
+        assert runner._threads == threads
+    finally:
+        runner.stop()
+        with app.app_context():
+            db.engine.dispose()
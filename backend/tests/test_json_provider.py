@@ -0,0 +1,65 @@
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+import pytest
+from app import json_provider
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def provider(request, app, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_provider, "orjson", None)
+    elif json_provider.orjson is None:
+        pytest.skip("orjson is not installed")
+    return app.json
+
+
+def old_pipeline(obj):
+    """What the routes sent before the provider: values formatted with isoformat() by hand."""
+    def formatted(value):
+        if isinstance(value, dict):
+            return {key: formatted(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [formatted(item) for item in value]
+        if isinstance(value, (date, datetime, time)):
+            return value.isoformat()
+        return value
+    return json.dumps(formatted(obj), separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def test_dates_and_times_match_the_old_formatting_byte_for_byte(provider):
+    payload = {
+        "expense_date": date(2024, 12, 10),
+        "event_time": time(9, 30),
+        "check_in_time": time(18, 5, 7),
+        "created": datetime(2024, 12, 10, 9, 30, 15),
+        "precise": datetime(2024, 12, 10, 9, 30, 15, 123456),
+        "aware": datetime(2024, 12, 10, 9, 30, tzinfo=timezone(timedelta(hours=-5))),
+        "rows": [{"contribution_date": date(2025, 1, 2), "name": "Café"}],
+    }
+    assert provider.dumps_bytes(payload) == old_pipeline(payload)
+    assert provider.dumps_bytes({"event_time": time(9, 30)}) == b'{"event_time":"09:30:00"}'
+
+
+def test_non_string_keys_and_decimals(provider):
+    # Keys are stringified like the standard library does (e.g. counts by graduation year)
+    assert provider.loads(provider.dumps({2025: 3, 2026: 1})) == {"2025": 3, "2026": 1}
+    # Decimal keeps every digit, as a string like Flask's default provider
+    assert provider.dumps_bytes({"amount": Decimal("1234.50")}) == b'{"amount":"1234.50"}'
+    with pytest.raises(TypeError):
+        provider.dumps_bytes({"value": object()})
+
+
+def test_loads_honours_decoder_options(provider):
+    assert provider.loads('{"amount": 1.5}', parse_float=Decimal) == {"amount": Decimal("1.5")}
+    assert provider.loads('{"a": 1}', object_hook=lambda obj: sorted(obj)) == ["a"]
+    assert provider.loads(b'{"a": 1}') == {"a": 1}
+
+
+def test_routes_send_the_formats_the_frontend_parses(client):
+    expense = client.get("/api/expenses/1").get_json()["expenses"][0]
+    date.fromisoformat(expense["expense_date"])
+    assert len(expense["expense_date"]) == 10
+
+    club = client.get("/api/clubs/").get_json()["clubs"][0]
+    date.fromisoformat(club["founded_date"])
@@ -0,0 +1,145 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import text
+from app.kiosk import KioskSession
+from app.models import db
+
+
+def attendance_ids(client, event_id=1):
+    body = client.get(f"/api/events/{event_id}/attendance?all=true").get_json()
+    return {record["student_id"] for record in body["attendance"]}
+
+
+def test_kiosk_check_ins_are_buffered_then_flushed(app, client):
+    opened = client.post("/api/events/1/kiosk").get_json()
+    already = opened["checked_in"]
+
+    response = client.post("/api/events/1/kiosk/check-in", json={"student_id": "S006"})
+    assert response.status_code == 202
+    assert response.get_json()["member_name"] == "Frank Castle"
+
+    assert client.post("/api/events/1/kiosk/check-in", json={"student_id": "S006"}).status_code == 409
+    assert client.post("/api/events/1/kiosk/check-in", json={"student_id": "NOPE"}).status_code == 404
+    assert client.post(
+        "/api/events/1/kiosk/check-in", json={"student_id": "S005", "attendance_status": "Late"}
+    ).status_code == 400
+
+    counts = client.get("/api/events/1/kiosk").get_json()
+    assert counts["checked_in"] == already + 1
+
+    app.extensions["kiosk"].flush_all()
+    assert "S006" in attendance_ids(client)
+    assert client.get("/api/events/1/kiosk").get_json()["pending"] == 0
+
+
+def test_closing_a_kiosk_flushes_pending_check_ins(app, client):
+    app.extensions["kiosk"].flush_interval = 60  # keep the background flusher out of the way
+    client.post("/api/events/2/kiosk/check-in", json={"student_id": "S001", "check_in_time": "18:30"})
+    assert "S001" not in attendance_ids(client, 2)
+
+    closed = client.delete("/api/events/2/kiosk")
+    assert closed.get_json()["pending"] == 0
+    assert "S001" in attendance_ids(client, 2)
+    assert client.get("/api/events/2/kiosk").status_code == 404
+
+
+def test_kiosk_unknown_event(client):
+    assert client.post("/api/events/999/kiosk").status_code == 404
+
+
+def test_check_ins_that_cannot_be_written_are_dropped(app, client, caplog):
+    kiosk = app.extensions["kiosk"]
+    kiosk.flush_interval = 60
+    client.post("/api/events/1/kiosk")
+    with app.app_context():
+        db.session.execute(text(
+            "INSERT INTO Students (student_id, first_name, last_name, email) "
+            "VALUES ('S901', 'Gone', 'Soon', 'gone.soon@example.com')"
+        ))
+        db.session.commit()
+
+    # Not in the roster loaded when the kiosk opened: looked up on check-in
+    assert client.post("/api/events/1/kiosk/check-in", json={"student_id": "S901"}).status_code == 202
+    assert client.post("/api/events/1/kiosk/check-in", json={"student_id": "S006"}).status_code == 202
+    with app.app_context():
+        db.session.execute(text("DELETE FROM Students WHERE student_id = 'S901'"))
+        db.session.commit()
+
+    with caplog.at_level(logging.WARNING, logger="app.kiosk"):
+        kiosk.flush_all()
+    assert "S006" in attendance_ids(client)
+    counts = client.get("/api/events/1/kiosk").get_json()
+    assert (counts["pending"], counts["dropped"]) == (0, 1)
+    assert "Dropped 1 kiosk check-ins for event 1" in caplog.text
+
+    # Nothing is left to retry
+    kiosk.flush_all()
+    assert client.get("/api/events/1/kiosk").get_json()["dropped"] == 1
+
+
+def test_flush_gives_up_on_a_busy_writer_and_retries(app, client, caplog):
+    kiosk = app.extensions["kiosk"]
+    kiosk.flush_interval = 60
+    kiosk.flush_timeout = 0.05
+    client.post("/api/events/2/kiosk/check-in", json={"student_id": "S001"})
+    release = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        # Keep the writer thread busy past the flush timeout
+        blocker = pool.submit(kiosk.write_queue.submit, lambda session: release.wait(5))
+        time.sleep(0.05)
+        with caplog.at_level(logging.WARNING, logger="app.kiosk"):
+            closed = client.delete("/api/events/2/kiosk").get_json()
+        assert closed["pending"] == 1
+        assert "will retry" in caplog.text
+        release.set()
+        blocker.result()
+
+    # The session stayed open and the next flush writes the check-in
+    assert client.get("/api/events/2/kiosk").get_json()["pending"] == 1
+    assert client.delete("/api/events/2/kiosk").get_json()["pending"] == 0
+    assert "S001" in attendance_ids(client, 2)
+
+
+def test_counts_include_check_ins_recorded_by_other_workers(app, client):
+    app.extensions["kiosk"].flush_interval = 60
+    before = client.post("/api/events/1/kiosk").get_json()["checked_in"]
+    client.post("/api/events/1/kiosk/check-in", json={"student_id": "S006"})
+
+    # Another worker's session flushed a check-in this one never saw
+    with app.app_context():
+        db.session.execute(text(
+            "INSERT INTO EventAttendance (event_id, student_id, attendance_status) VALUES (1, 'S005', 'Present')"
+        ))
+        db.session.commit()
+
+    counts = client.get("/api/events/1/kiosk").get_json()
+    assert (counts["checked_in"], counts["pending"]) == (before + 2, 1)
+    app.extensions["kiosk"].flush_all()
+    assert client.get("/api/events/1/kiosk").get_json()["checked_in"] == before + 2
+
+
+def test_loading_a_roster_does_not_block_other_events(app, client, monkeypatch):
+    kiosk = app.extensions["kiosk"]
+    kiosk.flush_interval = 60
+    client.post("/api/events/2/kiosk")
+    loading, release = threading.Event(), threading.Event()
+    load = KioskSession.load
+
+    def slow_load(event_id):
+        if event_id == 1:
+            loading.set()
+            release.wait(5)
+        return load(event_id)
+
+    monkeypatch.setattr(KioskSession, "load", slow_load)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        opening = pool.submit(client.post, "/api/events/1/kiosk")
+        assert loading.wait(5)
+        started = time.monotonic()
+        assert client.post("/api/events/2/kiosk/check-in", json={"student_id": "S001"}).status_code == 202
+        assert time.monotonic() - started < 1
+        release.set()
+        assert opening.result().status_code == 200
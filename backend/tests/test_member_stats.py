@@ -0,0 +1,30 @@
+def test_club_member_stats_by_major(client):
+    body = client.get("/api/clubs/1/members/stats?group_by=major").get_json()
+    assert body["group_by"] == ["major"]
+    members = client.get("/api/clubs/1/members?all=true").get_json()["members"]
+    assert sum(row["count"] for row in body["stats"]) == len(members)
+    for row in body["stats"]:
+        assert row["count"] == sum(1 for m in members if m["major"] == row["major"])
+
+
+def test_multi_dimensional_and_cross_club_stats(client):
+    body = client.get(
+        "/api/clubs/members/stats?group_by=club_id,graduation_year,active_status"
+    ).get_json()
+    assert set(body["stats"][0]) == {"club_id", "graduation_year", "active_status", "count"}
+
+    per_club = {}
+    for row in body["stats"]:
+        per_club[row["club_id"]] = per_club.get(row["club_id"], 0) + row["count"]
+    for club_id, count in per_club.items():
+        members = client.get(f"/api/clubs/{club_id}/members?all=true").get_json()["members"]
+        assert count == len(members)
+
+    only_two = client.get("/api/clubs/members/stats?group_by=club_id&club_ids=2").get_json()
+    assert [row["club_id"] for row in only_two["stats"]] == [2]
+
+
+def test_stats_validation(client):
+    assert client.get("/api/clubs/1/members/stats").status_code == 400
+    assert client.get("/api/clubs/1/members/stats?group_by=email").status_code == 400
+    assert client.get("/api/clubs/members/stats?group_by=major&club_ids=x").status_code == 400
@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import text
+from app.models import db
+
+
+@pytest.fixture
+def many_rows(app):
+    # 1100 extra students, and 60 expenses for club 1 sharing a handful of dates
+    with app.app_context():
+        db.session.execute(
+            text("INSERT INTO Students (student_id, first_name, last_name, email) VALUES (:id, 'Page', 'Student', :email)"),
+            [{"id": f"P{i:05d}", "email": f"page{i}@example.com"} for i in range(1100)],
+        )
+        budget_id = db.session.execute(text("SELECT MIN(budget_id) FROM Budget WHERE club_id = 1")).scalar()
+        db.session.execute(
+            text(
+                "INSERT INTO Expenses (club_id, budget_id, expense_name, expense_date, expense_amount) "
+                "VALUES (1, :budget_id, :name, :date, 1)"
+            ),
+            [{"budget_id": budget_id, "name": f"Paged {i}", "date": f"2025-03-0{i % 5 + 1}"} for i in range(60)],
+        )
+        db.session.commit()
+        yield {
+            "students": db.session.execute(text("SELECT COUNT(*) FROM Students")).scalar(),
+            "expenses": db.session.execute(text("SELECT COUNT(*) FROM Expenses WHERE club_id = 1")).scalar(),
+        }
+
+
+def follow_cursors(client, url, key, limit):
+    """Every row of `url`, one page at a time, and how many pages it took."""
+    rows, pages, cursor = [], 0, None
+    while True:
+        query = f"limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(f"{url}?{query}")
+        assert response.status_code == 200
+        body = response.get_json()
+        assert len(body[key]) <= limit
+        rows.extend(body[key])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return rows, pages
+
+
+def test_students_cursor_walk_returns_every_row_once(client, many_rows):
+    students, pages = follow_cursors(client, "/api/students/", "students", 250)
+    ids = [student["student_id"] for student in students]
+    assert len(ids) == many_rows["students"] == len(set(ids))
+    assert ids == sorted(ids)
+    assert pages == -(-many_rows["students"] // 250)
+
+
+def test_expenses_cursor_walk_breaks_date_ties_by_id(client, many_rows):
+    expenses, _ = follow_cursors(client, "/api/expenses/1", "expenses", 7)
+    keys = [(expense["expense_date"], expense["expense_id"]) for expense in expenses]
+    assert len(keys) == many_rows["expenses"] == len(set(keys))
+    assert keys == sorted(keys)
+
+
+def test_all_and_limit_clamp(client, many_rows):
+    body = client.get("/api/students/?all=true").get_json()
+    assert len(body["students"]) == many_rows["students"] and body["next_cursor"] is None
+
+    body = client.get("/api/students/?limit=5000").get_json()
+    assert len(body["students"]) == 1000 and body["next_cursor"] is not None
+
+    assert len(client.get("/api/students/").get_json()["students"]) == 100
+
+
+@pytest.mark.parametrize("url", [
+    "/api/students/?limit=abc",
+    "/api/students/?limit=0",
+    "/api/students/?limit=-3",
+    "/api/students/?cursor=not-a-cursor",
+    "/api/students/?cursor=W1sxXV0",  # [[1]]
+    "/api/students/?cursor=WzEsIDJd",  # [1, 2]: wrong number of values
+    "/api/expenses/1?cursor=WzEsIDFd",  # [1, 1]: a number where a date belongs
+    "/api/expenses/1?cursor=WyJ4IiwgMV0",  # ["x", 1]: not an ISO date
+])
+def test_bad_limit_or_cursor_is_a_400(client, url):
+    response = client.get(url)
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body["error"] in ("Invalid cursor", "limit must be a positive integer")
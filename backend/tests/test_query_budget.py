@@ -0,0 +1,53 @@
+import json
+import logging
+import pytest
+from sqlalchemy import text
+from app.models import db
+from app.query_budget import QueryBudgetExceeded, query_budget
+
+NEW_MEMBER = {"student_id": "S900", "first_name": "Quinn", "last_name": "Ray", "email": "quinn.ray@example.com"}
+
+
+def test_routes_stay_within_their_budgets(client):
+    assert client.post("/api/clubs/1/members", json=NEW_MEMBER).status_code == 201
+    assert client.post("/api/clubs/2/members", json={"student_id": "S900"}).status_code == 201
+    assert client.delete("/api/clubs/2/members/S900").status_code == 200
+    assert client.get("/api/clubs/1/dashboard").status_code == 200
+    assert client.delete("/api/clubs/1").status_code == 200
+
+
+def test_over_budget_request_raises_in_tests(app, client, monkeypatch):
+    monkeypatch.setattr(app.view_functions["clubs.add_member_to_club"], "query_budget", 2)
+    with pytest.raises(QueryBudgetExceeded, match="ran 4 statements, over its budget of 2"):
+        client.post("/api/clubs/1/members", json=NEW_MEMBER)
+
+
+def test_over_budget_request_logs_in_production(app, client, monkeypatch, caplog):
+    monkeypatch.setattr(app.view_functions["clubs.add_member_to_club"], "query_budget", 2)
+    app.testing = False
+    with caplog.at_level(logging.WARNING, logger="app.query_budget"):
+        assert client.post("/api/clubs/1/members", json=NEW_MEMBER).status_code == 201
+
+    [record] = caplog.records
+    report = json.loads(record.getMessage())
+    assert report["event"] == "query_budget_exceeded"
+    assert report["endpoint"] == "clubs.add_member_to_club"
+    assert (report["queries"], report["budget"]) == (4, 2)
+    assert [statement["sql"].split()[0] for statement in report["statements"]] == ["SELECT", "SELECT", "INSERT", "INSERT"]
+
+
+def test_repeated_statements_are_flagged_as_n_plus_one(app, client):
+    @query_budget(50, max_repeats=1)
+    def student_names():
+        # One query per student instead of a single query for all of them
+        ids = db.session.execute(text("SELECT student_id FROM Students")).scalars().all()
+        return {
+            "names": [
+                db.session.execute(text("SELECT first_name FROM Students WHERE student_id = :id"), {"id": i}).scalar()
+                for i in ids
+            ]
+        }
+
+    app.add_url_rule("/api/_test/student_names", "student_names", student_names)
+    with pytest.raises(QueryBudgetExceeded, match=r"ran the same statement \d+ times \(N\+1\?\)"):
+        client.get("/api/_test/student_names")
@@ -0,0 +1,126 @@
+import json
+import os
+import time
+from sqlalchemy import text
+from app.models import db
+from app.query_metrics import QueryMetrics, QueryRecorder, recording
+
+
+def parse_metrics(text):
+    """{(metric, labels): value} from a Prometheus text exposition."""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        series, value = line.rsplit(" ", 1)
+        samples[series] = float(value)
+    return samples
+
+
+def get_metrics(client):
+    response = client.get("/api/_metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    return parse_metrics(response.get_data(as_text=True))
+
+
+def requests_counted(metrics, endpoint="clubs.get_club_members"):
+    """Requests to `endpoint` in every worker's counts, as seen by `metrics`."""
+    return sum(metrics.collect()[endpoint]["db_queries_per_request"][:-1])
+
+
+def test_metrics_count_queries_rows_and_time_per_endpoint(client):
+    for _ in range(3):
+        assert client.get("/api/clubs/1/members").status_code == 200
+    samples = get_metrics(client)
+
+    label = 'endpoint="clubs.get_club_members"'
+    assert samples[f"club_management_db_queries_per_request_count{{{label}}}"] == 3
+    assert samples[f"club_management_db_queries_per_request_sum{{{label}}}"] >= 3
+    assert samples[f"club_management_db_rows_per_request_sum{{{label}}}"] >= 1
+    assert samples[f"club_management_db_seconds_per_request_sum{{{label}}}"] > 0
+    # Buckets are cumulative and end with every observation
+    assert samples[f'club_management_db_queries_per_request_bucket{{{label},le="+Inf"}}'] == 3
+    buckets = [value for series, value in samples.items() if series.startswith(f"club_management_db_rows_per_request_bucket{{{label}")]
+    assert buckets == sorted(buckets) and buckets[-1] == 3
+
+
+def test_metrics_attribute_queued_writes_to_their_request(client):
+    response = client.post("/api/clubs/1/members", json={
+        "student_id": "S900", "first_name": "Quinn", "last_name": "Ray", "email": "quinn.ray@example.com",
+    })
+    assert response.status_code == 201
+    samples = get_metrics(client)
+    # The club and student lookups and both inserts ran on the write queue's thread
+    assert samples['club_management_db_queries_per_request_sum{endpoint="clubs.add_member_to_club"}'] >= 4
+
+
+def test_metrics_add_up_other_workers_files(app, client, tmp_path):
+    metrics = app.extensions["query_metrics"]
+    metrics.directory = str(tmp_path)
+    client.get("/api/clubs/1/members")
+
+    # Two earlier workers that had this process's pid, and flushed the same counts
+    other = metrics.snapshot()
+    for token in ("aaaa0000", "bbbb1111"):
+        with open(os.path.join(tmp_path, f"queries-{os.getpid()}-{token}.json"), "w") as f:
+            json.dump(other, f)
+    metrics.flush()
+    assert len([name for name in os.listdir(tmp_path) if name.startswith("queries-")]) == 3
+
+    samples = get_metrics(client)
+    assert samples['club_management_db_queries_per_request_count{endpoint="clubs.get_club_members"}'] == 3
+
+
+def test_files_of_exited_workers_are_archived(app, client, tmp_path):
+    metrics = app.extensions["query_metrics"]
+    metrics.directory = str(tmp_path)
+    client.get("/api/clubs/1/members")
+    metrics.flush()
+
+    exited = os.path.join(tmp_path, "queries-1-deadbeef.json")
+    with open(exited, "w") as f:
+        json.dump(metrics.snapshot(), f)
+    stale = time.time() - metrics.stale_after - 1
+    os.utime(exited, (stale, stale))
+
+    count = 'club_management_db_queries_per_request_count{endpoint="clubs.get_club_members"}'
+    assert get_metrics(client)[count] == 2
+    assert not os.path.exists(exited) and os.path.exists(os.path.join(tmp_path, "archive.json"))
+    assert get_metrics(client)[count] == 2
+
+
+def test_live_worker_archived_as_stale_is_not_counted_twice(app, client, tmp_path):
+    metrics = app.extensions["query_metrics"]
+    metrics.directory = str(tmp_path)
+    client.get("/api/clubs/1/members")
+    metrics.flush()
+
+    # Another worker archives this one's file, as if this process had been suspended
+    [own] = [name for name in os.listdir(tmp_path) if name.startswith("queries-")]
+    stale = time.time() - metrics.stale_after - 1
+    os.utime(os.path.join(tmp_path, own), (stale, stale))
+    other = QueryMetrics(str(tmp_path), stale_after=metrics.stale_after)
+    assert requests_counted(other) == 1
+    assert not os.path.exists(os.path.join(tmp_path, own))
+
+    # Back to work: only the newer counts go to its file
+    client.get("/api/clubs/1/members")
+    metrics.flush()
+    assert requests_counted(metrics) == requests_counted(other) == 2
+
+
+def test_rows_are_counted_for_bulk_and_row_by_row_fetches(app):
+    with app.app_context():
+        expected = db.session.execute(text("SELECT COUNT(*) FROM Students")).scalar()
+        for fetch in (
+            lambda result: result.all(),
+            lambda result: list(result),
+            lambda result: result.partitions(2),
+        ):
+            recorder = QueryRecorder("test")
+            with recording(recorder):
+                rows = fetch(db.session.execute(text("SELECT student_id FROM Students")))
+                if not isinstance(rows, list):
+                    rows = [row for partition in rows for row in partition]
+            assert len(rows) == recorder.rows == expected
@@ -0,0 +1,145 @@
+import multiprocessing
+import os
+import sqlite3
+import pytest
+from sqlalchemy import event
+from app.db_utils import MIGRATIONS, get_schema_version, migrate_db, seed_database
+from app.models import db
+from app.pagination import encode_cursor
+
+# Hot read paths that must be served from an index. Each route is requested
+# through the test client; every SELECT it issues is run through
+# EXPLAIN QUERY PLAN against the same database.
+HOT_ROUTES = [
+    "/api/events/1/upcoming",
+    "/api/events/1/past",
+    "/api/events/1",
+    "/api/expenses/1",
+    "/api/expenses/1?fiscal_year=2025",
+    "/api/clubs/1/budget?fiscal_year=2025",
+    "/api/clubs/1/officers",
+    "/api/clubs/1/finances/timeseries",
+    "/api/clubs/1/members",
+    "/api/clubs/1/members/stats?group_by=major,graduation_year,active_status",
+    "/api/sponsors/1",
+    "/api/events/1/attendance",
+    # Every club-scoped section (roles is a full read of a small lookup table)
+    "/api/clubs/1/dashboard?sections=members,officers,budget_years,budget,"
+    "upcoming_events,past_events,sponsors,expenses",
+    # Keyset pagination must seek, not scan or sort, however deep the page
+    f"/api/students/?limit=1&cursor={encode_cursor(['S002'])}",
+    f"/api/clubs/1/members?limit=1&cursor={encode_cursor(['S001'])}",
+    f"/api/sponsors/1?limit=1&cursor={encode_cursor([0])}",
+    f"/api/expenses/1?limit=1&cursor={encode_cursor(['2025-01-10', 4])}",
+    f"/api/events/1/attendance?limit=1&cursor={encode_cursor(['S001'])}",
+]
+
+# Text search routes are driven by their FTS5 index: the MATCH shows up as a
+# virtual table "scan" of the matching rows only, which are then sorted by rank
+SEARCH_ROUTES = [
+    "/api/clubs/1/members/search?q=ali&graduation_year=2025",
+    "/api/expenses/1/search?q=work&fiscal_year=2025",
+    "/api/sponsors/1/search?q=tech",
+]
+
+
+def capture_statements(app, client, url):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return statements
+
+
+@pytest.mark.parametrize("url", HOT_ROUTES)
+def test_hot_routes_do_not_scan(app, client, url):
+    statements = capture_statements(app, client, url)
+    assert statements, f"{url} issued no SELECT statements"
+
+    with sqlite3.connect(app.config["DATABASE_PATH"]) as conn:
+        for statement, parameters in statements:
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            scans = [
+                row[3]
+                for row in plan
+                if row[3].startswith("SCAN") or row[3] == "USE TEMP B-TREE FOR ORDER BY"
+            ]
+            assert not scans, f"{url} scans a table: {scans}\n{statement}"
+
+
+@pytest.mark.parametrize("url", SEARCH_ROUTES)
+def test_search_routes_use_full_text_index(app, client, url):
+    statements = capture_statements(app, client, url)
+
+    with sqlite3.connect(app.config["DATABASE_PATH"]) as conn:
+        plans = [
+            [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+            for statement, parameters in statements
+        ]
+    details = [detail for plan in plans for detail in plan]
+    # ":M" in the index string means the FTS5 table is queried with MATCH
+    assert any("VIRTUAL TABLE INDEX" in detail and ":M" in detail for detail in details), details
+    scans = [
+        detail for detail in details
+        if detail.startswith("SCAN") and "VIRTUAL TABLE" not in detail
+    ]
+    assert not scans, f"{url} scans a table: {scans}"
+
+
+def test_migrations_upgrade_existing_database(app, tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+
+    # Simulate a database created before the migration subsystem existed
+    with sqlite3.connect(db_path) as conn:
+        with open(os.path.join(app.instance_path, "schema.sql")) as f:
+            conn.executescript(f.read())
+    seed_database(db_path)
+
+    migrate_db(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        assert get_schema_version(conn) == MIGRATIONS[-1][0]
+        indexes = {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+    assert "idx_events_club_date" in indexes
+
+
+def test_migrations_from_several_workers_at_once(app, tmp_path):
+    # gunicorn -w 4 without --preload: every worker migrates on boot
+    db_path = str(tmp_path / "legacy.db")
+    with sqlite3.connect(db_path) as conn:
+        with open(os.path.join(app.instance_path, "schema.sql")) as f:
+            conn.executescript(f.read())
+    seed_database(db_path)
+
+    context = multiprocessing.get_context("fork")
+    barrier = context.Barrier(4)
+
+    def boot():
+        barrier.wait()
+        migrate_db(db_path)
+
+    workers = [context.Process(target=boot) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+    assert [worker.exitcode for worker in workers] == [0] * 4
+
+    with sqlite3.connect(db_path) as conn:
+        assert get_schema_version(conn) == MIGRATIONS[-1][0]
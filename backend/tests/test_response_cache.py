@@ -0,0 +1,62 @@
+from app.response_cache import CachedResponse, LRUCache, ResponseCache, SQLiteCache
+
+
+def test_lru_evicts_least_recently_used_past_byte_limit():
+    cache = LRUCache(max_bytes=10, max_entries=100)
+    cache.put("a", CachedResponse("1", "application/json", b"aaaa"))
+    cache.put("b", CachedResponse("1", "application/json", b"bbbb"))
+    assert cache.get("a", "1") is not None  # "b" is now least recently used
+
+    cache.put("c", CachedResponse("1", "application/json", b"cccc"))
+    assert cache.get("b", "1") is None
+    assert cache.get("a", "1") is not None
+    assert cache.get("c", "1") is not None
+
+    report = cache.report()
+    assert report["evictions"] == 1
+    assert report["bytes"] == 8
+    assert report["hits"] == 3 and report["misses"] == 1
+
+
+def test_stale_etag_is_a_miss():
+    cache = LRUCache(max_bytes=100, max_entries=100)
+    cache.put("a", CachedResponse("1", "application/json", b"old"))
+    assert cache.get("a", "2") is None
+    assert cache.report()["stale"] == 1
+    assert cache.report()["entries"] == 0
+
+
+def test_shared_backend_is_visible_to_other_workers(tmp_path):
+    path = str(tmp_path / "cache.db")
+    worker_1 = ResponseCache(LRUCache(1000, 10), SQLiteCache(path, 1000))
+    worker_2 = ResponseCache(LRUCache(1000, 10), SQLiteCache(path, 1000))
+
+    worker_1.put("/api/clubs/1/members", CachedResponse("1", "application/json", b"[]"))
+    entry = worker_2.get("/api/clubs/1/members", "1")
+    assert entry.body == b"[]"
+    assert worker_2.report()["shared"]["hits"] == 1
+    assert worker_2.report()["local"]["entries"] == 1
+
+
+def test_shared_backend_evicts_past_byte_limit(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), max_bytes=10)
+    for key in "abc":
+        cache.put(key, CachedResponse("1", "application/json", b"xxxx"))
+    assert cache.report()["entries"] == 2
+    assert cache.report()["evictions"] == 1
+    assert cache.get("a", "1") is None
+
+
+def test_routes_are_served_from_cache_until_a_write(client):
+    url = "/api/clubs/1/officers"
+    first = client.get(url)
+    assert client.get(url).data == first.data
+
+    stats = client.get("/api/_internal/cache").get_json()
+    assert stats["local"]["hits"] == 1
+    assert stats["local"]["stores"] == 1
+
+    client.delete("/api/clubs/1/officers/S001/1")
+    updated = client.get(url)
+    assert updated.data != first.data
+    assert client.get("/api/_internal/cache").get_json()["local"]["stale"] == 1
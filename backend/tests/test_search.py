@@ -0,0 +1,51 @@
+from sqlalchemy import text
+from app.models import db
+
+
+def member_ids(client, query):
+    response = client.get(f"/api/clubs/1/members/search?{query}")
+    assert response.status_code == 200
+    return [member["student_id"] for member in response.get_json()["members"]]
+
+
+def test_member_search_matches_word_prefixes(client):
+    assert member_ids(client, "first_name=ali") == ["S001"]
+    assert member_ids(client, "email=alice.jo") == ["S001"]
+    assert member_ids(client, "q=physics") == ["S004"]
+    # Prefixes only: a fragment from the middle of a word does not match
+    assert member_ids(client, "last_name=ohnson") == []
+    # Structured filters still apply on top of the text match
+    assert sorted(member_ids(client, "q=s00&graduation_year=2025")) == ["S001", "S004"]
+    assert member_ids(client, "q=ali&graduation_year=2024") == []
+    # Students outside the club are not returned
+    assert member_ids(client, "first_name=bob") == []
+
+
+def test_search_index_follows_writes(app, client):
+    with app.app_context():
+        db.session.execute(text("UPDATE Students SET first_name = 'Alicia' WHERE student_id = 'S001'"))
+        db.session.commit()
+    assert member_ids(client, "first_name=alicia") == ["S001"]
+    assert member_ids(client, "first_name=alice") == []
+
+    with app.app_context():
+        db.session.execute(text("UPDATE Students SET major = 'Chemistry' WHERE student_id = 'S004'"))
+        db.session.commit()
+    assert member_ids(client, "q=physics") == []
+    assert member_ids(client, "major=chem") == ["S004"]
+
+
+def test_expense_search_ranks_by_relevance(client):
+    response = client.get("/api/expenses/1/search?q=workshop")
+    names = [expense["expense_name"] for expense in response.get_json()["expenses"]]
+    assert sorted(names) == ["AI Workshop Materials", "Workshop Materials"]
+
+    response = client.get("/api/expenses/1/search?expense_name=work&fiscal_year=2025")
+    assert [expense["expense_name"] for expense in response.get_json()["expenses"]] == ["AI Workshop Materials"]
+
+
+def test_sponsor_search(client):
+    response = client.get("/api/sponsors/1/search?contact_person=emi")
+    assert [sponsor["sponsor_name"] for sponsor in response.get_json()["sponsors"]] == ["TechCorp"]
+    response = client.get("/api/sponsors/1/search?sponsor_name=innov")
+    assert response.get_json()["sponsors"] == []
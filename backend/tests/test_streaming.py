@@ -0,0 +1,44 @@
+import json
+import sqlite3
+import tracemalloc
+
+STUDENT_ROWS = 100_000
+
+
+def insert_students(db_path, count):
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO Students (student_id, first_name, last_name, email, phone_number, major, graduation_year) "
+            "VALUES (?, 'First', 'Last', ?, '555-0100', 'Computer Science', 2026)",
+            ((f"T{i:07d}", f"t{i}@example.com") for i in range(count)),
+        )
+
+
+def test_stream_matches_unpaginated_response(client):
+    streamed = json.loads(client.get("/api/students/?stream=true").data)
+    legacy = client.get("/api/students/?all=true").get_json()
+    assert streamed == {"students": legacy["students"]}
+
+
+def test_stream_empty_collection(client):
+    assert json.loads(client.get("/api/clubs/99/members?stream=true").data) == {"members": []}
+
+
+def test_stream_peak_memory_is_bounded(app, client):
+    insert_students(app.config["DATABASE_PATH"], STUDENT_ROWS)
+
+    tracemalloc.start()
+    try:
+        response = client.get("/api/students/?stream=true", buffered=False)
+        streamed_bytes = 0
+        for chunk in response.response:
+            streamed_bytes += len(chunk)
+        response.close()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Roughly 150 bytes per row are streamed; building the whole list in
+    # memory would need far more than the bound below
+    assert streamed_bytes > STUDENT_ROWS * 100
+    assert peak < 16 * 1024 * 1024, f"peak allocation {peak / 1024 / 1024:.1f} MiB"
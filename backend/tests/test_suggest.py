@@ -0,0 +1,81 @@
+import shutil
+from sqlalchemy import text
+from app.models import db
+from app.suggest import StudentSuggestIndex
+
+
+def suggest(client, q, **params):
+    response = client.get("/api/students/suggest", query_string={"q": q, **params})
+    assert response.status_code == 200
+    return [student["student_id"] for student in response.get_json()["students"]]
+
+
+def test_suggest_matches_id_name_and_email_prefixes(client):
+    assert suggest(client, "s00", limit=3) == ["S001", "S002", "S003"]
+    assert suggest(client, "Alice J") == ["S001"]
+    assert suggest(client, "prin") == ["S004"]
+    assert suggest(client, "bob.sm") == ["S002"]
+    assert suggest(client, "zz") == []
+    assert suggest(client, "") == []
+    assert client.get("/api/students/suggest?q=a&limit=0").status_code == 400
+
+
+def test_suggest_applies_writes_incrementally(app, client):
+    assert suggest(client, "s001") == ["S001"]
+    index = app.extensions["student_suggest"]
+    assert index.rebuilds == 1
+
+    client.post("/api/clubs/1/members", json={
+        "student_id": "T100", "first_name": "Tess", "last_name": "Typeahead", "email": "tess@example.com",
+    })
+    with app.app_context():
+        db.session.execute(text("UPDATE Students SET first_name = 'Alicia' WHERE student_id = 'S001'"))
+        db.session.commit()
+
+    assert suggest(client, "tess") == ["T100"]
+    assert suggest(client, "alicia") == ["S001"]
+    assert suggest(client, "alice j") == []  # the old name (the email still starts with alice)
+    assert index.rebuilds == 1 and index.incremental_updates >= 1
+
+    report = client.get("/api/_internal/suggest").get_json()
+    assert report["students"] == 7 and report["bytes"] > 0
+
+
+def test_suggest_falls_back_to_full_text_index_over_cap(app, client):
+    app.extensions["student_suggest"].max_bytes = 100
+    assert suggest(client, "alice jo") == ["S001"]
+    report = client.get("/api/_internal/suggest").get_json()
+    assert report["over_cap"] and report["keys"] == 0
+
+
+def test_suggest_retries_the_build_once_students_are_deleted(app, client):
+    def add_student(student_id):
+        client.post("/api/clubs/1/members", json={
+            "student_id": student_id, "first_name": "Cap", "last_name": "Test", "email": f"{student_id}@example.com",
+        })
+
+    index = app.extensions["student_suggest"]
+    add_student("T200")
+    index.max_bytes = 100
+    assert suggest(client, "alice jo") == ["S001"]
+    assert index.over_cap and index._over_cap_students == 7
+
+    # More students: still too big, so no build is attempted
+    index.max_bytes = 64 * 1024 * 1024
+    add_student("T201")
+    assert suggest(client, "t20") == ["T200", "T201"]
+    assert index.over_cap and index.rebuilds == 0
+
+    with app.app_context():
+        db.session.execute(text("DELETE FROM Membership WHERE student_id IN ('T200', 'T201')"))
+        db.session.execute(text("DELETE FROM Students WHERE student_id IN ('T200', 'T201')"))
+        db.session.commit()
+    assert suggest(client, "s001") == ["S001"]
+    assert not index.over_cap and index.rebuilds == 1
+
+
+def test_suggest_opens_a_database_path_that_needs_quoting(app, tmp_path):
+    db_path = tmp_path / "club #1?%20" / "database.db"
+    db_path.parent.mkdir()
+    shutil.copy(app.config["DATABASE_PATH"], db_path)
+    assert [s["student_id"] for s in StudentSuggestIndex(str(db_path), 1 << 20).suggest("s001", 5)] == ["S001"]
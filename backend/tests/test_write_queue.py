@@ -0,0 +1,81 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sqlalchemy import text
+from app.models import db, Budget, Club
+from app.write_queue import WriteQueueError, WriteQueueTimeout, submit_write
+
+
+def test_batched_mutations_fail_independently(app):
+    write_queue = app.extensions["write_queue"]
+
+    def add_budget(fiscal_year, total_budget):
+        def mutation(session):
+            session.add(Budget(club_id=1, fiscal_year=fiscal_year, total_budget=total_budget))
+            session.flush()
+            return fiscal_year
+
+        return mutation
+
+    # A negative budget violates the CHECK constraint; it must not take the others down
+    mutations = [add_budget(3000 + i, -1 if i == 5 else 100) for i in range(20)]
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        futures = [pool.submit(write_queue.submit, mutation) for mutation in mutations]
+
+    failed = [i for i, future in enumerate(futures) if future.exception() is not None]
+    assert failed == [5]
+
+    with app.app_context():
+        stored = db.session.query(Budget).filter(Budget.fiscal_year >= 3000).count()
+    assert stored == 19
+
+
+def test_view_that_read_through_db_session_can_still_queue_a_write(app, client):
+    # A POST reads on the writer engine, which has a single connection the
+    # writer thread needs too
+    def rename_club():
+        club = db.session.get(Club, 1)
+        name = submit_write(
+            lambda session: session.execute(
+                text("UPDATE Clubs SET club_name = club_name || ' (renamed)' WHERE club_id = :id RETURNING club_name"),
+                {"id": club.club_id},
+            ).scalar()
+        )
+        return {"club_name": name}
+
+    app.add_url_rule("/api/_test/rename_club", "rename_club", rename_club, methods=["POST"])
+    started = time.monotonic()
+    response = client.post("/api/_test/rename_club")
+    assert response.status_code == 200
+    assert response.get_json()["club_name"].endswith("(renamed)")
+    assert time.monotonic() - started < 5
+
+
+def test_uncommitted_writes_on_db_session_are_refused(app, client):
+    def add_and_queue():
+        db.session.add(Budget(club_id=1, fiscal_year=3999, total_budget=1))
+        db.session.flush()
+        return {"result": submit_write(lambda session: 1)}
+
+    app.add_url_rule("/api/_test/add_and_queue", "add_and_queue", add_and_queue, methods=["POST"])
+    with pytest.raises(WriteQueueError, match="uncommitted writes"):
+        client.post("/api/_test/add_and_queue")
+
+
+def test_write_not_started_in_time_is_abandoned(app):
+    write_queue = app.extensions["write_queue"]
+    write_queue.timeout = 0.2
+    release = threading.Event()
+    ran = []
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        # Keep the writer thread busy past the timeout
+        blocker = pool.submit(write_queue.submit, lambda session: release.wait(5))
+        time.sleep(0.05)
+        with pytest.raises(WriteQueueTimeout):
+            write_queue.submit(lambda session: ran.append(True))
+        release.set()
+        assert blocker.result() is True
+    assert write_queue.submit(lambda session: "next") == "next"
+    assert ran == []
@@ -36,7 +36,7 @@ export default function Home() {
 
   const fetchClubs = async () => {
     try {
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/clubs`);
+      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/clubs?all=true`);
       if (response.ok) {
         const data = await response.json();
         setClubs(data);
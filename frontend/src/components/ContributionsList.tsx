@@ -78,7 +78,7 @@ const ContributionsList: React.FC<SponsorsListProps> = ({ clubId }) => {
   const fetchSponsors = async () => {
     setLoadingSponsors(true);
     try {
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/sponsors/${clubId}`);
+      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/sponsors/${clubId}?all=true`);
       if (response.ok) {
         const data = await response.json();
         setSponsors(data.sponsors);
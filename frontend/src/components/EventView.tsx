@@ -144,7 +144,7 @@ const EventView: React.FC<EventViewProps> = ({ currentClub }) => {
   const fetchAttendance = async (eventId: number) => {
     setLoadingAttendance(true);
     try {
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/events/${eventId}/attendance`);
+      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/events/${eventId}/attendance?all=true`);
       if (response.ok) {
         const data = await response.json();
         setAttendance(data.attendance);
@@ -78,7 +78,7 @@ const ExpensesList: React.FC<ExpenseListProps> = ({ currentClub, fiscal_year, bu
         setLoading(true);
         try {
             const response = await fetch(
-                `${process.env.NEXT_PUBLIC_API_URL}/expenses/${currentClub.club_id}?fiscal_year=${fiscal_year}`
+                `${process.env.NEXT_PUBLIC_API_URL}/expenses/${currentClub.club_id}?fiscal_year=${fiscal_year}&all=true`
             );
             if (response.ok) {
                 const data = await response.json();
@@ -1,8 +1,9 @@
 import React, { useEffect, useState } from "react";
 import { PieChart, Pie, Cell, Tooltip, ResponsiveContainer } from "recharts";
 
-interface Member {
-  graduation_year: number;
+interface GraduationCount {
+  graduation_year: number | null;
+  count: number;
 }
 
 interface Club {
@@ -40,25 +41,17 @@ const GraduationGraph: React.FC<PieGraphProps> = ({ currentClub, refreshGraphTri
 
       setLoading(true);
       try {
-        const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/clubs/${currentClub.club_id}/members`);
+        const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/clubs/${currentClub.club_id}/members/stats?group_by=graduation_year`);
         if (response.ok) {
           const data = await response.json();
-          const members = data["members"];
 
-          // Group members by graduation year and count occurrences
-          const graduationCounts = members.reduce((acc: Record<string, number>, member: Member) => {
-            const year = member.graduation_year;
-            if (year) {
-              acc[year] = (acc[year] || 0) + 1;
-            }
-            return acc;
-          }, {});
-
-          // Convert to array of { name, value }
-          const graduationData = Object.entries(graduationCounts).map(([year, count]) => ({
-            name: year,
-            value: count as number,
-          }));
+          // Members are counted by graduation year on the server; skip members without one
+          const graduationData = data["stats"]
+            .filter((row: GraduationCount) => row.graduation_year)
+            .map((row: GraduationCount) => ({
+              name: String(row.graduation_year),
+              value: row.count,
+            }));
 
           setData(graduationData);
         } else {
@@ -1,8 +1,9 @@
 import React, { useEffect, useState } from "react";
 import { PieChart, Pie, Cell, Tooltip, ResponsiveContainer } from "recharts";
 
-interface Member {
-  major: string;
+interface MajorCount {
+  major: string | null;
+  count: number;
 }
 
 interface Club {
@@ -40,24 +41,17 @@ const MajorGraph: React.FC<PieGraphProps> = ({ currentClub, refreshGraphTrigger
 
       setLoading(true);
       try {
-        const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/clubs/${currentClub.club_id}/members`);
+        const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/clubs/${currentClub.club_id}/members/stats?group_by=major`);
         if (response.ok) {
           const data = await response.json();
-          const members = data["members"]
 
-          // Group members by major and count occurrences
-          const majorCounts = members.reduce((acc: Record<string, number>, member: Member) => {
-            if (member.major?.trim()) {
-              acc[member.major] = (acc[member.major] || 0) + 1;
-            }
-            return acc;
-          }, {});
-          
-          // Convert to array of { name, value }
-          const majorData = Object.entries(majorCounts).map(([major, count]) => ({
-            name: major,
-            value: count as number,
-          }));
+          // Members are counted by major on the server; skip members without one
+          const majorData = data["stats"]
+            .filter((row: MajorCount) => row.major?.trim())
+            .map((row: MajorCount) => ({
+              name: row.major as string,
+              value: row.count,
+            }));
 
           setData(majorData);
         } else {
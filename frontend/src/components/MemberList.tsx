@@ -1,4 +1,5 @@
 import React, { useEffect, useState } from "react";
+import StudentIdInput from "./StudentIdInput";
 import { toast } from "react-toastify";
 import "react-toastify/dist/ReactToastify.css";
 
@@ -60,7 +61,7 @@ const MemberList: React.FC<MemberListProps> = ({ currentClub, onMemberAdded }) =
     setLoading(true);
     try {
       const response = await fetch(
-        `${process.env.NEXT_PUBLIC_API_URL}/clubs/${currentClub.club_id}/members`
+        `${process.env.NEXT_PUBLIC_API_URL}/clubs/${currentClub.club_id}/members?all=true`
       );
       if (response.ok) {
         const data = await response.json();
@@ -437,12 +438,11 @@ const MemberList: React.FC<MemberListProps> = ({ currentClub, onMemberAdded }) =
                 className="w-full px-3 py-2 border rounded"
                 required
               />
-              <input
-                type="text"
+              <StudentIdInput
+                id="member-student-id"
                 name="student_id"
                 value={formData.student_id}
                 onChange={handleAddMemberInputChange}
-                placeholder="Student ID"
                 className="w-full px-3 py-2 border rounded"
                 required
               />
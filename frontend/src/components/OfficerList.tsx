@@ -1,4 +1,5 @@
 import React, { useEffect, useState } from "react";
+import StudentIdInput from "./StudentIdInput";
 import { toast } from "react-toastify";
 import "react-toastify/dist/ReactToastify.css";
 
@@ -256,11 +257,10 @@ const OfficerList: React.FC<OfficerListProps> = ({ currentClub }) => {
                         <h3 className="text-lg font-bold mb-4 text-white">Add Officer</h3>
                         <form>
                             <label className="block mb-4">
-                                <input
-                                    type="text"
+                                <StudentIdInput
+                                    id="officer-student-id"
                                     className="border rounded px-3 py-2 w-full"
                                     value={newOfficer.student_id}
-                                    placeholder="Student ID"
                                     onChange={(e) =>
                                         setNewOfficer({ ...newOfficer, student_id: e.target.value })
                                     }
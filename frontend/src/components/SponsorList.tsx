@@ -16,7 +16,7 @@ const SponsorList: React.FC = () => {
   useEffect(() => {
     const fetchSponsors = async () => {
       try {
-        const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/sponsors/`);
+        const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/sponsors/?all=true`);
         if (response.ok) {
           const data = await response.json();
           setSponsors(data.sponsors);
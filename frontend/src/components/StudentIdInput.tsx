@@ -0,0 +1,79 @@
+import React, { useEffect, useState } from "react";
+
+interface StudentSuggestion {
+  student_id: string;
+  first_name: string;
+  last_name: string;
+  email: string;
+}
+
+interface StudentIdInputProps {
+  id: string;
+  name?: string;
+  value: string;
+  onChange: (e: React.ChangeEvent<HTMLInputElement>) => void;
+  className?: string;
+  required?: boolean;
+}
+
+// Student ID field that suggests matching students (by id, name or email) as the user types
+const StudentIdInput: React.FC<StudentIdInputProps> = ({ id, name, value, onChange, className, required }) => {
+  const [suggestions, setSuggestions] = useState<StudentSuggestion[]>([]);
+
+  useEffect(() => {
+    const query = value.trim();
+    if (!query) {
+      setSuggestions([]);
+      return;
+    }
+
+    // Wait for a pause in typing before asking the backend
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      try {
+        const response = await fetch(
+          `${process.env.NEXT_PUBLIC_API_URL}/students/suggest?q=${encodeURIComponent(query)}&limit=8`,
+          { signal: controller.signal }
+        );
+        if (response.ok) {
+          const data = await response.json();
+          setSuggestions(data.students || []);
+        }
+      } catch (error) {
+        if ((error as Error).name !== "AbortError") {
+          console.error("Error fetching student suggestions:", error);
+        }
+      }
+    }, 150);
+
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [value]);
+
+  return (
+    <>
+      <input
+        type="text"
+        name={name}
+        value={value}
+        onChange={onChange}
+        placeholder="Student ID"
+        className={className}
+        list={`${id}-suggestions`}
+        autoComplete="off"
+        required={required}
+      />
+      <datalist id={`${id}-suggestions`}>
+        {suggestions.map((student) => (
+          <option key={student.student_id} value={student.student_id}>
+            {student.first_name} {student.last_name} ({student.email})
+          </option>
+        ))}
+      </datalist>
+    </>
+  );
+};
+
+export default StudentIdInput;